@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for the xl2times log parser.
+
+Generates a large synthetic xl2times -vvvv log and reports parser throughput in
+lines per second. Run from the project root with:
+    uv run python benchmarks/bench_log_parser.py [--lines 1000000]
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.log_parser import XL2TimesLogParser
+
+# Representative line mix from xl2times -vv..-vvvv runs on DemoS-style models
+SYNTHETIC_LINES = [
+    "2025-07-29 10:15:01.123 | INFO     | xl2times.__main__:convert_xl_to_times:75 - Loading 5 files from veda-model-examples/DemoS_001",
+    "2025-07-29 10:15:01.456 | INFO     | xl2times.__main__:convert_xl_to_times:88 - Processing SysSettings.xlsx",
+    "2025-07-29 10:15:01.789 | INFO     | xl2times.__main__:convert_xl_to_times:90 - Using cached data for /home/user/models/DemoS_001/BY_Trans.xlsx",
+    "2025-07-29 10:15:02.012 | DEBUG    | xl2times.transforms:normalize_tags_columns:412 - table ~FI_T on sheet Pri_COA: 12 rows, 9 columns",
+    "2025-07-29 10:15:02.345 | INFO     | xl2times.utils:timed:44 - remove_comment_rows took 0.0123 seconds",
+    "2025-07-29 10:15:02.678 | WARNING  | xl2times.transforms:process_flexible_import_tables:620 - WARNING: Dropping table with unrecognized tag ~FOO",
+    "/usr/lib/python3.12/site-packages/pandas/core/frame.py:1234: FutureWarning: Setting an item of incompatible dtype is deprecated",
+    "2025-07-29 10:15:03.901 | DEBUG    | xl2times.transforms:apply_transform_tables:980 - 42 rows matched wildcard MINCOA*",
+    "  return pd.concat(frames, ignore_index=True)",
+    "",
+    "2025-07-29 10:15:04.234 | INFO     | xl2times.__main__:write_csv_tables:310 - Excel files successfully converted to CSV and written to output",
+]
+
+
+def generate_log(lines: int):
+    """Yield ``lines`` synthetic log lines."""
+    return itertools.islice(itertools.cycle(SYNTHETIC_LINES), lines)
+
+
+def bench(lines: int, repeat: int) -> float:
+    """Return the best lines-per-second over ``repeat`` runs."""
+    best = 0.0
+    for _ in range(repeat):
+        parser = XL2TimesLogParser()
+        start = time.perf_counter()
+        for line in generate_log(lines):
+            parser.feed(line)
+        parser.result()
+        elapsed = time.perf_counter() - start
+        best = max(best, lines / elapsed)
+    return best
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--lines", type=int, default=500_000, help="Synthetic log lines per run")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="Number of runs (best is reported)")
+    args = arg_parser.parse_args()
+
+    throughput = bench(args.lines, args.repeat)
+    print(f"XL2TimesLogParser.feed: {throughput:,.0f} lines/s over {args.lines:,} lines")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark suite over DemoS_001 and synthetic scale-ups.
+
+Runs xl2times_run through XL2TimesHandler.run and through the MCP _call_tool
+path (including JSON serialization of the response) on the bundled DemoS_001
+model and on copies scaled 10x and 100x in table rows and regions, in convert
+and --only_read mode. Latency, peak RSS of the xl2times process, output size,
+extraction and log-parse times and response size are written to a JSON file,
+and a previous results file can be compared against to spot regressions.
+
+By default xl2times is replaced by benchmarks/stub_xl2times.py, which reads
+the workbooks and writes tables without needing the real tool; pass --real to
+benchmark the configured XL2TIMES_COMMAND instead. Run from the project root:
+    uv run python benchmarks/bench_suite.py [--scales 1 10 100] [--repeat 3]
+        [--output bench.json] [--compare baseline.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+BENCH_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = BENCH_DIR.parent
+DEMO_MODEL = PROJECT_ROOT / "veda-model-examples" / "DemoS_001"
+STUB_XL2TIMES = BENCH_DIR / "stub_xl2times.py"
+
+sys.path.insert(0, str(BENCH_DIR))
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from xlsx_util import find_tables, read_workbook, write_workbook  # noqa: E402
+
+# Tags whose rows are duplicated when scaling; settings tables keep one copy
+SCALED_TAG_PREFIXES = ("~FI_", "~TFM_")
+REGION_MAP_TAG = "~BookRegions_Map"
+# Columns naming processes and commodities, which get a copy suffix when scaling; attributes,
+# regions, set patterns and all other columns are repeated unchanged
+NAME_COLUMNS = frozenset(
+    ("techname", "commname", "comm-in", "comm-out", "comm-in-a", "comm-out-a", "process", "commodity")
+)
+
+# Metrics compared by --compare, with the relative slowdown reported as a regression
+COMPARED_METRICS = ("latency", "extraction", "log_parse", "serialization")
+REGRESSION_THRESHOLD = 0.2
+
+
+def scale_model(source: Path, target: Path, factor: int) -> Path:
+    """
+    Write a copy of the model at ``source`` scaled ``factor`` times.
+
+    Rows of transformation and flexible-import tables are repeated ``factor``
+    times (process and commodity names get a copy suffix so they stay unique) and the region
+    map lists ``factor`` regions. Every table is laid out on its sheet one
+    below the other; cells outside tables are dropped.
+    """
+    target.mkdir(parents=True, exist_ok=True)
+    for path in sorted(source.glob("*.xlsx")):
+        sheets = []
+        for sheet, cells in read_workbook(path):
+            scaled: Dict[tuple, Any] = {}
+            row = 1
+            for tag, position, header, rows in find_tables(cells):
+                col = position[1]
+                rows = _scale_rows(tag, header, rows, factor)
+                scaled[row, col] = cells[position]
+                for i, name in enumerate(header):
+                    scaled[row + 1, col + i] = name if not name.replace(".", "").isdigit() else float(name)
+                for r, values in enumerate(rows, row + 2):
+                    for i, value in enumerate(values):
+                        if value != "":
+                            scaled[r, col + i] = value
+                row += len(rows) + 4
+            sheets.append((sheet, scaled))
+        write_workbook(target / path.name, sheets)
+    return target
+
+
+def _scale_rows(tag: str, header: List[str], rows: List[list], factor: int) -> List[list]:
+    if tag == REGION_MAP_TAG and "Region" in header and rows:
+        column = header.index("Region")
+        template = rows[0]
+        return [
+            [f"REG{i}" if c == column else value for c, value in enumerate(template)]
+            for i in range(1, factor + 1)
+        ]
+    if not tag.startswith(SCALED_TAG_PREFIXES) or factor == 1:
+        return rows
+    names = {c for c, name in enumerate(header) if str(name).lower() in NAME_COLUMNS}
+    scaled = list(rows)
+    for copy in range(1, factor):
+        for values in rows:
+            scaled.append([
+                f"{value}_{copy}"
+                if c in names and isinstance(value, str) and value and " " not in value and not value.startswith("*")
+                else value
+                for c, value in enumerate(values)
+            ])
+    return scaled
+
+
+def _output_size(output_dir: Path) -> Dict[str, int]:
+    files = [p for p in output_dir.rglob("*") if p.is_file()]
+    return {"output_files": len(files), "output_bytes": sum(p.stat().st_size for p in files)}
+
+
+async def _run_once(server, model: Path, output_dir: Path, only_read: bool, path: str) -> Dict[str, Any]:
+    """Run one conversion through the handler or the MCP tool-call path and measure it."""
+    arguments = {"input": str(model), "output_dir": str(output_dir), "only_read": only_read}
+    sample: Dict[str, Any] = {}
+
+    start = time.perf_counter()
+    if path == "handler":
+        result = await server.xl2times_handler.run(arguments)
+        sample["latency"] = time.perf_counter() - start
+        serialize_start = time.perf_counter()
+        response_bytes = len(json.dumps(result, indent=2, default=str))
+        sample["serialization"] = time.perf_counter() - serialize_start
+    else:
+        content = await server._call_tool("xl2times_run", arguments)
+        sample["latency"] = time.perf_counter() - start
+        response_bytes = sum(len(item.text) for item in content)
+        serialize_start = time.perf_counter()
+        result = json.loads(content[0].text)
+        sample["serialization"] = time.perf_counter() - serialize_start  # decode time, as seen by a client
+
+    if not result.get("success"):
+        raise RuntimeError(f"Benchmark run failed: {result.get('errors') or result.get('message')}")
+
+    phases = result.get("phases") or {}
+    resources = result.get("resources") or {}
+    sample.update({
+        "extraction": phases.get("extraction"),
+        "log_parse": phases.get("log_parse"),
+        "max_rss_mb": resources.get("max_rss_mb"),
+        "response_bytes": response_bytes,
+        **_output_size(output_dir)
+    })
+    return sample
+
+
+def _summarize(samples: List[Dict[str, Any]]) -> Dict[str, Any]:
+    summary = {}
+    for key in samples[0]:
+        values = [s[key] for s in samples if s[key] is not None]
+        if not values:
+            summary[key] = None
+        elif key in ("output_files", "output_bytes", "response_bytes"):
+            summary[key] = values[-1]
+        else:
+            summary[key] = {
+                "median": round(statistics.median(values), 4),
+                "min": round(min(values), 4),
+                "max": round(max(values), 4)
+            }
+    return summary
+
+
+async def run_suite(scales: List[int], repeat: int, work_dir: Path, modes=("convert", "only_read"),
+                    paths=("handler", "call_tool")) -> List[Dict[str, Any]]:
+    """Benchmark every scale, mode and call path; returns one record per combination."""
+    from src.server import XL2TimesMCPServer
+
+    server = XL2TimesMCPServer()
+    records = []
+    for scale in scales:
+        model = DEMO_MODEL if scale == 1 else scale_model(DEMO_MODEL, work_dir / f"DemoS_001_x{scale}", scale)
+        input_bytes = sum(p.stat().st_size for p in model.glob("*.xlsx"))
+        for mode in modes:
+            for path in paths:
+                samples = []
+                for i in range(repeat):
+                    output_dir = work_dir / "output" / f"x{scale}_{mode}_{path}_{i}"
+                    samples.append(await _run_once(server, model, output_dir, mode == "only_read", path))
+                records.append({
+                    "model": model.name,
+                    "scale": scale,
+                    "mode": mode,
+                    "path": path,
+                    "input_bytes": input_bytes,
+                    **_summarize(samples)
+                })
+    return records
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float = REGRESSION_THRESHOLD) -> List[str]:
+    """Return a line for every metric whose median got slower than ``threshold`` relative to ``baseline``."""
+    def key(record):
+        return record["scale"], record["mode"], record["path"]
+
+    previous = {key(r): r for r in baseline.get("results", [])}
+    regressions = []
+    for record in results["results"]:
+        old = previous.get(key(record))
+        if old is None:
+            continue
+        for metric in COMPARED_METRICS:
+            new_value = (record.get(metric) or {}).get("median")
+            old_value = (old.get(metric) or {}).get("median")
+            if new_value is None or not old_value:
+                continue
+            change = new_value / old_value - 1
+            if change > threshold:
+                regressions.append(
+                    f"x{record['scale']} {record['mode']} {record['path']} {metric}: "
+                    f"{old_value:.4f}s -> {new_value:.4f}s (+{change:.0%})"
+                )
+    return regressions
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=PROJECT_ROOT, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def configure(work_dir: Path, real: bool) -> None:
+    """Point the server configuration at the stub and keep benchmark runs out of caches and logs."""
+    if not real:
+        os.environ["XL2TIMES_COMMAND"] = f"{sys.executable} {STUB_XL2TIMES}"
+        os.environ["XL2TIMES_POOL_SIZE"] = "0"
+    os.environ["RESULT_CACHE_ENABLED"] = "false"
+    os.environ["RUN_RUSAGE_ENABLED"] = "true"
+    os.environ["EXTRACTION_CACHE_ENABLED"] = "false"
+    os.environ["TEMP_DIR"] = str(work_dir / "tmp")
+    os.environ["LOG_FILE"] = ""
+    os.environ["METRICS_LOG_FILE"] = ""
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100], help="Model scale factors")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="Runs per scale, mode and path")
+    arg_parser.add_argument("--output", default="bench-results.json", help="Results file")
+    arg_parser.add_argument("--compare", help="Previous results file to check for regressions")
+    arg_parser.add_argument("--real", action="store_true", help="Benchmark XL2TIMES_COMMAND instead of the stub")
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="xl2times-bench-") as tmp:
+        work_dir = Path(tmp)
+        configure(work_dir, args.real)
+        from src.config import config  # reads the environment set above
+        config.setup_logging()
+        records = asyncio.run(run_suite(args.scales, args.repeat, work_dir))
+
+    results = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "stub": not args.real,
+            "repeat": args.repeat,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S")
+        },
+        "results": records
+    }
+    Path(args.output).write_text(json.dumps(results, indent=2))
+
+    for r in records:
+        print(
+            f"x{r['scale']:<4} {r['mode']:<10} {r['path']:<10} "
+            f"latency {r['latency']['median']:.3f}s  "
+            f"rss {(r['max_rss_mb'] or {}).get('median', 0):.0f}MB  "
+            f"output {r['output_bytes'] / 1024:.0f}KB  response {r['response_bytes']}B"
+        )
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        regressions = compare(results, json.loads(Path(args.compare).read_text()))
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Stand-in for the xl2times command line used by the benchmark suite.
+
+Accepts the arguments the server passes to xl2times, really reads the input
+workbooks (with the standard library) and writes either raw_tables.txt
+(--only_read) or one CSV per table tag, logging progress and step timings in
+xl2times' format so the server's log parser, phase timings and output scan see
+realistic input. Tables tagged ~FI_* are written once per region, so output
+grows with both the rows and the regions of a model. Run it as
+    python benchmarks/stub_xl2times.py MODEL_DIR --output_dir OUT [--only_read] [-v]
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from xlsx_util import find_tables, read_workbook
+
+
+def log(level: str, function: str, message: str) -> None:
+    stamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    print(f"{stamp} | {level:<8} | xl2times.__main__:{function}:1 - {message}", flush=True)
+
+
+def input_files(inputs):
+    files = []
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            files.extend(sorted(p for p in path.iterdir() if p.suffix.lower() == ".xlsx" and not p.name.startswith("~$")))
+        else:
+            files.append(path)
+    return files
+
+
+def regions_of(tables, requested):
+    if requested:
+        return requested
+    regions = [
+        str(row[header.index("Region")])
+        for tag, _, header, rows in tables
+        if tag == "~BookRegions_Map" and "Region" in header
+        for row in rows
+    ]
+    return regions or ["REG1"]
+
+
+def write_raw_tables(path: Path, tables) -> None:
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        for filename, sheet, tag, (row, col), header, rows in tables:
+            f.write(f"sheetname: {sheet}\nrange: R{row}C{col}\nfilename: {filename}\ntag: {tag}\n")
+            f.write("types: " + ", ".join(f"{name} (object)" for name in header) + "\n")
+            writer.writerow(header)
+            writer.writerows(rows)
+            f.write("\n\n")
+
+
+def write_csv_tables(output_dir: Path, tables, regions) -> int:
+    by_tag = {}
+    for _, _, tag, _, header, rows in tables:
+        by_tag.setdefault(tag.lstrip("~"), []).append((tag, header, rows))
+
+    for name, parts in by_tag.items():
+        with open(output_dir / f"{name}_output.csv", "w", newline="") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(["region", "column", "value"])
+            for tag, header, rows in parts:
+                for region in (regions if tag.startswith("~FI_") else regions[:1]):
+                    for row in rows:
+                        writer.writerows((region, column, value) for column, value in zip(header, row) if value != "")
+    return len(by_tag)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("input", nargs="+")
+    parser.add_argument("--output_dir", default="output")
+    parser.add_argument("--regions", nargs="*", default=[])
+    parser.add_argument("--only_read", action="store_true")
+    parser.add_argument("--dd", action="store_true")
+    parser.add_argument("--include_dummy_imports", action="store_true")
+    parser.add_argument("--ground_truth_dir")
+    parser.add_argument("--no_cache", action="store_true")
+    parser.add_argument("-v", action="count", default=0)
+    args = parser.parse_args()
+
+    files = input_files(args.input)
+    if not files:
+        print(f"ERROR: no .xlsx files found in {' '.join(args.input)}", file=sys.stderr)
+        return 1
+    log("INFO", "convert_xl_to_times", f"Loading {len(files)} files from {' '.join(args.input)}")
+
+    start = time.perf_counter()
+    tables = []
+    for path in files:
+        log("INFO", "convert_xl_to_times", f"Processing {path.name}")
+        for sheet, cells in read_workbook(path):
+            for tag, position, header, rows in find_tables(cells):
+                tables.append((str(path.resolve()), sheet, tag, position, header, rows))
+    log("INFO", "convert_xl_to_times",
+        f"Extracted (potentially cached) {len(tables)} tables, {sum(len(t[5]) for t in tables)} rows "
+        f"in {time.perf_counter() - start:.4f} seconds")
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    if args.only_read:
+        start = time.perf_counter()
+        write_raw_tables(output_dir / "raw_tables.txt", tables)
+        log("INFO", "timed", f"write_raw_tables took {time.perf_counter() - start:.4f} seconds")
+        return 0
+
+    start = time.perf_counter()
+    regions = regions_of([t[2:] for t in tables], args.regions)
+    tables = [t for t in tables if t[4]]
+    log("INFO", "timed", f"normalize_tags_columns took {time.perf_counter() - start:.4f} seconds")
+
+    start = time.perf_counter()
+    written = write_csv_tables(output_dir, tables, regions)
+    log("INFO", "timed", f"write_csv_tables took {time.perf_counter() - start:.4f} seconds")
+    log("INFO", "write_csv_tables",
+        f"Excel files successfully converted to CSV and written to {output_dir} ({written} tables)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""
+Minimal, standard-library-only reading and writing of .xlsx cell values.
+
+Used by the benchmark suite to scale up the bundled VEDA models and by the stub
+xl2times, which both have to run without openpyxl. Only cell values are read
+(formulas come back as their cached results, as xl2times sees them) and
+workbooks are written with inline strings and no styles.
+"""
+
+import re
+import zipfile
+from typing import Dict, Iterator, List, Tuple, Union
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+Value = Union[str, float]
+Cells = Dict[Tuple[int, int], Value]
+
+_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_CELL_REF = re.compile(r"([A-Z]+)(\d+)")
+
+
+def column_index(letters: str) -> int:
+    """Convert column letters to a 1-based index (A -> 1, AA -> 27)."""
+    index = 0
+    for letter in letters:
+        index = index * 26 + ord(letter) - 64
+    return index
+
+
+def column_letters(index: int) -> str:
+    """Convert a 1-based column index to letters."""
+    letters = ""
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _text(element) -> str:
+    """Concatenate the <t> texts of a shared or inline string (plain or rich text)."""
+    return "".join(t.text or "" for t in element.iter(f"{_NS}t"))
+
+
+def _sheet_paths(archive: zipfile.ZipFile) -> List[Tuple[str, str]]:
+    """Return (sheet name, archive path) in workbook order."""
+    rels = ElementTree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    targets = {}
+    for rel in rels:
+        target = rel.get("Target", "")
+        target = target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+        targets[rel.get("Id")] = target
+    workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+    return [
+        (sheet.get("name"), targets[sheet.get(f"{_REL_NS}id")])
+        for sheet in workbook.iter(f"{_NS}sheet")
+    ]
+
+
+def read_workbook(path) -> List[Tuple[str, Cells]]:
+    """Return the non-empty cell values of every sheet as (sheet name, {(row, col): value})."""
+    with zipfile.ZipFile(path) as archive:
+        shared: List[str] = []
+        if "xl/sharedStrings.xml" in archive.namelist():
+            with archive.open("xl/sharedStrings.xml") as f:
+                shared = [_text(si) for _, si in ElementTree.iterparse(f) if si.tag == f"{_NS}si"]
+
+        sheets = []
+        for name, sheet_path in _sheet_paths(archive):
+            cells: Cells = {}
+            with archive.open(sheet_path) as f:
+                for _, cell in ElementTree.iterparse(f):
+                    if cell.tag != f"{_NS}c":
+                        continue
+                    value = _cell_value(cell, shared)
+                    if value is not None and value != "":
+                        letters, row = _CELL_REF.match(cell.get("r")).groups()
+                        cells[int(row), column_index(letters)] = value
+                    cell.clear()
+            sheets.append((name, cells))
+        return sheets
+
+
+def _cell_value(cell, shared: List[str]):
+    kind = cell.get("t", "n")
+    if kind == "inlineStr":
+        inline = cell.find(f"{_NS}is")
+        return _text(inline) if inline is not None else None
+    v = cell.find(f"{_NS}v")
+    if v is None or v.text is None:
+        return None
+    if kind == "s":
+        return shared[int(v.text)]
+    if kind in ("str", "e"):
+        return v.text
+    if kind == "b":
+        return float(v.text)
+    try:
+        return float(v.text)
+    except ValueError:
+        return v.text
+
+
+def find_tables(cells: Cells) -> Iterator[Tuple[str, Tuple[int, int], List[str], List[List[Value]]]]:
+    """
+    Yield VEDA tables as (tag, position, header, rows).
+
+    A table starts at a cell whose text begins with ``~``; its header is the run
+    of non-empty cells on the next row and its rows continue until a row with
+    no values under the header.
+    """
+    for (row, col), value in sorted(cells.items()):
+        if not isinstance(value, str) or not value.startswith("~"):
+            continue
+        header = []
+        c = col
+        while (row + 1, c) in cells:
+            header.append(str(cells[row + 1, c]))
+            c += 1
+        rows = []
+        r = row + 2
+        while header:
+            values = [cells.get((r, col + i), "") for i in range(len(header))]
+            if all(v == "" for v in values):
+                break
+            rows.append(values)
+            r += 1
+        yield value.split(":")[0].strip(), (row, col), header, rows
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def write_workbook(path, sheets: List[Tuple[str, Cells]]) -> None:
+    """Write sheets of cell values to a minimal .xlsx file."""
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            + "".join(
+                f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+                'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                for i in range(1, len(sheets) + 1)
+            )
+            + "</Types>"
+        ))
+        archive.writestr("_rels/.rels", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+            'Target="xl/workbook.xml"/></Relationships>'
+        ))
+        archive.writestr("xl/workbook.xml", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><sheets>'
+            + "".join(
+                f'<sheet name="{escape(name, {chr(34): "&quot;"})}" sheetId="{i}" r:id="rId{i}"/>'
+                for i, (name, _) in enumerate(sheets, 1)
+            )
+            + "</sheets></workbook>"
+        ))
+        archive.writestr("xl/_rels/workbook.xml.rels", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            + "".join(
+                f'<Relationship Id="rId{i}" '
+                'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+                f'Target="worksheets/sheet{i}.xml"/>'
+                for i in range(1, len(sheets) + 1)
+            )
+            + "</Relationships>"
+        ))
+        for i, (_, cells) in enumerate(sheets, 1):
+            archive.writestr(f"xl/worksheets/sheet{i}.xml", _sheet_xml(cells))
+
+
+def _sheet_xml(cells: Cells) -> str:
+    rows: Dict[int, List[Tuple[int, Value]]] = {}
+    for (row, col), value in cells.items():
+        rows.setdefault(row, []).append((col, value))
+
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+    ]
+    for row in sorted(rows):
+        parts.append(f'<row r="{row}">')
+        for col, value in sorted(rows[row]):
+            ref = f"{column_letters(col)}{row}"
+            if isinstance(value, float):
+                parts.append(f'<c r="{ref}"><v>{_format_number(value)}</v></c>')
+            else:
+                parts.append(f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{escape(value)}</t></is></c>')
+        parts.append("</row>")
+    parts.append("</sheetData></worksheet>")
+    return "".join(parts)
@@ -3,7 +3,7 @@
 import os
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 from dotenv import load_dotenv
 from loguru import logger
@@ -20,20 +20,102 @@ class Config:
     SERVER_VERSION: str = os.getenv("MCP_SERVER_VERSION", "0.1.0")
     SERVER_DESCRIPTION: str = "MCP server for xl2times VEDA-TIMES processing"
 
+    # Transport: stdio (one client per process), or streamable-http / sse so one
+    # process serves many client sessions with shared workers and caches
+    MCP_TRANSPORT: str = os.getenv("MCP_TRANSPORT", "stdio")
+    MCP_HOST: str = os.getenv("MCP_HOST", "127.0.0.1")
+    MCP_PORT: int = int(os.getenv("MCP_PORT", "8000"))
+
     # XL2TIMES settings
     XL2TIMES_COMMAND: str = os.getenv("XL2TIMES_COMMAND", "uvx xl2times")
     XL2TIMES_TIMEOUT: int = int(os.getenv("XL2TIMES_TIMEOUT", "300"))
+    XL2TIMES_VERSION_TTL: int = int(os.getenv("XL2TIMES_VERSION_TTL", "3600"))
+    # Run xl2times under a small launcher that reports its CPU time and peak RSS
+    # (costs an extra interpreter start per run)
+    RUN_RUSAGE_ENABLED: bool = os.getenv("RUN_RUSAGE_ENABLED", "false").lower() == "true"
+
+    # Warm worker pool (0 disables the pool and spawns XL2TIMES_COMMAND per run)
+    XL2TIMES_POOL_SIZE: int = int(os.getenv("XL2TIMES_POOL_SIZE", "0"))
+    XL2TIMES_WORKER_COMMAND: str = os.getenv("XL2TIMES_WORKER_COMMAND", "uvx --from xl2times python")
+    XL2TIMES_WORKER_MAX_JOBS: int = int(os.getenv("XL2TIMES_WORKER_MAX_JOBS", "50"))
+    XL2TIMES_WORKER_MAX_RSS_MB: int = int(os.getenv("XL2TIMES_WORKER_MAX_RSS_MB", "2048"))
+
+    # Run scheduling (memory budget 0 disables memory-based admission)
+    MAX_PARALLEL_RUNS: int = int(os.getenv("MAX_PARALLEL_RUNS", "2"))
+    MAX_QUEUED_RUNS: int = int(os.getenv("MAX_QUEUED_RUNS", "20"))
+    RUN_MEMORY_BUDGET_MB: int = int(os.getenv("RUN_MEMORY_BUDGET_MB", "4096"))
+    RUN_MEMORY_BASE_MB: int = int(os.getenv("RUN_MEMORY_BASE_MB", "256"))
+    RUN_MEMORY_FACTOR: float = float(os.getenv("RUN_MEMORY_FACTOR", "20"))
+
+    # Background jobs (xl2times_submit): finished jobs kept for later fetch
+    JOB_RETENTION: int = int(os.getenv("JOB_RETENTION", "100"))
+    JOB_TTL_SECONDS: int = int(os.getenv("JOB_TTL_SECONDS", "3600"))
 
     # File handling
     MAX_FILE_SIZE_MB: int = int(os.getenv("MAX_FILE_SIZE_MB", "100"))
     MAX_FILE_SIZE_BYTES: int = MAX_FILE_SIZE_MB * 1024 * 1024
     TEMP_DIR: Path = Path(os.getenv("TEMP_DIR", "/tmp/xl2times-mcp"))
+    # Include the sha256 of every output file in a run's output_manifest
+    OUTPUT_MANIFEST_HASHES: bool = os.getenv("OUTPUT_MANIFEST_HASHES", "true").lower() == "true"
+
+    # Run logs (stored under TEMP_DIR/logs): gzip, zstd (needs zstandard) or none;
+    # the oldest are removed beyond the size or age limit (0 = no limit)
+    RUN_LOG_COMPRESSION: str = os.getenv("RUN_LOG_COMPRESSION", "gzip")
+    RUN_LOG_MAX_MB: int = int(os.getenv("RUN_LOG_MAX_MB", "500"))
+    RUN_LOG_RETENTION_DAYS: float = float(os.getenv("RUN_LOG_RETENTION_DAYS", "14"))
+
+    # Result cache (stored under TEMP_DIR/result_cache)
+    RESULT_CACHE_ENABLED: bool = os.getenv("RESULT_CACHE_ENABLED", "true").lower() == "true"
+    RESULT_CACHE_MAX_MB: int = int(os.getenv("RESULT_CACHE_MAX_MB", "1024"))
+    RESULT_CACHE_MAX_ENTRIES: int = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "100"))
+
+    # Per-workbook raw table cache for only_read runs (stored under TEMP_DIR/extraction_cache)
+    EXTRACTION_CACHE_ENABLED: bool = os.getenv("EXTRACTION_CACHE_ENABLED", "true").lower() == "true"
+
+    # Build the row-level provenance index (provenance.idx) right after each run; otherwise
+    # xl2times_provenance builds it on first use
+    PROVENANCE_INDEX_ENABLED: bool = os.getenv("PROVENANCE_INDEX_ENABLED", "false").lower() == "true"
+
+    # xl2times_raw_tables paging
+    RAW_TABLES_PAGE_SIZE: int = int(os.getenv("RAW_TABLES_PAGE_SIZE", "20"))
+    RAW_TABLES_MAX_PAGE_SIZE: int = int(os.getenv("RAW_TABLES_MAX_PAGE_SIZE", "100"))
+    RAW_TABLES_MAX_ROWS: int = int(os.getenv("RAW_TABLES_MAX_ROWS", "200"))
+
+    # xl2times_query table stores (one per output directory)
+    QUERY_STORE_MAX_ENTRIES: int = int(os.getenv("QUERY_STORE_MAX_ENTRIES", "8"))
+    QUERY_MAX_ROWS: int = int(os.getenv("QUERY_MAX_ROWS", "500"))
+
+    # xl2times_scan worker processes (0 scans in the server process)
+    SCAN_WORKERS: int = int(os.getenv("SCAN_WORKERS", "4"))
+
+    # Watch mode (xl2times_watch): changed workbooks in watched directories are converted
+    # in the background at low priority to warm the result cache
+    WATCH_ENABLED: bool = os.getenv("WATCH_ENABLED", "false").lower() == "true"
+    WATCH_DIRS: List[str] = [d.strip() for d in os.getenv("WATCH_DIRS", "").split(",") if d.strip()]
+    WATCH_DEBOUNCE_SECONDS: float = float(os.getenv("WATCH_DEBOUNCE_SECONDS", "2"))
+    WATCH_POLL_SECONDS: float = float(os.getenv("WATCH_POLL_SECONDS", "5"))
+    WATCH_PRIORITY: int = int(os.getenv("WATCH_PRIORITY", "100"))
+
+    # Tool responses: larger ones have their biggest fields truncated (0 = no limit),
+    # with the full values kept for xl2times_more
+    RESPONSE_MAX_BYTES: int = int(os.getenv("RESPONSE_MAX_BYTES", "65536"))
+    RESPONSE_STORE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_STORE_MAX_ENTRIES", "64"))
+
+    # xl2times_batch
+    BATCH_MAX_MODELS: int = int(os.getenv("BATCH_MAX_MODELS", "50"))
 
     # Logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     LOG_FILE: Optional[str] = os.getenv("LOG_FILE", "xl2times-mcp.log")
     LOG_MAX_SIZE: str = os.getenv("LOG_MAX_SIZE", "10MB")
     LOG_RETENTION: str = os.getenv("LOG_RETENTION", "7 days")
+    # Structured per-run metrics (JSON lines); empty disables
+    METRICS_LOG_FILE: Optional[str] = os.getenv("METRICS_LOG_FILE", str(TEMP_DIR / "metrics.jsonl"))
+
+    # Prometheus metrics endpoint (0 disables) and histogram percentile window
+    METRICS_PORT: int = int(os.getenv("METRICS_PORT", "0"))
+    METRICS_HOST: str = os.getenv("METRICS_HOST", "127.0.0.1")
+    METRICS_WINDOW_SIZE: int = int(os.getenv("METRICS_WINDOW_SIZE", "1000"))
 
     # GAMS API settings (for Phase 2)
     GAMS_API_URL: Optional[str] = os.getenv("GAMS_API_URL")
@@ -47,7 +129,12 @@ class Config:
 
         # Log configuration
         logger.info(f"Server: {cls.SERVER_NAME} v{cls.SERVER_VERSION}")
+        if cls.MCP_TRANSPORT != "stdio":
+            logger.info(f"Transport: {cls.MCP_TRANSPORT} on {cls.MCP_HOST}:{cls.MCP_PORT}")
         logger.info(f"XL2TIMES command: {cls.XL2TIMES_COMMAND}")
+        if cls.XL2TIMES_POOL_SIZE > 0:
+            logger.info(f"XL2TIMES worker pool: {cls.XL2TIMES_POOL_SIZE} x {cls.XL2TIMES_WORKER_COMMAND}")
+        logger.info(f"Max parallel runs: {cls.MAX_PARALLEL_RUNS} (queue {cls.MAX_QUEUED_RUNS})")
         logger.info(f"Temp directory: {cls.TEMP_DIR}")
         logger.info(f"Max file size: {cls.MAX_FILE_SIZE_MB}MB")
 
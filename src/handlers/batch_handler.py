@@ -0,0 +1,179 @@
+"""Handler for xl2times_batch tool."""
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from loguru import logger
+
+from ..config import config
+from ..utils.file_manager import find_input_workbooks, hash_file
+from ..wrappers.xl2times_wrapper import RunProgress
+from .xl2times_handler import XL2TimesHandler
+
+
+class BatchHandler:
+    """Converts many models or option sets in one call."""
+
+    def __init__(self, xl2times_handler: XL2TimesHandler):
+        """
+        Initialize the handler.
+
+        Args:
+            xl2times_handler: Handler used for each model, so the batch shares the
+                scheduler, worker pool, result cache and extraction cache
+        """
+        self.xl2times_handler = xl2times_handler
+
+    async def run_batch(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run xl2times on every model in the batch.
+
+        Args:
+            arguments: Dictionary with ``models`` (list of xl2times_run arguments)
+                and optional ``defaults`` applied to every model
+
+        Returns:
+            Compact summary per model and aggregate throughput
+        """
+        models = arguments.get("models")
+        if not models or not isinstance(models, list):
+            raise ValueError("models must be a non-empty list of xl2times_run arguments")
+        if len(models) > config.BATCH_MAX_MODELS:
+            raise ValueError(f"At most {config.BATCH_MAX_MODELS} models per batch")
+
+        defaults = arguments.get("defaults") or {}
+        items = [{**defaults, **model} for model in models]
+        output_dirs: Dict[str, int] = {}
+        for i, (model, item) in enumerate(zip(models, items)):
+            if not item.get("input"):
+                raise ValueError(f"models[{i}] has no input")
+            # Models inheriting the default output_dir each get a subdirectory of it
+            if "output_dir" not in model and item.get("output_dir"):
+                item["output_dir"] = str(Path(item["output_dir"]) / str(i))
+            if item.get("output_dir"):
+                output_dir = str(Path(item["output_dir"]).resolve())
+                if output_dir in output_dirs:
+                    raise ValueError(f"models[{output_dirs[output_dir]}] and models[{i}] use the same output_dir")
+                output_dirs[output_dir] = i
+
+        logger.info(f"Processing xl2times_batch request with {len(items)} models")
+        start = time.time()
+
+        workbooks = await asyncio.to_thread(self._hash_workbooks, items)
+        await self._prime_extraction_cache(items, workbooks)
+
+        # Identical conversions run one after another so later ones are served
+        # from the result cache; different ones run concurrently under the scheduler
+        groups: Dict[str, List[int]] = {}
+        for i, item in enumerate(items):
+            options = {k: v for k, v in item.items() if k not in ("output_dir", "priority")}
+            groups.setdefault(json.dumps(options, sort_keys=True, default=str), []).append(i)
+
+        results: List[Dict[str, Any]] = [{} for _ in items]
+
+        async def run_group(indices: List[int]) -> None:
+            for i in indices:
+                results[i] = await self._run_item(items[i])
+
+        await asyncio.gather(*(run_group(indices) for indices in groups.values()))
+        wall_time = time.time() - start
+
+        summaries = [self._summarize(item, result) for item, result in zip(items, results)]
+        return {
+            "models": summaries,
+            "aggregate": self._aggregate(summaries, workbooks, wall_time)
+        }
+
+    async def _run_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return await self.xl2times_handler.run(item, progress=RunProgress())
+        except Exception as e:
+            logger.error(f"Batch model {item.get('input')} failed: {e}")
+            return {"success": False, "errors": [str(e)], "message": str(e)}
+
+    def _hash_workbooks(self, items: List[Dict[str, Any]]) -> List[List[Tuple[str, Path, str]]]:
+        """Return (name, path, content hash) of every model's workbooks, hashing each file once."""
+        hashed = []
+        for item in items:
+            found = find_input_workbooks(item["input"]) or []
+            hashed.append([(name, path, hash_file(path)) for name, path in found])
+        return hashed
+
+    async def _prime_extraction_cache(
+        self, items: List[Dict[str, Any]], workbooks: List[List[Tuple[str, Path, str]]]
+    ) -> None:
+        """
+        Read each distinct workbook of the batch's only_read models once.
+
+        Workbooks with the same content in several models (SysSettings.xlsx,
+        Sets-*.xlsx, ...) are read from a single copy; every model then
+        assembles its raw_tables.txt from the extraction cache.
+        """
+        distinct: Dict[str, Path] = {}
+        for item, found in zip(items, workbooks):
+            if item.get("only_read") and item.get("output_dir") and not item.get("no_cache"):
+                for _, path, sha in found:
+                    distinct.setdefault(sha, path)
+        if len(distinct) < 2:
+            return
+
+        try:
+            read = await self.xl2times_handler.wrapper.prime_extraction_cache(list(distinct.values()))
+            logger.info(f"Pre-read {read} distinct workbooks for the batch")
+        except Exception as e:
+            logger.warning(f"Could not pre-read shared workbooks: {e}")
+
+    def _summarize(self, item: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+        """Reduce a full xl2times_run result to what a batch caller needs."""
+        summary = {
+            "input": item["input"],
+            "output_dir": item.get("output_dir"),
+            "success": result.get("success", False),
+            "message": result.get("message", ""),
+            "output_files": len(result.get("output_files", [])),
+            "warnings": len(result.get("warnings", [])),
+            "errors": result.get("errors", [])[:3],
+            "run_time": round(result.get("run_time", 0.0), 3),
+            "queue_wait_time": round(result.get("queue_wait_time", 0.0), 3),
+            "cache_hit": bool((result.get("cache") or {}).get("hit")),
+            "log_id": result.get("log_id"),
+            "log_file": result.get("log_file", "")
+        }
+        extraction = result.get("extraction")
+        if extraction:
+            summary["extraction"] = {"reused": len(extraction["reused"]), "reread": len(extraction["reread"])}
+        return summary
+
+    def _aggregate(
+        self, summaries: List[Dict[str, Any]], workbooks: List[List[Tuple[str, Path, str]]], wall_time: float
+    ) -> Dict[str, Any]:
+        """Batch totals, shared workbooks and throughput."""
+        models_by_hash: Dict[str, set] = {}
+        names: Dict[str, str] = {}
+        for i, found in enumerate(workbooks):
+            for name, _, sha in found:
+                models_by_hash.setdefault(sha, set()).add(i)
+                names.setdefault(sha, name)
+
+        total_workbooks = sum(len(found) for found in workbooks)
+        succeeded = sum(1 for s in summaries if s["success"])
+        return {
+            "models": len(summaries),
+            "succeeded": succeeded,
+            "failed": len(summaries) - succeeded,
+            "cache_hits": sum(1 for s in summaries if s["cache_hit"]),
+            "workbooks": total_workbooks,
+            "distinct_workbooks": len(models_by_hash),
+            "shared_workbooks": [
+                {"name": names[sha], "models": len(models)}
+                for sha, models in sorted(models_by_hash.items(), key=lambda kv: names[kv[0]])
+                if len(models) > 1
+            ],
+            "wall_time": round(wall_time, 3),
+            "total_run_time": round(sum(s["run_time"] for s in summaries), 3),
+            "models_per_minute": round(len(summaries) * 60 / wall_time, 2) if wall_time > 0 else None,
+            "workbooks_per_second": round(total_workbooks / wall_time, 2) if wall_time > 0 else None
+        }
@@ -0,0 +1,69 @@
+"""Handler for xl2times_diff tool."""
+
+import asyncio
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+from ..utils.table_diff import diff_output_dirs
+from ..wrappers.xl2times_wrapper import XL2TimesWrapper
+
+
+class DiffHandler:
+    """Compares the converted tables of two runs."""
+
+    def __init__(self, wrapper: Optional[XL2TimesWrapper] = None):
+        """
+        Initialize the handler.
+
+        Args:
+            wrapper: Wrapper whose result cache resolves cache keys
+        """
+        self.wrapper = wrapper
+
+    async def diff(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Diff two output directories or cached runs table by table.
+
+        Args:
+            arguments: Dictionary with ``a`` and ``b`` (output directory or
+                ``cache.key`` of an xl2times_run result; not the ``log_id`` or
+                ``run_id`` of a run) and optional ``max_samples``
+
+        Returns:
+            Added, removed and changed rows per table
+        """
+        logger.info("Processing xl2times_diff request")
+
+        a = self._resolve(arguments.get("a"), "a")
+        b = self._resolve(arguments.get("b"), "b")
+        max_samples = int(arguments.get("max_samples", 20))
+
+        start = time.perf_counter()
+        result = await asyncio.to_thread(diff_output_dirs, a, b, max_samples)
+        diff_ms = (time.perf_counter() - start) * 1000
+
+        logger.info(
+            f"xl2times_diff compared {result['tables_compared']} tables in {diff_ms:.1f} ms "
+            f"({len(result['tables_changed'])} changed)"
+        )
+        return {"a": str(a), "b": str(b), **result, "diff_time_ms": round(diff_ms, 3)}
+
+    def _resolve(self, value: Optional[str], name: str) -> Path:
+        """Resolve an output directory or result cache key to a directory of output tables."""
+        if not value:
+            raise ValueError(f"{name} required: an output directory or cache key")
+
+        path = Path(value)
+        if path.is_dir():
+            return path
+
+        cache = self.wrapper.result_cache if self.wrapper is not None else None
+        if cache is not None:
+            files_dir = cache.files_dir(value)
+            if files_dir is not None:
+                return files_dir
+
+        raise ValueError(f"{name} is neither an output directory nor a result cache key: {value}")
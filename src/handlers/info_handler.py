@@ -1,17 +1,40 @@
 """Handler for xl2times_info tool."""
 
+import asyncio
 import platform
-import subprocess
 from typing import Any, Dict, Optional
 
 from loguru import logger
 
 from ..config import config
+from ..utils.columnar import columnar_available
+from ..utils.version_probe import VersionProbe
+from ..wrappers.xl2times_wrapper import XL2TimesWrapper
 
 
 class InfoHandler:
     """Handler for server and xl2times information."""
 
+    def __init__(self, wrapper: Optional[XL2TimesWrapper] = None):
+        """
+        Initialize the handler.
+
+        Args:
+            wrapper: Wrapper used by xl2times_run, for reporting cache statistics
+                and sharing its version probe
+        """
+        self.wrapper = wrapper
+        if wrapper is not None:
+            self.version_probe = wrapper.version_probe
+        else:
+            self.version_probe = VersionProbe(
+                ttl=config.XL2TIMES_VERSION_TTL, python_command=config.XL2TIMES_WORKER_COMMAND.split()
+            )
+
+    def warm(self) -> None:
+        """Start the version probe in the background so the first info call is fast."""
+        self.version_probe.warm(config.XL2TIMES_COMMAND.split())
+
     async def get_info(self) -> Dict[str, Any]:
         """
         Get information about xl2times installation and server capabilities.
@@ -50,35 +73,27 @@ class InfoHandler:
                     "dd",
                     "only_read",
                     "no_cache",
-                    "verbose"
-                ]
-            }
+                    "verbose",
+                    "priority",
+                    "shards",
+                    "output_format"
+                ],
+                "output_formats": ["csv", "arrow", "parquet"] if columnar_available() else ["csv"]
+            },
+            "result_cache": await self._get_result_cache_stats(),
+            "scheduler": self.wrapper.scheduler.stats() if self.wrapper is not None else None
         }
 
         logger.info("xl2times_info completed")
         return info
 
-    async def _get_xl2times_version(self) -> Optional[str]:
-        """Get xl2times version by running --help command."""
-        try:
-            # Try to get version from xl2times
-            cmd = f"{config.XL2TIMES_COMMAND} --help"
-            result = subprocess.run(
-                cmd,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-
-            # Parse version from output if available
-            # For now, just check if command works
-            if result.returncode == 0:
-                return "Available (version detection pending)"
-            else:
-                return None
-
-        except Exception as e:
-            logger.warning(f"Could not get xl2times version: {e}")
-            return None
+    async def _get_result_cache_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters of the xl2times_run result cache."""
+        if self.wrapper is None or self.wrapper.result_cache is None:
+            return {"enabled": False}
+        # Sizing the cache walks every entry on disk
+        return await asyncio.to_thread(self.wrapper.result_cache.stats)
 
+    async def _get_xl2times_version(self) -> Optional[str]:
+        """Get the xl2times version from the shared, cached version probe."""
+        return await self.version_probe.get(config.XL2TIMES_COMMAND.split())
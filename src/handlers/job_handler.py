@@ -0,0 +1,154 @@
+"""Handler for asynchronous xl2times jobs (submit, status, result, cancel)."""
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+from ..config import config
+from ..wrappers.xl2times_wrapper import RunProgress
+from .xl2times_handler import XL2TimesHandler
+
+FINISHED_STATES = ("completed", "failed", "cancelled")
+
+
+@dataclass
+class Job:
+    """A submitted xl2times run."""
+
+    job_id: str
+    arguments: Dict[str, Any]
+    submitted_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    status: str = "queued"
+    progress: RunProgress = field(default_factory=RunProgress)
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    task: Optional[asyncio.Task] = None
+    owner: Optional[str] = None
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the job's status and live progress."""
+        status = self.status
+        if status not in FINISHED_STATES and self.progress.phase == "running":
+            status = "running"
+
+        end = self.finished_at or time.time()
+        return {
+            "job_id": self.job_id,
+            "status": status,
+            "input": self.arguments.get("input"),
+            "output_dir": self.arguments.get("output_dir"),
+            "submitted_at": self.submitted_at,
+            "elapsed": round(end - self.submitted_at, 3),
+            "progress": self.progress.snapshot(),
+            "error": self.error
+        }
+
+
+class JobHandler:
+    """Runs xl2times conversions in the background and keeps their results."""
+
+    def __init__(self, xl2times_handler: XL2TimesHandler):
+        """
+        Initialize the handler.
+
+        Args:
+            xl2times_handler: Handler used to execute each job, so jobs share the
+                scheduler, worker pool and result cache with xl2times_run
+        """
+        self.xl2times_handler = xl2times_handler
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+
+    async def submit(self, arguments: Dict[str, Any], session_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Start an xl2times run in the background.
+
+        Args:
+            arguments: Same arguments as xl2times_run
+            session_id: Client session that owns the job; other sessions cannot see it
+
+        Returns:
+            Dictionary with the job ID and initial status
+        """
+        if not arguments.get("input"):
+            raise ValueError("Input files or directory required")
+
+        self._prune()
+
+        job = Job(job_id=uuid.uuid4().hex[:12], arguments=dict(arguments), owner=session_id)
+        job.task = asyncio.create_task(self._run(job))
+        self.jobs[job.job_id] = job
+
+        logger.info(f"Submitted xl2times job {job.job_id}")
+        return job.summary()
+
+    async def status(self, arguments: Dict[str, Any], session_id: Optional[str] = None) -> Dict[str, Any]:
+        """Return status and live progress of a job."""
+        return self._get_job(arguments, session_id).summary()
+
+    async def result(self, arguments: Dict[str, Any], session_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Return the result of a finished job.
+
+        If the job is still running, only its status is returned with
+        ``ready`` set to False.
+        """
+        job = self._get_job(arguments, session_id)
+        response = job.summary()
+        response["ready"] = job.status in FINISHED_STATES
+        response["result"] = job.result
+        return response
+
+    async def cancel(self, arguments: Dict[str, Any], session_id: Optional[str] = None) -> Dict[str, Any]:
+        """Cancel a queued or running job."""
+        job = self._get_job(arguments, session_id)
+        if job.status not in FINISHED_STATES and job.task is not None:
+            job.task.cancel()
+            try:
+                await job.task
+            except asyncio.CancelledError:
+                pass
+        return job.summary()
+
+    async def _run(self, job: Job) -> None:
+        """Execute a job and record its outcome."""
+        try:
+            job.result = await self.xl2times_handler.run(job.arguments, progress=job.progress)
+            job.status = "completed" if job.result.get("success") else "failed"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            logger.info(f"xl2times job {job.job_id} cancelled")
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            logger.error(f"xl2times job {job.job_id} failed: {e}")
+        finally:
+            job.finished_at = time.time()
+
+    def _get_job(self, arguments: Dict[str, Any], session_id: Optional[str] = None) -> Job:
+        job_id = arguments.get("job_id")
+        if not job_id:
+            raise ValueError("job_id required")
+        job = self.jobs.get(job_id)
+        # Jobs of other sessions are reported as unknown rather than forbidden
+        if job is None or (job.owner is not None and job.owner != session_id):
+            raise ValueError(f"Unknown job: {job_id}")
+        return job
+
+    def _prune(self) -> None:
+        """Drop finished jobs older than JOB_TTL_SECONDS or beyond JOB_RETENTION."""
+        now = time.time()
+        finished = [job for job in self.jobs.values() if job.status in FINISHED_STATES]
+
+        for job in finished:
+            if now - job.finished_at > config.JOB_TTL_SECONDS:
+                del self.jobs[job.job_id]
+
+        finished = [job for job in self.jobs.values() if job.status in FINISHED_STATES]
+        for job in finished[:max(0, len(finished) - config.JOB_RETENTION)]:
+            del self.jobs[job.job_id]
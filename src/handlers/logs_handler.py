@@ -0,0 +1,52 @@
+"""Handler for xl2times_logs tool."""
+
+import asyncio
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+from ..wrappers.xl2times_wrapper import XL2TimesWrapper
+
+LEVELS = ("warning", "error")
+
+
+class LogsHandler:
+    """Searches the warning and error lines of stored run logs, and reads single logs."""
+
+    def __init__(self, wrapper: XL2TimesWrapper):
+        """Initialize with the wrapper whose runs write the logs."""
+        self.log_store = wrapper.log_store
+
+    async def search(self, arguments: Dict[str, Any], session_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Search run logs.
+
+        Args:
+            arguments: Dictionary with optional ``query`` (words that must all
+                appear in a line), ``level`` (warning or error), ``limit`` (runs
+                returned) and ``run_id``. With ``run_id``, that run's full log is
+                read instead and its last ``tail`` lines containing ``query`` are
+                returned.
+            session_id: Calling client session; only its own runs are visible
+
+        Returns:
+            Matching runs, newest first, with their matching warning and error
+            lines; or the record and log lines of one run
+        """
+        logger.info("Processing xl2times_logs request")
+
+        query = arguments.get("query") or ""
+        level = arguments.get("level")
+        if level is not None and level not in LEVELS:
+            raise ValueError(f"level must be one of {', '.join(LEVELS)}")
+
+        run_id = arguments.get("run_id")
+        if run_id:
+            record = self.log_store.get(run_id, session_id)
+            tail = int(arguments.get("tail", 100))
+            lines = await asyncio.to_thread(self.log_store.grep, run_id, query, tail)
+            return {**{k: v for k, v in record.items() if k != "lines"}, "query": query, "log_lines": lines}
+
+        limit = int(arguments.get("limit", 20))
+        runs = await asyncio.to_thread(self.log_store.search, query, level, limit, session_id)
+        return {"query": query, "level": level, "runs": runs, "store": self.log_store.stats()}
@@ -0,0 +1,66 @@
+"""Handler for xl2times_metrics tool."""
+
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+from ..config import config
+from ..utils.metrics import MetricsRegistry, registry
+
+
+def _rate(part: float, total: float) -> Optional[float]:
+    return round(part / total, 4) if total else None
+
+
+class MetricsHandler:
+    """Reports the server's run, cache and tool metrics."""
+
+    def __init__(self, metrics: Optional[MetricsRegistry] = None):
+        """
+        Initialize the handler.
+
+        Args:
+            metrics: Registry to report (the server-wide registry by default)
+        """
+        self.metrics = metrics or registry
+
+    async def get_metrics(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Summarize the metrics collected since the server started.
+
+        Args:
+            arguments: Dictionary with optional ``format``: ``summary`` (default)
+                or ``prometheus`` for the text exposition format
+
+        Returns:
+            Headline rates, counters, gauges and histogram percentiles
+        """
+        logger.info("Processing xl2times_metrics request")
+
+        output_format = arguments.get("format", "summary")
+        if output_format == "prometheus":
+            return {"format": "prometheus", "text": self.metrics.render()}
+        if output_format != "summary":
+            raise ValueError("format must be 'summary' or 'prometheus'")
+
+        summary = self.metrics.summary()
+        runs = self.metrics.counter("xl2times_runs_total", "xl2times runs by outcome", ["outcome"])
+        cache = self.metrics.counter(
+            "xl2times_result_cache_requests_total", "Result cache lookups by result", ["result"]
+        )
+        total_runs = runs.total()
+        cache_lookups = cache.total()
+
+        return {
+            "runs": {
+                "total": total_runs,
+                "failure_rate": _rate(runs.total(outcome="failure") + runs.total(outcome="error"), total_runs),
+                "timeout_rate": _rate(runs.total(outcome="timeout"), total_runs),
+                "cache_hit_rate": _rate(cache.total(result="hit"), cache_lookups),
+                "duration_seconds": summary["histograms"].get("xl2times_run_duration_seconds")
+            },
+            **summary,
+            "endpoint": (
+                f"http://{config.METRICS_HOST}:{config.METRICS_PORT}/metrics" if config.METRICS_PORT else None
+            )
+        }
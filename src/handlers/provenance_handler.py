@@ -0,0 +1,89 @@
+"""Handler for xl2times_provenance tool."""
+
+import asyncio
+from pathlib import Path
+from typing import Any, Dict
+
+from loguru import logger
+
+from ..utils.provenance import (
+    MERGED_TABLES_FILE,
+    PROVENANCE_FILE,
+    build_provenance_index,
+    get_provenance_index,
+)
+
+
+class ProvenanceHandler:
+    """Traces rows of converted tables back to the workbook, sheet, range and tag they came from."""
+
+    async def lookup(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Find the source of one output row.
+
+        Args:
+            arguments: Dictionary with ``output_dir``, ``table`` and ``row``: the
+                row's key column values as an object (column -> value) or a list
+                in key column order. Without ``row``, the table's key columns are
+                returned.
+
+        Returns:
+            The source workbook, VEDA tag, sheet and range of the row, and its
+            row number in the table's CSV file
+        """
+        logger.info("Processing xl2times_provenance request")
+
+        output_dir = arguments.get("output_dir")
+        table_name = arguments.get("table")
+        if not output_dir or not table_name:
+            raise ValueError("output_dir and table required")
+        output_dir = Path(output_dir)
+        if not output_dir.is_dir():
+            raise ValueError(f"Output directory not found: {output_dir}")
+
+        index = await asyncio.to_thread(self._index, output_dir)
+        name = table_name.upper().removesuffix("_OUTPUT.CSV")
+        table = index.tables.get(name)
+        if table is None:
+            raise ValueError(f"Unknown table {table_name}; tables: {', '.join(sorted(index.tables))}")
+
+        row = arguments.get("row")
+        if row is None:
+            return {"table": table["name"], "key_columns": table["key_columns"], "rows": table["rows"]}
+
+        key_columns = table["key_columns"]
+        if isinstance(row, dict):
+            values = {column.upper(): value for column, value in row.items()}
+            missing = [column for column in key_columns if column.upper() not in values]
+            if missing:
+                raise ValueError(f"row is missing key columns {', '.join(missing)} of {table['name']}")
+            key = [values[column.upper()] for column in key_columns]
+        else:
+            key = list(row)
+            if len(key) != len(key_columns):
+                raise ValueError(f"row must have {len(key_columns)} values: {', '.join(key_columns)}")
+
+        found = index.lookup(name, key)
+        response = {
+            "table": table["name"],
+            "key": dict(zip(key_columns, key)),
+            "found": found is not None,
+            "source": None
+        }
+        if found is not None:
+            source, row_number = found
+            response["csv_file"] = table["file"]
+            response["csv_row"] = row_number
+            response["source"] = source
+        return response
+
+    def _index(self, output_dir: Path):
+        """Open the directory's provenance index, (re)building it if missing or older than the tables."""
+        path = output_dir / PROVENANCE_FILE
+        merged_tables = output_dir / MERGED_TABLES_FILE
+        if merged_tables.is_file() and (not path.is_file() or path.stat().st_mtime_ns < merged_tables.stat().st_mtime_ns):
+            logger.info(f"Building provenance index for {output_dir}")
+            build_provenance_index(output_dir)
+        if not path.is_file():
+            raise ValueError(f"No provenance index or {MERGED_TABLES_FILE} in {output_dir}")
+        return get_provenance_index(path)
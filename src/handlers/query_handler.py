@@ -0,0 +1,108 @@
+"""Handler for xl2times_query tool."""
+
+import asyncio
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from ..config import config
+from ..utils.table_store import DIMENSIONS, Table, TableStoreCache
+
+
+def _as_values(value: Any) -> List[str]:
+    """Normalize a filter value (string, number or list of them) to a list of strings."""
+    values = value if isinstance(value, list) else [value]
+    return [str(int(v)) if isinstance(v, float) and v.is_integer() else str(v) for v in values]
+
+
+class QueryHandler:
+    """Answers filter/projection queries over a run's converted tables."""
+
+    def __init__(self):
+        """Initialize the handler with an empty table store cache."""
+        self.stores = TableStoreCache(config.QUERY_STORE_MAX_ENTRIES)
+
+    async def query(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Query the ``*_output.csv`` tables of an output directory.
+
+        Args:
+            arguments: Dictionary with ``output_dir`` and optional ``table``,
+                dimension filters (``region``, ``process``, ``commodity``,
+                ``year``, ``timeslice``), column ``filters``, ``columns`` and ``limit``
+
+        Returns:
+            Matching rows per table; without a table or any filter, the list of tables
+        """
+        output_dir = arguments.get("output_dir")
+        if not output_dir:
+            raise ValueError("output_dir required")
+        if not Path(output_dir).is_dir():
+            raise ValueError(f"Output directory not found: {output_dir}")
+
+        store = await asyncio.to_thread(self.stores.get, Path(output_dir))
+        start = time.perf_counter()
+
+        dimensions = {d: _as_values(arguments[d]) for d in DIMENSIONS if arguments.get(d) is not None}
+        filters = {c.upper(): _as_values(v) for c, v in (arguments.get("filters") or {}).items()}
+        columns = [c.upper() for c in arguments.get("columns") or []] or None
+        limit = int(arguments.get("limit", config.QUERY_MAX_ROWS))
+
+        table_name = arguments.get("table")
+        if table_name:
+            name = table_name.upper().removesuffix("_OUTPUT.CSV")
+            if name not in store.tables:
+                raise ValueError(f"Unknown table {table_name}; tables: {', '.join(sorted(store.tables))}")
+            tables = [store.tables[name]]
+        elif dimensions or filters:
+            tables = list(store.tables.values())
+        else:
+            return {
+                "output_dir": output_dir,
+                "tables": [
+                    {"table": t.name, "columns": t.columns, "rows": t.num_rows}
+                    for t in store.tables.values()
+                ]
+            }
+
+        results = []
+        remaining = limit
+        for table in tables:
+            table_filters = self._table_filters(table, dimensions, filters)
+            if table_filters is None:
+                if table_name:
+                    raise ValueError(f"Table {table.name} cannot be filtered that way; columns: {', '.join(table.columns)}")
+                continue
+            names, rows, matched = table.select(table_filters, columns, remaining)
+            if not matched and not table_name:
+                continue
+            results.append({
+                "table": table.name,
+                "columns": names,
+                "rows": rows,
+                "matched": matched,
+                "truncated": matched > len(rows)
+            })
+            remaining = max(0, remaining - len(rows))
+
+        query_ms = (time.perf_counter() - start) * 1000
+        logger.debug(f"xl2times_query answered in {query_ms:.3f} ms")
+        return {"output_dir": output_dir, "results": results, "query_time_ms": round(query_ms, 3)}
+
+    def _table_filters(
+        self, table: Table, dimensions: Dict[str, List[str]], filters: Dict[str, List[str]]
+    ) -> Optional[Dict[str, List[str]]]:
+        """Map dimension filters to this table's columns, or None if it lacks a filtered column."""
+        table_filters = {}
+        for dimension, values in dimensions.items():
+            column = table.dimension_column(dimension)
+            if column is None:
+                return None
+            table_filters[column] = values
+        for column, values in filters.items():
+            if column not in table.data:
+                return None
+            table_filters[column] = values
+        return table_filters
@@ -0,0 +1,90 @@
+"""Handler for xl2times_raw_tables tool."""
+
+import asyncio
+from pathlib import Path
+from typing import Any, Dict, List
+
+from loguru import logger
+
+from ..config import config
+from ..utils.raw_tables import RawTable, get_raw_tables_index
+
+
+class RawTablesHandler:
+    """Returns pages of tables from raw_tables.txt written by ``only_read`` runs."""
+
+    async def get_tables(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Return one page of tables, optionally filtered by tag, sheet or file.
+
+        Args:
+            arguments: Dictionary with ``path`` (raw_tables.txt or the run's output
+                directory) and optional ``tag``, ``sheetname``, ``filename``,
+                ``cursor``, ``limit``, ``max_rows`` and ``include_data``
+
+        Returns:
+            Dictionary with the matching tables and ``next_cursor`` for the next page
+        """
+        logger.info("Processing xl2times_raw_tables request")
+
+        path = arguments.get("path")
+        if not path:
+            raise ValueError("path to raw_tables.txt or the output directory required")
+        path = Path(path)
+        if path.is_dir():
+            path = path / "raw_tables.txt"
+        if not path.is_file():
+            raise ValueError(f"raw_tables.txt not found: {path}")
+
+        limit = max(1, min(int(arguments.get("limit", config.RAW_TABLES_PAGE_SIZE)), config.RAW_TABLES_MAX_PAGE_SIZE))
+        max_rows = arguments.get("max_rows", config.RAW_TABLES_MAX_ROWS)
+        include_data = arguments.get("include_data", True)
+
+        index = await asyncio.to_thread(get_raw_tables_index, path)
+        matches = self._filter(index.tables, arguments)
+
+        start = self._decode_cursor(arguments.get("cursor"), index.mtime_ns)
+        page = matches[start:start + limit]
+
+        tables = [table.header() for table in page]
+        if include_data:
+            data = await asyncio.to_thread(index.read, page, max_rows)
+            for table, (text, truncated) in zip(tables, data):
+                table["data"] = text
+                table["truncated"] = truncated
+
+        end = start + len(page)
+        return {
+            "path": str(path),
+            "total_tables": len(index.tables),
+            "matched_tables": len(matches),
+            "tables": tables,
+            "next_cursor": f"{index.mtime_ns}:{end}" if end < len(matches) else None
+        }
+
+    def _filter(self, tables: List[RawTable], arguments: Dict[str, Any]) -> List[RawTable]:
+        """Select tables by tag and sheet name (case-insensitive) and file name (substring)."""
+        tag = arguments.get("tag")
+        sheetname = arguments.get("sheetname")
+        filename = arguments.get("filename")
+
+        if tag:
+            wanted = tag.lower().lstrip("~")
+            tables = [t for t in tables if t.tag.lower().lstrip("~").split(":")[0] == wanted]
+        if sheetname:
+            tables = [t for t in tables if t.sheetname.lower() == sheetname.lower()]
+        if filename:
+            tables = [t for t in tables if filename.lower() in t.filename.lower()]
+        return tables
+
+    def _decode_cursor(self, cursor: Any, mtime_ns: int) -> int:
+        """Return the position encoded in a cursor, checking the file has not changed."""
+        if not cursor:
+            return 0
+        try:
+            cursor_mtime, position = (int(part) for part in str(cursor).split(":"))
+        except ValueError:
+            raise ValueError(f"Invalid cursor: {cursor}")
+        if cursor_mtime != mtime_ns:
+            raise ValueError("raw_tables.txt has changed since the cursor was issued; start again without a cursor")
+        return position
@@ -0,0 +1,114 @@
+"""Handler for xl2times_scan tool."""
+
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from ..config import config
+from ..utils.file_manager import find_input_workbooks
+from ..utils.workbook_scan import scan_workbook
+
+
+class ScanHandler:
+    """Lists the VEDA tables, ranges and regions of a model's workbooks without running xl2times."""
+
+    def __init__(self):
+        """Initialize the handler; the process pool is started on the first multi-workbook scan."""
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    async def scan(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Scan the workbooks of a model.
+
+        Args:
+            arguments: Dictionary with ``input`` (directory or list of files) and
+                optional ``tables`` (include the per-sheet table list, default True)
+
+        Returns:
+            Per-workbook sheets and tables, tag counts, regions from
+            ~BookRegions_Map, problems found and the scan time
+        """
+        logger.info("Processing xl2times_scan request")
+
+        input_files = arguments.get("input")
+        if not input_files:
+            raise ValueError("input required")
+        workbooks = find_input_workbooks(input_files)
+        if workbooks is None:
+            raise ValueError(f"Input not found: {input_files}")
+
+        start = time.perf_counter()
+        scans = await self._scan_all([str(path) for _, path in workbooks])
+        elapsed = time.perf_counter() - start
+
+        tags: Dict[str, int] = {}
+        regions: List[str] = []
+        problems: List[str] = []
+        sheets = tables = rows = 0
+        for (name, _), scan in zip(workbooks, scans):
+            scan["file"] = name
+            problems.extend(f"{name}: {problem}" for problem in scan.pop("problems"))
+            regions.extend(region for region in scan["regions"] if region not in regions)
+            sheets += len(scan["sheets"])
+            for sheet in scan["sheets"]:
+                for table in sheet["tables"]:
+                    # VEDA tags are case-insensitive: ~FI_T and ~fi_t are the same table type
+                    tag = table["tag"].upper()
+                    tags[tag] = tags.get(tag, 0) + 1
+                    tables += 1
+                    rows += table["rows"]
+            if not arguments.get("tables", True):
+                scan["sheets"] = [sheet["name"] for sheet in scan["sheets"]]
+
+        if workbooks and not regions:
+            problems.append("No regions found: no ~BookRegions_Map table with a Region column")
+
+        logger.info(f"Scanned {len(workbooks)} workbooks ({tables} tables) in {elapsed:.3f}s")
+        return {
+            "workbooks": scans,
+            "summary": {"workbooks": len(workbooks), "sheets": sheets, "tables": tables, "rows": rows},
+            "tags": dict(sorted(tags.items())),
+            "regions": regions,
+            "problems": problems,
+            "scan_seconds": round(elapsed, 4)
+        }
+
+    async def _scan_all(self, paths: List[str]) -> List[Dict[str, Any]]:
+        """Scan workbooks across the process pool, or in a thread for a single workbook."""
+        if len(paths) < 2 or config.SCAN_WORKERS <= 0:
+            return [await asyncio.to_thread(scan_workbook, path) for path in paths]
+
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        try:
+            return list(await asyncio.gather(*(loop.run_in_executor(pool, scan_workbook, path) for path in paths)))
+        except BrokenProcessPool:
+            logger.warning("Scan process pool broke; scanning in a thread")
+            self._pool = None
+            return await asyncio.to_thread(lambda: [scan_workbook(path) for path in paths])
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Forking the multithreaded server can deadlock a worker on a lock held
+            # by another thread. A fork server is started once with the main module
+            # and the scanner preloaded; workers are forked from it and start fast.
+            if "forkserver" in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context("forkserver")
+                context.set_forkserver_preload(["__main__", scan_workbook.__module__])
+            else:
+                context = multiprocessing.get_context("spawn")
+            workers = min(config.SCAN_WORKERS, os.cpu_count() or 1)
+            self._pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+        return self._pool
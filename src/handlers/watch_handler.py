@@ -0,0 +1,212 @@
+"""Handler for xl2times_watch tool: background pre-conversion of watched model directories."""
+
+import asyncio
+import shutil
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from ..config import config
+from ..utils.metrics import registry
+from ..utils.watcher import WorkbookWatcher
+from .xl2times_handler import XL2TimesHandler
+
+# xl2times_run options that change the result cache key
+WATCH_OPTIONS = ("regions", "include_dummy_imports", "dd")
+
+
+@dataclass
+class Watch:
+    """A model directory converted in the background whenever its workbooks change."""
+
+    directory: Path
+    options: Dict[str, Any]
+    status: str = "idle"
+    conversions: int = 0
+    last_change: Optional[float] = None
+    last_conversion: Optional[float] = None
+    cache_key: Optional[str] = None
+    error: Optional[str] = None
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    def summary(self, backend: str) -> Dict[str, Any]:
+        """Return the watch's state."""
+        return {
+            "input": str(self.directory),
+            "options": self.options,
+            "backend": backend,
+            "status": self.status,
+            "conversions": self.conversions,
+            "last_change": self.last_change,
+            "last_conversion": self.last_conversion,
+            "cache_key": self.cache_key,
+            "error": self.error
+        }
+
+
+class WatchHandler:
+    """
+    Keeps the result cache warm for models that are being edited.
+
+    A change to a watched directory's workbooks starts a low-priority
+    conversion into a staging directory (cancelling one that is still
+    running), so a later xl2times_run with the same options on the saved
+    state is served from the result cache.
+    """
+
+    def __init__(self, xl2times_handler: XL2TimesHandler):
+        """
+        Initialize the handler.
+
+        Args:
+            xl2times_handler: Handler whose wrapper runs the conversions, so they
+                share the scheduler and result cache with xl2times_run
+        """
+        self.wrapper = xl2times_handler.wrapper
+        self.watches: Dict[Path, Watch] = {}
+        self._watcher: Optional[WorkbookWatcher] = None
+
+    async def watch(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Add, remove or list watched model directories.
+
+        Args:
+            arguments: Dictionary with ``action`` (add, remove or list, default
+                list), ``input`` (model directory, for add and remove) and, for
+                add, the xl2times_run options ``regions``, ``include_dummy_imports``
+                and ``dd`` the conversions should use
+
+        Returns:
+            The affected watch for add and remove, or all watches for list
+        """
+        action = arguments.get("action", "list")
+        if action == "list":
+            return {"enabled": config.WATCH_ENABLED, "watches": self._summaries()}
+        if action not in ("add", "remove"):
+            raise ValueError("action must be one of add, remove, list")
+
+        if not arguments.get("input"):
+            raise ValueError("input required")
+        directory = Path(arguments["input"]).resolve()
+
+        if action == "remove":
+            watch = self.watches.pop(directory, None)
+            if watch is None:
+                raise ValueError(f"Not watching {directory}")
+            if self._watcher is not None:
+                self._watcher.remove(directory)
+            if watch.task is not None:
+                watch.task.cancel()
+            watch.status = "removed"
+            logger.info(f"Stopped watching {directory}")
+            return watch.summary("none")
+
+        options = {name: arguments[name] for name in WATCH_OPTIONS if name in arguments}
+        return self.add(directory, options).summary(self._watcher.backend(directory))
+
+    def add(self, directory: Path, options: Optional[Dict[str, Any]] = None) -> Watch:
+        """
+        Watch a model directory and convert its current state.
+
+        Raises:
+            ValueError: If watch mode or the result cache is disabled, or the
+                directory does not exist
+        """
+        if not config.WATCH_ENABLED:
+            raise ValueError("Watch mode is disabled; set WATCH_ENABLED=true")
+        if self.wrapper.result_cache is None:
+            raise ValueError("Watch mode needs the result cache; set RESULT_CACHE_ENABLED=true")
+        directory = Path(directory).resolve()
+        if not directory.is_dir():
+            raise ValueError(f"Input directory not found: {directory}")
+
+        if self._watcher is None:
+            self._watcher = WorkbookWatcher(self._changed, config.WATCH_DEBOUNCE_SECONDS, config.WATCH_POLL_SECONDS)
+
+        watch = self.watches.get(directory)
+        if watch is None:
+            watch = Watch(directory=directory, options=dict(options or {}))
+            self.watches[directory] = watch
+            self._watcher.add(directory)
+            logger.info(f"Watching {directory} for workbook changes")
+        elif options is not None and options != watch.options:
+            watch.options = dict(options)
+        self._start(watch)
+        return watch
+
+    def add_configured(self) -> None:
+        """Watch the directories listed in WATCH_DIRS with default options."""
+        for directory in config.WATCH_DIRS:
+            try:
+                self.add(Path(directory))
+            except ValueError as e:
+                logger.warning(f"Cannot watch {directory}: {e}")
+
+    def close(self) -> None:
+        """Stop watching and cancel running conversions."""
+        for watch in self.watches.values():
+            if watch.task is not None:
+                watch.task.cancel()
+        self.watches.clear()
+        if self._watcher is not None:
+            self._watcher.close()
+            self._watcher = None
+
+    def _summaries(self) -> List[Dict[str, Any]]:
+        return [watch.summary(self._watcher.backend(directory)) for directory, watch in self.watches.items()]
+
+    def _changed(self, directory: Path) -> None:
+        watch = self.watches.get(directory)
+        if watch is None:
+            return
+        logger.info(f"Workbooks changed in {directory}; converting in the background")
+        watch.last_change = time.time()
+        self._start(watch)
+
+    def _start(self, watch: Watch) -> None:
+        """Start a conversion, replacing one that is converting an older state."""
+        if watch.task is not None and not watch.task.done():
+            watch.task.cancel()
+        watch.status = "pending"
+        watch.task = asyncio.get_running_loop().create_task(self._convert(watch))
+
+    async def _convert(self, watch: Watch) -> None:
+        staging = Path(config.TEMP_DIR) / "watch" / uuid.uuid4().hex
+        conversions = registry.counter(
+            "xl2times_watch_conversions_total", "Background conversions of watched directories by outcome", ["outcome"]
+        )
+        try:
+            watch.status = "converting"
+            result = await self.wrapper.run(
+                input_files=str(watch.directory),
+                output_dir=str(staging),
+                regions=watch.options.get("regions") or [],
+                include_dummy_imports=watch.options.get("include_dummy_imports", False),
+                dd=watch.options.get("dd", False),
+                priority=config.WATCH_PRIORITY
+            )
+            cache = result.get("cache") or {}
+            watch.conversions += 1
+            watch.last_conversion = time.time()
+            watch.cache_key = cache.get("key")
+            if result["success"]:
+                watch.status, watch.error = "warm", None
+                outcome = "cached" if cache.get("hit") else "converted"
+            else:
+                watch.status, watch.error = "failed", result.get("message")
+                outcome = "failed"
+            conversions.inc(outcome=outcome)
+            logger.info(f"Background conversion of {watch.directory}: {outcome}")
+        except asyncio.CancelledError:
+            conversions.inc(outcome="cancelled")
+            raise
+        except Exception as e:
+            watch.status, watch.error = "failed", str(e)
+            conversions.inc(outcome="failed")
+            logger.warning(f"Background conversion of {watch.directory} failed: {e}")
+        finally:
+            await asyncio.to_thread(shutil.rmtree, staging, True)
@@ -1,12 +1,30 @@
 """Handler for xl2times_run tool."""
 
+import asyncio
 import time
+import uuid
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
 from loguru import logger
 
-from ..wrappers.xl2times_wrapper import XL2TimesWrapper, XL2TimesError
+from ..config import config
+from ..utils.columnar import OUTPUT_FORMATS, columnar_available, write_columnar
+from ..utils.file_manager import find_input_workbooks
+from ..utils.metrics import COUNT_BUCKETS, SIZE_BUCKETS, registry
+from ..utils.output_manifest import manifest_entry
+from ..utils.provenance import MERGED_TABLES_FILE, RAW_TABLES_FILE, build_provenance_index
+from ..utils.raw_tables import get_raw_tables_index
+from ..utils.run_metrics import MetricsLog
+from ..wrappers.xl2times_wrapper import RunProgress, XL2TimesWrapper, XL2TimesError, XL2TimesTimeoutError
+
+
+def _model_size(input_files: Any) -> Optional[int]:
+    """Total size in bytes of the workbooks of a run, or None if they cannot be found."""
+    workbooks = find_input_workbooks(input_files)
+    if workbooks is None:
+        return None
+    return sum(path.stat().st_size for _, path in workbooks)
 
 
 class XL2TimesHandler:
@@ -15,19 +33,24 @@ class XL2TimesHandler:
     def __init__(self):
         """Initialize the handler."""
         self.wrapper = XL2TimesWrapper()
+        self.metrics_log: Optional[MetricsLog] = None
+        if config.METRICS_LOG_FILE:
+            self.metrics_log = MetricsLog(Path(config.METRICS_LOG_FILE))
 
-    async def run(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    async def run(self, arguments: Dict[str, Any], progress: Optional[RunProgress] = None) -> Dict[str, Any]:
         """
         Run xl2times with the specified arguments.
 
         Args:
             arguments: Dictionary containing xl2times parameters
+            progress: Optional progress object updated while the run executes
 
         Returns:
             Dictionary with execution results
         """
         logger.info("Processing xl2times_run request")
         start_time = time.time()
+        run_id = uuid.uuid4().hex[:12]
 
         # Extract and validate arguments
         input_files = arguments.get("input")
@@ -43,7 +66,17 @@ class XL2TimesHandler:
         only_read = arguments.get("only_read", False)
         no_cache = arguments.get("no_cache", False)
         verbose = arguments.get("verbose", 0)
+        priority = arguments.get("priority", 0)
+        output_format = arguments.get("output_format", "csv")
+        shards = arguments.get("shards", 0)
+
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"output_format must be one of {', '.join(OUTPUT_FORMATS)}")
+        if output_format != "csv" and not columnar_available():
+            raise ValueError(f"output_format '{output_format}' requires pyarrow to be installed")
 
+        in_flight = registry.gauge("xl2times_runs_in_flight", "xl2times runs currently queued or executing")
+        in_flight.inc()
         try:
             # Execute xl2times
             wrapper_result = await self.wrapper.run(
@@ -55,28 +88,78 @@ class XL2TimesHandler:
                 dd=dd,
                 only_read=only_read,
                 no_cache=no_cache,
-                verbose=verbose
+                verbose=verbose,
+                priority=priority,
+                progress=progress,
+                shards=shards
             )
 
+            # Combine the CSV tables into one columnar file if requested
+            if output_format != "csv" and output_dir and not only_read and wrapper_result["success"]:
+                try:
+                    columnar_start = time.perf_counter()
+                    columnar = await asyncio.to_thread(
+                        write_columnar, Path(output_dir), output_format, wrapper_result["output_files"]
+                    )
+                    wrapper_result.setdefault("phases", {})["columnar_write"] = round(
+                        time.perf_counter() - columnar_start, 3
+                    )
+                    if columnar["file"] not in wrapper_result["output_files"]:
+                        wrapper_result["output_files"].append(columnar["file"])
+                        if wrapper_result.get("output_manifest"):
+                            entry = await asyncio.to_thread(
+                                manifest_entry, output_dir, columnar["file"], config.OUTPUT_MANIFEST_HASHES
+                            )
+                            wrapper_result["output_manifest"]["files"].append(entry)
+                            wrapper_result["output_manifest"]["total_bytes"] += entry["size"]
+                    wrapper_result["columnar"] = columnar
+                except Exception as e:
+                    logger.warning(f"Could not write {output_format} output: {e}")
+                    wrapper_result["warnings"].append(f"Could not write {output_format} output: {e}")
+
+            # Index output rows back to their source tables for xl2times_provenance
+            provenance = None
+            if (
+                config.PROVENANCE_INDEX_ENABLED and output_dir and not only_read and wrapper_result["success"]
+                and (Path(output_dir) / MERGED_TABLES_FILE).is_file()
+            ):
+                provenance_start = time.perf_counter()
+                provenance = await self._build_provenance(
+                    input_files, Path(output_dir), wrapper_result["output_files"]
+                )
+                wrapper_result.setdefault("phases", {})["provenance_index"] = round(
+                    time.perf_counter() - provenance_start, 3
+                )
+            elif wrapper_result.get("merge") and not wrapper_result["merge"]["merged_tables_txt"]:
+                provenance = "unavailable for sharded runs"
+
             # Build response optimized for LLM consumption
             execution_time = time.time() - start_time
             wrapper_result["execution_time"] = execution_time
 
-            # Extract raw_tables content if only_read was used
-            raw_tables_content = None
+            # Summarize raw_tables.txt; its tables are paged with xl2times_raw_tables
+            raw_tables_summary = None
             if only_read and output_dir:
                 raw_tables_path = Path(output_dir) / "raw_tables.txt"
                 if raw_tables_path.exists():
                     try:
-                        raw_tables_content = raw_tables_path.read_text(encoding='utf-8')
+                        index = await asyncio.to_thread(get_raw_tables_index, raw_tables_path)
+                        raw_tables_summary = index.summary()
+                        raw_tables_summary["hint"] = "Use xl2times_raw_tables to read the tables"
                     except Exception as e:
-                        logger.warning(f"Could not read raw_tables.txt: {e}")
+                        logger.warning(f"Could not index raw_tables.txt: {e}")
 
             # Return wrapper result directly (already optimized for LLM)
             result = wrapper_result.copy()
-            result["raw_tables"] = raw_tables_content
+            result["raw_tables"] = raw_tables_summary
+            result["provenance"] = provenance
+            result["run_id"] = run_id
 
-            logger.info(f"xl2times_run completed in {execution_time:.2f}s")
+            logger.info(
+                f"xl2times_run completed in {execution_time:.2f}s "
+                f"(queued {result.get('queue_wait_time', 0):.2f}s, ran {result.get('run_time', 0):.2f}s)"
+            )
+            await self._record_run(run_id, input_files, result)
             return result
 
         except XL2TimesError as e:
@@ -84,11 +167,14 @@ class XL2TimesHandler:
             execution_time = time.time() - start_time
             
             # Return error response in LLM-optimized format
-            return {
+            result = {
+                "run_id": run_id,
                 "success": False,
                 "return_code": -1,
+                "log_id": None,
                 "log_file": "",
                 "output_files": [],
+                "output_manifest": None,
                 "output_directory": output_dir or "",
                 "warnings": [],
                 "errors": [str(e)],
@@ -96,10 +182,89 @@ class XL2TimesHandler:
                 "execution_time": execution_time,
                 "command": "",
                 "message": f"xl2times execution failed: {str(e)}",
-                "raw_tables": None
+                "raw_tables": None,
+                "provenance": None
             }
+            await self._record_run(run_id, input_files, result, timed_out=isinstance(e, XL2TimesTimeoutError))
+            return result
 
         except Exception as e:
             logger.error(f"Unexpected error in xl2times handler: {e}")
+            registry.counter("xl2times_runs_total", "xl2times runs by outcome", ["outcome"]).inc(outcome="error")
             raise
 
+        finally:
+            in_flight.dec()
+
+    async def _build_provenance(
+        self, input_files: Any, output_dir: Path, output_files: List[str]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Build the run's provenance index.
+
+        Sheets and ranges come from raw_tables.txt in the output directory or,
+        when every input workbook is in the extraction cache, from the cached
+        raw tables; otherwise only workbooks and tags are indexed.
+        """
+        raw_tables = output_dir / RAW_TABLES_FILE
+        staged = None
+        try:
+            if not raw_tables.is_file():
+                staged = Path(config.TEMP_DIR) / "provenance" / f"{uuid.uuid4().hex}.txt"
+                raw_tables = staged if await self.wrapper.write_cached_raw_tables(input_files, staged) else None
+            summary = await asyncio.to_thread(build_provenance_index, output_dir, raw_tables, output_files)
+            summary["hint"] = "Use xl2times_provenance to find the source of an output row"
+            return summary
+        except Exception as e:
+            logger.warning(f"Could not build provenance index: {e}")
+            return None
+        finally:
+            if staged is not None:
+                staged.unlink(missing_ok=True)
+
+    async def _record_run(
+        self, run_id: str, input_files: Any, result: Dict[str, Any], timed_out: bool = False
+    ) -> None:
+        """Update the run metrics and append the run's phase timings and resource usage to the metrics log."""
+        outcome = "success" if result["success"] else ("timeout" if timed_out else "failure")
+        registry.counter("xl2times_runs_total", "xl2times runs by outcome", ["outcome"]).inc(outcome=outcome)
+        registry.histogram("xl2times_run_duration_seconds", "Duration of xl2times_run calls").observe(
+            result["execution_time"]
+        )
+        registry.histogram(
+            "xl2times_run_output_files", "Output files written per xl2times run", COUNT_BUCKETS
+        ).observe(len(result.get("output_files", [])))
+        if result.get("cache"):
+            registry.counter(
+                "xl2times_result_cache_requests_total", "Result cache lookups by result", ["result"]
+            ).inc(result="hit" if result["cache"].get("hit") else "miss")
+        phase_histogram = registry.histogram(
+            "xl2times_run_phase_seconds", "Time spent in each phase of an xl2times run", labels=["phase"]
+        )
+        for phase, seconds in (result.get("phases") or {}).items():
+            phase_histogram.observe(seconds, phase=phase)
+        try:
+            model_size = await asyncio.to_thread(_model_size, input_files)
+        except OSError:
+            model_size = None
+        if model_size is not None:
+            registry.histogram(
+                "xl2times_model_size_bytes", "Total size of the input workbooks per xl2times run", SIZE_BUCKETS
+            ).observe(model_size)
+
+        if self.metrics_log is None:
+            return
+        try:
+            self.metrics_log.write(
+                "run",
+                run_id=run_id,
+                input=input_files,
+                success=result["success"],
+                cache_hit=bool((result.get("cache") or {}).get("hit")),
+                execution_time=round(result["execution_time"], 3),
+                run_time=round(result.get("run_time", 0.0), 3),
+                phases=result.get("phases", {}),
+                resources=result.get("resources")
+            )
+        except OSError as e:
+            logger.warning(f"Could not write metrics log: {e}")
@@ -3,7 +3,9 @@
 import asyncio
 import json
 import sys
-from typing import Any, Dict, List
+import time
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from loguru import logger
 from mcp.server import Server
@@ -12,8 +14,26 @@ from mcp.types import EmbeddedResource, ImageContent, TextContent, Tool, ServerC
 from mcp.server.lowlevel.server import InitializationOptions
 
 from .config import config
-from .handlers.info_handler import InfoHandler
-from .handlers.xl2times_handler import XL2TimesHandler
+from .transports import TRANSPORTS, serve_http
+from .utils.metrics import SIZE_BUCKETS, registry, start_metrics_server
+from .utils.responses import ResponseStore, continue_field, dumps, fit_response
+from .utils.sessions import SessionWorkspaces, current_session
+
+# Handlers pull in the wrapper, caches and table utilities; they are imported
+# and built on first use so a new client session is not kept waiting for them
+if TYPE_CHECKING:
+    from .handlers.batch_handler import BatchHandler
+    from .handlers.diff_handler import DiffHandler
+    from .handlers.info_handler import InfoHandler
+    from .handlers.job_handler import JobHandler
+    from .handlers.logs_handler import LogsHandler
+    from .handlers.metrics_handler import MetricsHandler
+    from .handlers.provenance_handler import ProvenanceHandler
+    from .handlers.query_handler import QueryHandler
+    from .handlers.raw_tables_handler import RawTablesHandler
+    from .handlers.scan_handler import ScanHandler
+    from .handlers.watch_handler import WatchHandler
+    from .handlers.xl2times_handler import XL2TimesHandler
 
 
 class XL2TimesMCPServer:
@@ -21,9 +41,16 @@ class XL2TimesMCPServer:
 
     def __init__(self):
         """Initialize the MCP server."""
-        self.server = Server(config.SERVER_NAME)
-        self.xl2times_handler = XL2TimesHandler()
-        self.info_handler = InfoHandler()
+        self.server = Server(config.SERVER_NAME, version=config.SERVER_VERSION)
+        self._warm_scheduled = False
+        self._warm_task: Optional[asyncio.Task] = None
+        # Full values of truncated response fields, read back with xl2times_more
+        self.responses = ResponseStore(config.RESPONSE_STORE_MAX_ENTRIES)
+
+        # Sessions of a network transport share this process but not their output directories
+        self.workspaces: Optional[SessionWorkspaces] = None
+        if config.MCP_TRANSPORT != "stdio":
+            self.workspaces = SessionWorkspaces(config.TEMP_DIR / "sessions")
 
         # Register handlers
         self._register_handlers()
@@ -36,62 +63,518 @@ class XL2TimesMCPServer:
 
         logger.info("All handlers registered successfully")
 
+    @cached_property
+    def xl2times_handler(self) -> "XL2TimesHandler":
+        from .handlers.xl2times_handler import XL2TimesHandler
+
+        handler = XL2TimesHandler()
+        # Scheduler state is read at scrape time
+        scheduler = handler.wrapper.scheduler
+        registry.gauge("xl2times_scheduler_running", "xl2times runs holding a scheduler slot",
+                       callback=lambda: scheduler.running)
+        registry.gauge("xl2times_scheduler_queued", "xl2times runs waiting for a scheduler slot",
+                       callback=lambda: scheduler.stats()["queued"])
+        return handler
+
+    @cached_property
+    def info_handler(self) -> "InfoHandler":
+        from .handlers.info_handler import InfoHandler
+
+        return InfoHandler(self.xl2times_handler.wrapper)
+
+    @cached_property
+    def job_handler(self) -> "JobHandler":
+        from .handlers.job_handler import FINISHED_STATES, JobHandler
+
+        handler = JobHandler(self.xl2times_handler)
+        jobs = handler.jobs
+        registry.gauge("xl2times_jobs_active", "Submitted jobs that have not finished",
+                       callback=lambda: sum(1 for job in list(jobs.values()) if job.status not in FINISHED_STATES))
+        return handler
+
+    @cached_property
+    def batch_handler(self) -> "BatchHandler":
+        from .handlers.batch_handler import BatchHandler
+
+        return BatchHandler(self.xl2times_handler)
+
+    @cached_property
+    def raw_tables_handler(self) -> "RawTablesHandler":
+        from .handlers.raw_tables_handler import RawTablesHandler
+
+        return RawTablesHandler()
+
+    @cached_property
+    def scan_handler(self) -> "ScanHandler":
+        from .handlers.scan_handler import ScanHandler
+
+        return ScanHandler()
+
+    @cached_property
+    def watch_handler(self) -> "WatchHandler":
+        from .handlers.watch_handler import WatchHandler
+
+        return WatchHandler(self.xl2times_handler)
+
+    @cached_property
+    def query_handler(self) -> "QueryHandler":
+        from .handlers.query_handler import QueryHandler
+
+        return QueryHandler()
+
+    @cached_property
+    def provenance_handler(self) -> "ProvenanceHandler":
+        from .handlers.provenance_handler import ProvenanceHandler
+
+        return ProvenanceHandler()
+
+    @cached_property
+    def diff_handler(self) -> "DiffHandler":
+        from .handlers.diff_handler import DiffHandler
+
+        return DiffHandler(self.xl2times_handler.wrapper)
+
+    @cached_property
+    def logs_handler(self) -> "LogsHandler":
+        from .handlers.logs_handler import LogsHandler
+
+        return LogsHandler(self.xl2times_handler.wrapper)
+
+    @cached_property
+    def metrics_handler(self) -> "MetricsHandler":
+        from .handlers.metrics_handler import MetricsHandler
+
+        return MetricsHandler()
+
+    def _build_handlers(self) -> None:
+        """Build the handlers used by the first calls (runs in a worker thread)."""
+        names = ["info_handler"]
+        if config.WATCH_ENABLED and config.WATCH_DIRS:
+            names.append("watch_handler")
+        for name in names:
+            getattr(self, name)
+
+    async def _warm_up(self) -> None:
+        """Build the handlers off the event loop, then probe the xl2times version and start configured watches."""
+        try:
+            await asyncio.to_thread(self._build_handlers)
+            self.info_handler.warm()
+            # Directories watched from startup; their first conversions warm the cache
+            if config.WATCH_ENABLED and config.WATCH_DIRS:
+                self.watch_handler.add_configured()
+        except Exception as e:
+            logger.warning(f"Warm-up failed: {e}")
+
+    async def close(self) -> None:
+        """Stop the background work of the handlers that were built: watches, scan and xl2times workers."""
+        built = vars(self)
+        if self._warm_task is not None:
+            self._warm_task.cancel()
+        if "watch_handler" in built:
+            self.watch_handler.close()
+        if "scan_handler" in built:
+            self.scan_handler.close()
+        if "xl2times_handler" in built and self.xl2times_handler.wrapper.pool is not None:
+            await self.xl2times_handler.wrapper.pool.close()
+
     async def _list_tools(self) -> List[Tool]:
         """List available tools."""
+        # The first listing means the client session is up; warm up once it has been answered
+        if not self._warm_scheduled:
+            self._warm_scheduled = True
+            self._warm_task = asyncio.get_running_loop().create_task(self._warm_up())
+
+        run_schema = {
+            "type": "object",
+            "properties": {
+                "input": {
+                    "type": ["string", "array"],
+                    "description": "Input directory or list of xlsx/xlsm files",
+                    "items": {"type": "string"} if isinstance([], list) else None
+                },
+                "output_dir": {
+                    "type": "string",
+                    "description": "Output directory for generated files"
+                },
+                "regions": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of regions to include"
+                },
+                "include_dummy_imports": {
+                    "type": "boolean",
+                    "description": "Include dummy import processes",
+                    "default": False
+                },
+                "ground_truth_dir": {
+                    "type": "string",
+                    "description": "Ground truth directory for comparison"
+                },
+                "dd": {
+                    "type": "boolean",
+                    "description": "Output DD files",
+                    "default": False
+                },
+                "only_read": {
+                    "type": "boolean",
+                    "description": "Only read files and output raw_tables.txt",
+                    "default": False
+                },
+                "no_cache": {
+                    "type": "boolean",
+                    "description": "Ignore cache and re-extract from XLSX (also bypasses the server result cache)",
+                    "default": False
+                },
+                "verbose": {
+                    "type": "integer",
+                    "description": "Verbosity level (0-4)",
+                    "default": 0,
+                    "minimum": 0,
+                    "maximum": 4
+                },
+                "priority": {
+                    "type": "integer",
+                    "description": "Scheduling priority when runs are queued; lower values run first",
+                    "default": 0
+                },
+                "shards": {
+                    "type": "integer",
+                    "description": "Convert the regions in this many parallel groups and merge the tables (0 = single process); regions are read from the model when not given",
+                    "default": 0,
+                    "minimum": 0
+                },
+                "output_format": {
+                    "type": "string",
+                    "enum": ["csv", "arrow", "parquet"],
+                    "description": "Also write all *_output.csv tables to one Arrow IPC or Parquet file (requires pyarrow)",
+                    "default": "csv"
+                }
+            },
+            "required": ["input"]
+        }
+        job_id_schema = {
+            "type": "object",
+            "properties": {
+                "job_id": {
+                    "type": "string",
+                    "description": "Job ID returned by xl2times_submit"
+                }
+            },
+            "required": ["job_id"]
+        }
+
         tools = [
             Tool(
                 name="xl2times_run",
                 description="Run xl2times with specified input files and options",
+                inputSchema=run_schema
+            ),
+            Tool(
+                name="xl2times_batch",
+                description="Convert several models or option sets in one call and return a compact summary per model",
                 inputSchema={
                     "type": "object",
                     "properties": {
-                        "input": {
-                            "type": ["string", "array"],
-                            "description": "Input directory or list of xlsx/xlsm files",
-                            "items": {"type": "string"} if isinstance([], list) else None
+                        "models": {
+                            "type": "array",
+                            "items": run_schema,
+                            "description": "xl2times_run arguments for each model"
                         },
-                        "output_dir": {
+                        "defaults": {
+                            "type": "object",
+                            "description": "Arguments applied to every model unless the model overrides them"
+                        }
+                    },
+                    "required": ["models"]
+                }
+            ),
+            Tool(
+                name="xl2times_submit",
+                description="Start an xl2times run in the background and return a job ID immediately; takes the same arguments as xl2times_run",
+                inputSchema=run_schema
+            ),
+            Tool(
+                name="xl2times_status",
+                description="Get the status and live progress (files loaded, transforms done) of a submitted job",
+                inputSchema=job_id_schema
+            ),
+            Tool(
+                name="xl2times_result",
+                description="Get the result of a submitted job once it has finished",
+                inputSchema=job_id_schema
+            ),
+            Tool(
+                name="xl2times_cancel",
+                description="Cancel a queued or running job",
+                inputSchema=job_id_schema
+            ),
+            Tool(
+                name="xl2times_watch",
+                description="Watch model directories and pre-convert them in the background when workbooks are saved, so xl2times_run on the saved state is served from the cache",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "action": {
                             "type": "string",
-                            "description": "Output directory for generated files"
+                            "enum": ["add", "remove", "list"],
+                            "description": "add or remove a watched directory, or list the watches",
+                            "default": "list"
+                        },
+                        "input": {
+                            "type": "string",
+                            "description": "Model directory (for add and remove)"
                         },
                         "regions": {
                             "type": "array",
                             "items": {"type": "string"},
-                            "description": "List of regions to include"
+                            "description": "regions the later xl2times_run will use"
                         },
                         "include_dummy_imports": {
                             "type": "boolean",
-                            "description": "Include dummy import processes",
+                            "description": "include_dummy_imports the later xl2times_run will use",
                             "default": False
                         },
-                        "ground_truth_dir": {
-                            "type": "string",
-                            "description": "Ground truth directory for comparison"
-                        },
                         "dd": {
                             "type": "boolean",
-                            "description": "Output DD files",
+                            "description": "dd the later xl2times_run will use",
                             "default": False
+                        }
+                    }
+                }
+            ),
+            Tool(
+                name="xl2times_scan",
+                description="Quickly list the VEDA tables (~TAG, sheet, range, rows) and regions of a model's workbooks without running xl2times",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "input": {
+                            "type": ["string", "array"],
+                            "description": "Input directory or list of xlsx/xlsm files",
+                            "items": {"type": "string"}
                         },
-                        "only_read": {
+                        "tables": {
                             "type": "boolean",
-                            "description": "Only read files and output raw_tables.txt",
-                            "default": False
+                            "description": "List every table per sheet; set to false for sheet names, tag counts and regions only",
+                            "default": True
+                        }
+                    },
+                    "required": ["input"]
+                }
+            ),
+            Tool(
+                name="xl2times_raw_tables",
+                description="Page through the tables in raw_tables.txt from an only_read run, filtered by tag, sheet or file",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "path": {
+                            "type": "string",
+                            "description": "raw_tables.txt or the output directory of an only_read run"
                         },
-                        "no_cache": {
+                        "tag": {
+                            "type": "string",
+                            "description": "Only tables with this VEDA tag, e.g. ~FI_T (case-insensitive, ~ optional)"
+                        },
+                        "sheetname": {
+                            "type": "string",
+                            "description": "Only tables from this sheet (case-insensitive)"
+                        },
+                        "filename": {
+                            "type": "string",
+                            "description": "Only tables from workbooks whose path contains this text"
+                        },
+                        "cursor": {
+                            "type": "string",
+                            "description": "next_cursor from the previous page"
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "description": "Tables per page",
+                            "default": config.RAW_TABLES_PAGE_SIZE,
+                            "minimum": 1,
+                            "maximum": config.RAW_TABLES_MAX_PAGE_SIZE
+                        },
+                        "max_rows": {
+                            "type": "integer",
+                            "description": "Maximum data rows returned per table",
+                            "default": config.RAW_TABLES_MAX_ROWS,
+                            "minimum": 0
+                        },
+                        "include_data": {
                             "type": "boolean",
-                            "description": "Ignore cache and re-extract from XLSX",
-                            "default": False
+                            "description": "Include table data; set to false to list table headers only",
+                            "default": True
+                        }
+                    },
+                    "required": ["path"]
+                }
+            ),
+            Tool(
+                name="xl2times_query",
+                description="Query converted TIMES tables (*_output.csv) of an output directory by region, process, commodity, year or timeslice without reading whole files",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "output_dir": {
+                            "type": "string",
+                            "description": "Output directory of an xl2times run"
+                        },
+                        "table": {
+                            "type": "string",
+                            "description": "Table name, e.g. NCAP_COST; omit to search all tables (or to list them when no filter is given)"
+                        },
+                        "region": {
+                            "type": ["string", "integer", "array"],
+                            "description": "Region(s), matched against REG, ALL_REG or ALL_R"
+                        },
+                        "process": {
+                            "type": ["string", "integer", "array"],
+                            "description": "Process(es), matched against PRC"
+                        },
+                        "commodity": {
+                            "type": ["string", "integer", "array"],
+                            "description": "Commodit(y/ies), matched against COM or C"
+                        },
+                        "year": {
+                            "type": ["string", "integer", "array"],
+                            "description": "Year(s), matched against YEAR or DATAYEAR"
+                        },
+                        "timeslice": {
+                            "type": ["string", "integer", "array"],
+                            "description": "Timeslice(s), matched against TS or ALL_TS"
+                        },
+                        "filters": {
+                            "type": "object",
+                            "description": "Exact-match filters on any column, e.g. {\"CUR\": \"MEURO05\"}"
+                        },
+                        "columns": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Columns to return (default: all)"
                         },
-                        "verbose": {
+                        "limit": {
                             "type": "integer",
-                            "description": "Verbosity level (0-4)",
-                            "default": 0,
-                            "minimum": 0,
-                            "maximum": 4
+                            "description": "Maximum rows returned across all tables",
+                            "default": config.QUERY_MAX_ROWS,
+                            "minimum": 0
                         }
                     },
-                    "required": ["input"]
+                    "required": ["output_dir"]
+                }
+            ),
+            Tool(
+                name="xl2times_provenance",
+                description="Find the source workbook, sheet, range and VEDA tag (e.g. ~FI_T) of a row in a converted table",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "output_dir": {
+                            "type": "string",
+                            "description": "Output directory of an xl2times run"
+                        },
+                        "table": {
+                            "type": "string",
+                            "description": "Table name, e.g. NCAP_COST"
+                        },
+                        "row": {
+                            "type": ["object", "array"],
+                            "description": "Key column values of the row (all columns except VALUE), as {\"PRC\": \"DTPSCOA\", ...} or a list in column order; omit to list the key columns"
+                        }
+                    },
+                    "required": ["output_dir", "table"]
+                }
+            ),
+            Tool(
+                name="xl2times_diff",
+                description="Compare the converted tables of two runs: added, removed and changed rows per table",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "a": {
+                            "type": "string",
+                            "description": "Baseline output directory, or cache key (cache.key of an xl2times_run result)"
+                        },
+                        "b": {
+                            "type": "string",
+                            "description": "Output directory or cache key to compare against the baseline"
+                        },
+                        "max_samples": {
+                            "type": "integer",
+                            "description": "Maximum example rows per table and change type",
+                            "default": 20,
+                            "minimum": 0
+                        }
+                    },
+                    "required": ["a", "b"]
+                }
+            ),
+            Tool(
+                name="xl2times_logs",
+                description="Search the warnings and errors of past xl2times runs (which runs warned about X), or read one run's log",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "query": {
+                            "type": "string",
+                            "description": "Words that must all appear in a matching line, e.g. \"Dropping table\""
+                        },
+                        "level": {
+                            "type": "string",
+                            "enum": ["warning", "error"],
+                            "description": "Only match warning or error lines"
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "description": "Maximum runs returned, newest first",
+                            "default": 20,
+                            "minimum": 1
+                        },
+                        "run_id": {
+                            "type": "string",
+                            "description": "log_id of a run result: read that run's full log instead of searching"
+                        },
+                        "tail": {
+                            "type": "integer",
+                            "description": "With run_id: number of (matching) log lines returned from the end",
+                            "default": 100,
+                            "minimum": 1
+                        }
+                    }
+                }
+            ),
+            Tool(
+                name="xl2times_metrics",
+                description="Server metrics: run latency percentiles, failure, timeout and cache hit rates, queue depth",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "format": {
+                            "type": "string",
+                            "enum": ["summary", "prometheus"],
+                            "description": "summary (default) or the Prometheus text exposition format",
+                            "default": "summary"
+                        }
+                    }
+                }
+            ),
+            Tool(
+                name="xl2times_more",
+                description="Get the rest of a response field that was truncated to fit the response size budget",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "handle": {
+                            "type": "string",
+                            "description": "Handle from the response's truncated section"
+                        },
+                        "offset": {
+                            "type": "integer",
+                            "description": "Item (or character) to continue from: the truncated entry's returned count, then next_offset",
+                            "minimum": 0
+                        }
+                    },
+                    "required": ["handle", "offset"]
                 }
             ),
             Tool(
@@ -110,25 +593,79 @@ class XL2TimesMCPServer:
     async def _call_tool(self, name: str, arguments: Dict[str, Any]) -> List[TextContent | ImageContent | EmbeddedResource]:
         """Handle tool calls."""
         logger.info(f"Tool called: {name} with arguments: {arguments}")
+        start = time.perf_counter()
+        session_token = None
 
         try:
+            # Handlers being built by the warm-up thread must not be built a second time here
+            if self._warm_task is not None and not self._warm_task.done():
+                await asyncio.shield(self._warm_task)
+
+            session_id = self._session_id()
+            if session_id is not None:
+                arguments = self.workspaces.scope_arguments(name, arguments or {}, session_id)
+                # Runs started by this call (including background jobs) record the session
+                session_token = current_session.set(session_id)
+
             if name == "xl2times_run":
                 result = await self.xl2times_handler.run(arguments)
+            elif name == "xl2times_batch":
+                result = await self.batch_handler.run_batch(arguments)
+            elif name == "xl2times_submit":
+                result = await self.job_handler.submit(arguments, session_id)
+            elif name == "xl2times_status":
+                result = await self.job_handler.status(arguments, session_id)
+            elif name == "xl2times_result":
+                result = await self.job_handler.result(arguments, session_id)
+            elif name == "xl2times_cancel":
+                result = await self.job_handler.cancel(arguments, session_id)
+            elif name == "xl2times_raw_tables":
+                result = await self.raw_tables_handler.get_tables(arguments)
+            elif name == "xl2times_watch":
+                result = await self.watch_handler.watch(arguments)
+            elif name == "xl2times_scan":
+                result = await self.scan_handler.scan(arguments)
+            elif name == "xl2times_query":
+                result = await self.query_handler.query(arguments)
+            elif name == "xl2times_provenance":
+                result = await self.provenance_handler.lookup(arguments)
+            elif name == "xl2times_diff":
+                result = await self.diff_handler.diff(arguments)
+            elif name == "xl2times_logs":
+                result = await self.logs_handler.search(arguments, session_id)
+            elif name == "xl2times_metrics":
+                result = await self.metrics_handler.get_metrics(arguments)
+            elif name == "xl2times_more":
+                result = continue_field(
+                    self.responses, arguments.get("handle", ""), int(arguments.get("offset", 0)),
+                    config.RESPONSE_MAX_BYTES, session_id
+                )
             elif name == "xl2times_info":
                 result = await self.info_handler.get_info()
             else:
                 raise ValueError(f"Unknown tool: {name}")
 
-            # Convert result to JSON string if it's a dict
+            if session_id is not None and isinstance(result, dict) and (result.get("cache") or {}).get("key"):
+                self.workspaces.remember_cache_key(session_id, result["cache"]["key"])
+
+            # Serialize off the event loop, cutting large fields down to the response budget
             if isinstance(result, dict):
-                result_text = json.dumps(result, indent=2)
+                serialize_start = time.perf_counter()
+                result_text, truncated = await asyncio.to_thread(
+                    fit_response, result, config.RESPONSE_MAX_BYTES, self.responses, session_id
+                )
+                serialize_time = time.perf_counter() - serialize_start
+                self._record_response(name, len(result_text), serialize_time, truncated)
+                self._log_serialization(name, result, serialize_time, len(result_text))
             else:
                 result_text = str(result)
             
+            self._record_tool_call(name, "ok", time.perf_counter() - start)
             return [TextContent(type="text", text=result_text)]
 
         except Exception as e:
             logger.error(f"Error in tool {name}: {str(e)}")
+            self._record_tool_call(name, "error", time.perf_counter() - start)
             error_result = {
                 "error": {
                     "code": "TOOL_ERROR",
@@ -136,24 +673,99 @@ class XL2TimesMCPServer:
                     "tool": name
                 }
             }
-            return [TextContent(type="text", text=json.dumps(error_result, indent=2))]
+            return [TextContent(type="text", text=dumps(error_result))]
+        finally:
+            if session_token is not None:
+                current_session.reset(session_token)
+
+    def _session_id(self) -> Optional[str]:
+        """Return the calling client session's ID on a network transport, else None."""
+        if self.workspaces is None:
+            return None
+        try:
+            session = self.server.request_context.session
+        except LookupError:
+            return None
+        return self.workspaces.session_id(session)
+
+    def _record_tool_call(self, name: str, status: str, seconds: float) -> None:
+        """Count a tool call and record its latency."""
+        registry.counter("xl2times_tool_calls_total", "MCP tool calls by tool and status", ["tool", "status"]).inc(
+            tool=name, status=status
+        )
+        registry.histogram("xl2times_tool_duration_seconds", "MCP tool call latency", labels=["tool"]).observe(
+            seconds, tool=name
+        )
+
+    def _record_response(self, name: str, size: int, seconds: float, truncated: bool) -> None:
+        """Record the serialized size and serialization time of a tool response."""
+        registry.histogram("xl2times_response_bytes", "Serialized size of MCP tool responses", SIZE_BUCKETS,
+                           labels=["tool"]).observe(size, tool=name)
+        registry.histogram("xl2times_response_serialization_seconds", "Time to serialize MCP tool responses",
+                           labels=["tool"]).observe(seconds, tool=name)
+        if truncated:
+            registry.counter("xl2times_responses_truncated_total", "Tool responses cut down to the response budget",
+                             ["tool"]).inc(tool=name)
+
+    def _log_serialization(self, name: str, result: Dict[str, Any], seconds: float, size: int) -> None:
+        """Record the response serialization phase of a run result in the metrics log."""
+        run = result.get("result") if name == "xl2times_result" else result
+        if "xl2times_handler" not in self.__dict__:
+            return
+        metrics_log = self.xl2times_handler.metrics_log
+        if metrics_log is None or not isinstance(run, dict) or "run_id" not in run:
+            return
+        try:
+            metrics_log.write(
+                "response_serialization",
+                run_id=run["run_id"],
+                tool=name,
+                seconds=round(seconds, 6),
+                bytes=size
+            )
+        except OSError as e:
+            logger.warning(f"Could not write metrics log: {e}")
 
 def create_server() -> Server:
     """Create and configure the MCP server."""
+    return _create_server_instance().server
+
+
+def _create_server_instance() -> XL2TimesMCPServer:
     # Setup configuration and logging
     config.setup_logging()
     config.validate()
     
     logger.info(f"Creating {config.SERVER_NAME} v{config.SERVER_VERSION}")
     
-    # Create and configure the server instance
-    server_instance = XL2TimesMCPServer()
-    return server_instance.server
+    # Create and configure the server instance; handlers are built after the
+    # first tools/list so the xl2times version probe runs off the handshake path
+    return XL2TimesMCPServer()
 
 
 async def run_server():
     """Run the MCP server."""
-    server = create_server()
+    if config.MCP_TRANSPORT not in TRANSPORTS:
+        raise ValueError(f"MCP_TRANSPORT must be one of {', '.join(TRANSPORTS)}, not '{config.MCP_TRANSPORT}'")
+
+    server_instance = _create_server_instance()
+    server = server_instance.server
+
+    metrics_server = None
+    if config.METRICS_PORT:
+        try:
+            metrics_server = await start_metrics_server(registry, config.METRICS_HOST, config.METRICS_PORT)
+        except OSError as e:
+            logger.warning(f"Could not start metrics endpoint on port {config.METRICS_PORT}: {e}")
+
+    if config.MCP_TRANSPORT != "stdio":
+        try:
+            await serve_http(server, config.MCP_TRANSPORT, config.MCP_HOST, config.MCP_PORT)
+        finally:
+            if metrics_server is not None:
+                metrics_server.close()
+            await server_instance.close()
+        return
     
     # Use stdio transport
     async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
@@ -167,15 +779,32 @@ async def run_server():
             )
         )
         
-        await server.run(
-            read_stream=read_stream,
-            write_stream=write_stream, 
-            initialization_options=initialization_options
-        )
+        try:
+            await server.run(
+                read_stream=read_stream,
+                write_stream=write_stream, 
+                initialization_options=initialization_options
+            )
+        finally:
+            if metrics_server is not None:
+                metrics_server.close()
+            await server_instance.close()
 
 
 def main():
     """Main entry point."""
+    if "--startup-benchmark" in sys.argv[1:]:
+        import argparse
+
+        from .startup_benchmark import run_startup_benchmark
+
+        parser = argparse.ArgumentParser(description="Measure cold start of the stdio server")
+        parser.add_argument("--startup-benchmark", action="store_true")
+        parser.add_argument("--rounds", type=int, default=5, help="Cold starts to measure")
+        args = parser.parse_args()
+        print(json.dumps(run_startup_benchmark(args.rounds), indent=2))
+        return
+
     try:
         # Run the async server
         asyncio.run(run_server())
@@ -0,0 +1,151 @@
+"""Cold-start benchmark for the stdio server (``--startup-benchmark``)."""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SERVER_MODULE = "src.server"
+
+# Smallest import in this list that takes longer is reported
+IMPORT_REPORT_THRESHOLD_S = 0.005
+
+
+def _rpc(message_id: Optional[int], method: str, params: Optional[Dict[str, Any]] = None) -> bytes:
+    message: Dict[str, Any] = {"jsonrpc": "2.0", "method": method}
+    if message_id is not None:
+        message["id"] = message_id
+    if params is not None:
+        message["params"] = params
+    return (json.dumps(message) + "\n").encode("utf-8")
+
+
+def _read_response(stdout, message_id: int) -> Dict[str, Any]:
+    """Read JSON-RPC lines until the response to ``message_id``."""
+    while True:
+        line = stdout.readline()
+        if not line:
+            raise RuntimeError("server exited before answering")
+        message = json.loads(line)
+        if message.get("id") == message_id:
+            if "error" in message:
+                raise RuntimeError(f"server returned an error: {message['error']}")
+            return message["result"]
+
+
+def measure_session_start(env: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    Start a stdio server process and time the MCP handshake.
+
+    Returns:
+        Seconds from spawning the process to the ``initialize`` response and to
+        the first ``tools/list`` response, and the number of tools listed
+    """
+    from mcp.types import LATEST_PROTOCOL_VERSION
+
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", SERVER_MODULE],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        cwd=PROJECT_ROOT,
+        env=env
+    )
+    try:
+        process.stdin.write(_rpc(1, "initialize", {
+            "protocolVersion": LATEST_PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": {"name": "startup-benchmark", "version": "0"}
+        }))
+        process.stdin.flush()
+        _read_response(process.stdout, 1)
+        initialized = time.perf_counter() - start
+
+        process.stdin.write(_rpc(None, "notifications/initialized"))
+        process.stdin.write(_rpc(2, "tools/list"))
+        process.stdin.flush()
+        tools = _read_response(process.stdout, 2)["tools"]
+        listed = time.perf_counter() - start
+    finally:
+        process.stdin.close()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+    return {"initialize": initialized, "list_tools": listed, "tools": len(tools)}
+
+
+def measure_imports(env: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    Import the server module in a fresh interpreter with ``-X importtime``.
+
+    Returns:
+        Total import time of the server module and the slowest modules it
+        imports directly
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {SERVER_MODULE}"],
+        capture_output=True,
+        text=True,
+        cwd=PROJECT_ROOT,
+        env=env,
+        check=True
+    )
+
+    total = 0.0
+    direct: List[tuple] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        try:
+            seconds = int(cumulative) / 1e6
+        except ValueError:
+            continue  # header line
+        level = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        module = name.strip()
+        if module == SERVER_MODULE and level == 0:
+            total = seconds
+        elif level == 1 and seconds >= IMPORT_REPORT_THRESHOLD_S:
+            direct.append((module, seconds))
+
+    direct.sort(key=lambda item: item[1], reverse=True)
+    return {"total": total, "slowest": direct[:10]}
+
+
+def run_startup_benchmark(rounds: int = 5) -> Dict[str, Any]:
+    """Measure import time and time to the first list_tools response over several cold starts."""
+    env = dict(os.environ)
+    # Keep benchmark runs out of the real log and metrics files
+    env.setdefault("LOG_FILE", "")
+    env.setdefault("METRICS_LOG_FILE", "")
+
+    imports = [measure_imports(env) for _ in range(rounds)]
+    sessions = [measure_session_start(env) for _ in range(rounds)]
+
+    def summarize(values: List[float]) -> Dict[str, float]:
+        return {
+            "median": round(statistics.median(values), 4),
+            "min": round(min(values), 4),
+            "max": round(max(values), 4)
+        }
+
+    return {
+        "rounds": rounds,
+        "python": sys.version.split()[0],
+        "import_time": summarize([i["total"] for i in imports]),
+        "slowest_imports": [
+            {"module": module, "seconds": round(seconds, 4)} for module, seconds in imports[-1]["slowest"]
+        ],
+        "time_to_initialize": summarize([s["initialize"] for s in sessions]),
+        "time_to_first_list_tools": summarize([s["list_tools"] for s in sessions]),
+        "tools": sessions[-1]["tools"]
+    }
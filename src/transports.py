@@ -0,0 +1,78 @@
+"""Network transports: one server process serving many MCP client sessions."""
+
+import contextlib
+from typing import AsyncIterator
+
+from loguru import logger
+from mcp.server import Server
+
+from .utils.metrics import registry
+
+TRANSPORTS = ("stdio", "streamable-http", "sse")
+
+# Endpoints of the network transports
+STREAMABLE_HTTP_PATH = "/mcp"
+SSE_PATH = "/sse"
+SSE_MESSAGES_PATH = "/messages/"
+
+
+def build_http_app(server: Server, transport: str):
+    """
+    Build the ASGI app serving ``server`` over streamable HTTP or SSE.
+
+    Every connected client gets its own MCP session on the same ``server``, so
+    all sessions share the scheduler, worker pool and caches. The app also
+    serves the Prometheus metrics at ``/metrics``.
+    """
+    from starlette.applications import Starlette
+    from starlette.responses import PlainTextResponse, Response
+    from starlette.routing import Mount, Route
+
+    async def metrics(request) -> Response:
+        return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+    routes = [Route("/metrics", endpoint=metrics, methods=["GET"])]
+
+    if transport == "streamable-http":
+        from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+
+        session_manager = StreamableHTTPSessionManager(app=server)
+
+        async def handle_streamable_http(scope, receive, send) -> None:
+            await session_manager.handle_request(scope, receive, send)
+
+        @contextlib.asynccontextmanager
+        async def lifespan(app) -> AsyncIterator[None]:
+            async with session_manager.run():
+                yield
+
+        routes.append(Mount(STREAMABLE_HTTP_PATH, app=handle_streamable_http))
+        return Starlette(routes=routes, lifespan=lifespan)
+
+    if transport == "sse":
+        from mcp.server.sse import SseServerTransport
+
+        sse = SseServerTransport(SSE_MESSAGES_PATH)
+
+        async def handle_sse(request) -> Response:
+            async with sse.connect_sse(request.scope, request.receive, request._send) as (read_stream, write_stream):
+                await server.run(read_stream, write_stream, server.create_initialization_options())
+            return Response()
+
+        routes.append(Route(SSE_PATH, endpoint=handle_sse, methods=["GET"]))
+        routes.append(Mount(SSE_MESSAGES_PATH, app=sse.handle_post_message))
+        return Starlette(routes=routes)
+
+    raise ValueError(f"Unknown network transport '{transport}'; use one of {', '.join(TRANSPORTS[1:])}")
+
+
+async def serve_http(server: Server, transport: str, host: str, port: int) -> None:
+    """Serve ``server`` over a network transport until the process is stopped."""
+    import uvicorn
+
+    app = build_http_app(server, transport)
+    path = STREAMABLE_HTTP_PATH if transport == "streamable-http" else SSE_PATH
+    logger.info(f"Serving MCP over {transport} at http://{host}:{port}{path}")
+
+    uvicorn_server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning"))
+    await uvicorn_server.serve()
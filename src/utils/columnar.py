@@ -0,0 +1,195 @@
+"""Columnar (Arrow IPC / Parquet) copies of xl2times CSV output."""
+
+import csv
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+OUTPUT_FORMATS = ("csv", "arrow", "parquet")
+COLUMNAR_SUFFIXES = {"arrow": ".arrow", "parquet": ".parquet"}
+CSV_SUFFIX = "_output.csv"
+
+# Name of the column holding the source table (e.g. "NCAP_COST")
+TABLE_COLUMN = "table"
+
+
+def columnar_available() -> bool:
+    """Return True if pyarrow is installed."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError(
+            "pyarrow is required for arrow/parquet output; "
+            "install it with: pip install 'xl2times-mcp-server[columnar]'"
+        )
+    return pyarrow
+
+
+def find_csv_outputs(output_dir: Path, output_files: Optional[Iterable[str]] = None) -> List[Path]:
+    """
+    Return the ``*_output.csv`` files written by xl2times, sorted by name.
+
+    With ``output_files`` (the files a run reported writing), only those are
+    returned, so tables left in a reused directory by earlier runs are
+    ignored; otherwise every ``*_output.csv`` in ``output_dir`` is.
+    """
+    if output_files is None:
+        return sorted(Path(output_dir).glob(f"*{CSV_SUFFIX}"))
+    directory = Path(output_dir).resolve()
+    files = (Path(f) for f in output_files)
+    return sorted(
+        (path for path in files if path.name.endswith(CSV_SUFFIX) and path.parent.resolve() == directory),
+        key=lambda path: path.name
+    )
+
+
+def write_columnar(
+    output_dir: Path, output_format: str, output_files: Optional[Iterable[str]] = None
+) -> Dict[str, Any]:
+    """
+    Combine the ``*_output.csv`` files of a run into one columnar file.
+
+    Tables are stacked into a single table over the union of their columns,
+    with a ``table`` column naming the source CSV; columns a table does not
+    have are null. ``VALUE`` is stored as float64 when every table's values are
+    numeric, and all other columns (regions, processes, commodities, years,
+    ...) as dictionary-encoded strings, which also keeps joins on them exact.
+
+    Args:
+        output_dir: xl2times output directory
+        output_format: "arrow" (uncompressed Arrow IPC file) or "parquet"
+        output_files: Files written by the run; all tables in ``output_dir`` if None
+
+    Returns:
+        Dictionary with the written file and size/load-time comparison against the CSVs
+    """
+    pa = _require_pyarrow()
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+
+    if output_format not in COLUMNAR_SUFFIXES:
+        raise ValueError(f"Unsupported output format: {output_format}")
+
+    csv_files = find_csv_outputs(output_dir, output_files)
+    if not csv_files:
+        raise ValueError(f"No *{CSV_SUFFIX} files in {output_dir}")
+
+    # Time a plain CSV load of every table as the baseline
+    start = time.perf_counter()
+    tables = []
+    for csv_file in csv_files:
+        # Only VALUE is type-inferred; other columns keep their exact text
+        with open(csv_file, newline="", encoding="utf-8") as f:
+            header = next(csv.reader(f), [])
+        table = pacsv.read_csv(
+            csv_file,
+            convert_options=pacsv.ConvertOptions(
+                column_types={name: pa.string() for name in header if name != "VALUE"},
+                strings_can_be_null=True
+            )
+        )
+        tables.append((csv_file.name[:-len(CSV_SUFFIX)], table))
+    csv_load_seconds = time.perf_counter() - start
+
+    # VALUE stays numeric unless some table has non-numeric values
+    value_types = [table.schema.field("VALUE").type for _, table in tables if "VALUE" in table.column_names]
+    numeric_value = all(
+        pa.types.is_integer(t) or pa.types.is_floating(t) or pa.types.is_null(t) for t in value_types
+    )
+
+    columns: List[str] = []
+    for _, table in tables:
+        columns.extend(name for name in table.column_names if name not in columns and name != TABLE_COLUMN)
+
+    value_type = pa.float64() if numeric_value else pa.string()
+    schema = pa.schema(
+        [pa.field(TABLE_COLUMN, pa.dictionary(pa.int32(), pa.string()))]
+        + [pa.field(name, value_type if name == "VALUE" else pa.dictionary(pa.int32(), pa.string()))
+           for name in columns]
+    )
+
+    pieces = []
+    for name, table in tables:
+        arrays = [pa.array([name] * table.num_rows, pa.string()).dictionary_encode()]
+        for field in schema:
+            if field.name == TABLE_COLUMN:
+                continue
+            if field.name in table.column_names:
+                column = table.column(field.name).combine_chunks()
+                target = value_type if field.name == "VALUE" else pa.string()
+                column = pc.cast(column, target)
+                if field.name != "VALUE":
+                    column = column.dictionary_encode()
+            else:
+                column = pa.nulls(table.num_rows, field.type)
+            arrays.append(column)
+        pieces.append(pa.Table.from_arrays(arrays, schema=schema))
+
+    # Concatenating dictionary columns leaves one dictionary per chunk; unify them
+    combined = pa.concat_tables(pieces).unify_dictionaries().combine_chunks()
+
+    target = Path(output_dir) / f"xl2times_output{COLUMNAR_SUFFIXES[output_format]}"
+    if output_format == "arrow":
+        # Uncompressed so that readers can memory-map the buffers without copying
+        with pa.OSFile(str(target), "wb") as sink:
+            with pa.ipc.new_file(sink, combined.schema) as writer:
+                writer.write_table(combined)
+    else:
+        import pyarrow.parquet as pq
+        pq.write_table(combined, target)
+
+    start = time.perf_counter()
+    read_columnar(target)
+    columnar_load_seconds = time.perf_counter() - start
+
+    csv_bytes = sum(f.stat().st_size for f in csv_files)
+    columnar_bytes = target.stat().st_size
+    return {
+        "format": output_format,
+        "file": str(target),
+        "tables": len(tables),
+        "rows": combined.num_rows,
+        "csv_bytes": csv_bytes,
+        "columnar_bytes": columnar_bytes,
+        "size_ratio": round(columnar_bytes / csv_bytes, 3) if csv_bytes else None,
+        "csv_load_seconds": round(csv_load_seconds, 4),
+        "columnar_load_seconds": round(columnar_load_seconds, 4),
+    }
+
+
+def read_columnar(path: Path, table: Optional[str] = None):
+    """
+    Load a columnar output file as a pyarrow Table.
+
+    Arrow IPC files are memory-mapped and read without copying; Parquet files
+    are decoded from a memory map.
+
+    Args:
+        path: File written by ``write_columnar``
+        table: Only return rows of this xl2times table, dropping columns it does not use
+    """
+    pa = _require_pyarrow()
+
+    path = Path(path)
+    if path.suffix == COLUMNAR_SUFFIXES["arrow"]:
+        with pa.memory_map(str(path), "r") as source:
+            data = pa.ipc.open_file(source).read_all()
+    else:
+        import pyarrow.parquet as pq
+        data = pq.read_table(path, memory_map=True)
+
+    if table is None:
+        return data
+
+    import pyarrow.compute as pc
+    data = data.filter(pc.equal(pc.cast(data.column(TABLE_COLUMN), pa.string()), table))
+    keep = [name for name in data.column_names if data.column(name).null_count < data.num_rows]
+    return data.select(keep)
@@ -0,0 +1,169 @@
+"""Per-workbook cache of raw tables extracted by xl2times."""
+
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from loguru import logger
+
+from .file_manager import hash_file
+
+_FILENAME_LINE = re.compile(r"^filename: .*$", re.MULTILINE)
+
+
+def iter_raw_table_blocks(raw_tables_path: Path) -> Iterator[Tuple[str, str]]:
+    """
+    Stream the table blocks of a raw_tables.txt file.
+
+    Each block starts with a ``sheetname:`` line followed by ``range:``,
+    ``filename:``, ``tag:`` and ``types:`` headers and the table as CSV.
+
+    Yields:
+        (filename, block text) for every block
+    """
+    block: List[str] = []
+    filename = ""
+    with open(raw_tables_path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if line.startswith("sheetname: ") and block:
+                yield filename, "".join(block)
+                block = []
+                filename = ""
+            if line.startswith("filename: ") and not filename:
+                filename = line[len("filename: "):].rstrip("\n")
+            block.append(line)
+    if block:
+        yield filename, "".join(block)
+
+
+class ExtractionCache:
+    """
+    Keeps the raw tables xl2times extracts from each workbook.
+
+    ``index.json`` maps each workbook path to its mtime, size and sha256 so that
+    unchanged files are not re-hashed. Tables are stored by content hash in
+    ``tables/<sha256>.txt``, so identical workbooks in different model
+    directories share one entry. The index also remembers the order in which
+    xl2times wrote each workbook's tables, so merged output keeps that order.
+    """
+
+    def __init__(self, root: Path):
+        """Initialize the cache rooted at ``root``."""
+        self.root = Path(root)
+        self.tables_dir = self.root / "tables"
+        self.index_path = self.root / "index.json"
+        self._lock = threading.Lock()
+        self._index: Dict[str, Dict[str, object]] = {}
+        self._order: List[str] = []
+        self._loaded = False
+
+    def fingerprint(self, paths: Iterable[Path]) -> Dict[Path, str]:
+        """
+        Return the content hash of each workbook, re-hashing only files whose
+        mtime or size changed since they were last seen.
+        """
+        with self._lock:
+            self._load()
+            hashes = {}
+            changed = False
+            for path in paths:
+                stat = path.stat()
+                key = str(path.resolve())
+                entry = self._index.get(key)
+                if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                    hashes[path] = entry["sha256"]
+                    continue
+
+                sha = hash_file(path)
+                self._index[key] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": sha}
+                hashes[path] = sha
+                changed = True
+
+            if changed:
+                self._save()
+            return hashes
+
+    def has(self, sha: str) -> bool:
+        """Return True if tables for this workbook content are cached."""
+        return (self.tables_dir / f"{sha}.txt").exists()
+
+    def store(self, sha: str, blocks: List[str]) -> None:
+        """Store the raw table blocks extracted from one workbook."""
+        self.tables_dir.mkdir(parents=True, exist_ok=True)
+        target = self.tables_dir / f"{sha}.txt"
+        staging = target.with_suffix(f".tmp-{os.getpid()}-{threading.get_ident()}")
+        staging.write_text("".join(blocks), encoding="utf-8")
+        os.replace(staging, target)
+
+    def load(self, sha: str, filename: str) -> str:
+        """Return the cached blocks for a workbook, with ``filename:`` set to ``filename``."""
+        text = (self.tables_dir / f"{sha}.txt").read_text(encoding="utf-8")
+        return _FILENAME_LINE.sub(lambda _: f"filename: {filename}", text)
+
+    def store_from_raw_tables(self, raw_tables_path: Path, hashes: Dict[Path, str]) -> None:
+        """
+        Split an xl2times raw_tables.txt into per-workbook entries.
+
+        Args:
+            raw_tables_path: raw_tables.txt written by ``xl2times --only_read``
+            hashes: Content hash of every workbook that was read
+        """
+        by_name: Dict[str, List[str]] = {str(path.resolve()): [] for path in hashes}
+        seen: List[str] = []
+        for filename, block in iter_raw_table_blocks(raw_tables_path):
+            key = str(Path(filename).resolve()) if filename else ""
+            if key in by_name:
+                by_name[key].append(block)
+                if key not in seen:
+                    seen.append(key)
+            else:
+                logger.debug(f"raw_tables.txt block for unexpected file {filename!r}")
+
+        for path, sha in hashes.items():
+            self.store(sha, by_name[str(path.resolve())])
+
+        with self._lock:
+            self._load()
+            new = [key for key in seen if key not in self._order]
+            if new:
+                self._order.extend(new)
+                self._save()
+
+    def ordered(self, paths: Iterable[Path]) -> List[Path]:
+        """
+        Sort workbooks into the order xl2times wrote their tables.
+
+        Workbooks never seen in an xl2times output go last, by name.
+        """
+        with self._lock:
+            self._load()
+            position = {key: i for i, key in enumerate(self._order)}
+        return sorted(paths, key=lambda path: (position.get(str(path.resolve()), len(position)), str(path)))
+
+    def write_raw_tables(self, target: Path, paths: List[Path], hashes: Dict[Path, str]) -> None:
+        """Write a raw_tables.txt for ``paths`` from the cached blocks."""
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open(target, "w", encoding="utf-8") as f:
+            for path in self.ordered(paths):
+                f.write(self.load(hashes[path], str(path)))
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+            self._index = data["files"]
+            self._order = data.get("order", [])
+        except (OSError, ValueError, KeyError):
+            self._index = {}
+            self._order = []
+        self._loaded = True
+
+    def _save(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        staging = self.index_path.with_suffix(f".tmp-{os.getpid()}")
+        staging.write_text(json.dumps({"files": self._index, "order": self._order}), encoding="utf-8")
+        os.replace(staging, self.index_path)
@@ -0,0 +1,63 @@
+"""File helpers for locating and fingerprinting VEDA workbooks."""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+WORKBOOK_SUFFIXES = {".xlsx", ".xlsm"}
+
+# (path, mtime_ns, size) -> sha256, so unchanged workbooks are hashed once per process
+_hash_memo: Dict[Tuple[str, int, int], str] = {}
+
+
+def is_workbook(path: Path) -> bool:
+    """Return True for xlsx/xlsm files, ignoring Excel's ``~$`` lock files."""
+    return path.suffix.lower() in WORKBOOK_SUFFIXES and not path.name.startswith("~$")
+
+
+def find_input_workbooks(input_files: Union[str, List[str]]) -> Optional[List[Tuple[str, Path]]]:
+    """
+    Resolve xl2times input arguments to the workbooks they refer to.
+
+    Args:
+        input_files: Input directory or list of xlsx/xlsm files
+
+    Returns:
+        Sorted list of (name, path) pairs, where name is the path relative to the
+        input directory (or the file name for explicit files), or None if any
+        input does not exist
+    """
+    inputs = [input_files] if isinstance(input_files, str) else list(input_files)
+    workbooks = []
+
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            for child in path.rglob("*"):
+                if child.is_file() and is_workbook(child):
+                    workbooks.append((child.relative_to(path).as_posix(), child))
+        elif path.is_file():
+            workbooks.append((path.name, path))
+        else:
+            return None
+
+    workbooks.sort()
+    return workbooks
+
+
+def hash_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """Return the sha256 hex digest of a file, memoized on path, mtime and size."""
+    stat = os.stat(path)
+    memo_key = (str(path), stat.st_mtime_ns, stat.st_size)
+    digest = _hash_memo.get(memo_key)
+    if digest is not None:
+        return digest
+
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            sha.update(chunk)
+    digest = sha.hexdigest()
+    _hash_memo[memo_key] = digest
+    return digest
@@ -0,0 +1,263 @@
+"""Streaming parser for xl2times log output."""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# Line classes produced by classify_line()
+PROCESSED = "processed"
+CACHED = "cached"
+WARNING = "warning"
+ERROR = "error"
+SUCCESS = "success"
+ACTIVITY = "activity"
+LOADING = "loading"
+EXTRACTED = "extracted"
+TIMING = "timing"
+
+
+def _case_variants(*words: str) -> List[str]:
+    """Return the lower, Capitalized and UPPER case spelling of each word."""
+    return [variant for word in words for variant in (word, word.capitalize(), word.upper())]
+
+
+# Trigger keywords and the class they announce. Keywords are plain literals so the
+# alternation built from them stays a fast literal scan; the payload is then
+# captured with an anchored pattern at the keyword's position.
+_TRIGGERS: Dict[str, str] = {
+    "Processing": PROCESSED,
+    "Using cached data for": CACHED,
+    **{keyword: WARNING for keyword in _case_variants("warning")},
+    **{keyword: ERROR for keyword in ("Error", "Exception", "ERROR", "CRITICAL")},
+    **{keyword: SUCCESS for keyword in _case_variants("successfully converted", "written to output")},
+    **{keyword: ACTIVITY for keyword in _case_variants("loading", "extracted", "transform", "took", "seconds")},
+    # Progress lines; these are activity markers too but are always scanned for
+    "Loading": LOADING,
+    "Extracted": EXTRACTED,
+    "took": TIMING,
+}
+
+# Success and activity markers only need to be seen once, so there is one trigger
+# pattern per combination of markers still outstanding
+_MARKERS = (SUCCESS, ACTIVITY)
+
+
+def _compile_triggers(*excluded: str) -> "re.Pattern[str]":
+    keywords = sorted((k for k, kind in _TRIGGERS.items() if kind not in excluded), key=len, reverse=True)
+    return re.compile("|".join(re.escape(keyword) for keyword in keywords))
+
+
+_TRIGGER_PATTERNS = {
+    (False, False): _compile_triggers(),
+    (True, False): _compile_triggers(SUCCESS),
+    (False, True): _compile_triggers(ACTIVITY),
+    (True, True): _compile_triggers(*_MARKERS),
+}
+
+_PROCESSED_FILE = re.compile(r"Processing\s+(\S+\.xlsx?)")
+_CACHED_FILE = re.compile(r"Using cached data for.*?([^/\\]+\.xlsx?)")
+_WARNING_TEXT = re.compile(r"\s*:\s*(.+)")
+_WARNING_PREFIXES = {"future": "FutureWarning", "user": "UserWarning", "deprecation": "DeprecationWarning"}
+_ERROR_LINE = re.compile(r"\s*(?:(?:\w+\.)*\w*(?:Error|Exception)|ERROR)\s*:\s*\S")
+_LOG_LEVEL_ERROR = re.compile(r"\|\s*(?:ERROR|CRITICAL)\s*\|")
+_LOADING_FILES = re.compile(r"Loading\s+(\d+)\s+files")
+_EXTRACTED_TABLES = re.compile(r"Extracted\b.*?(\d+)\s+tables.*?([\d.]+)\s+seconds")
+_TIMING = re.compile(r"(\w+)\s+took\s+([\d.]+)\s+sec")
+
+
+def classify_line(
+    line: str, success_seen: bool = False, activity_seen: bool = False
+) -> List[Tuple[str, Optional[str], Optional[str]]]:
+    """
+    Classify one log line in a single scan.
+
+    Args:
+        line: A single line of xl2times output
+        success_seen: Skip success markers (already found)
+        activity_seen: Skip activity markers (already found)
+
+    Returns:
+        List of (class, payload, detail) tuples, one per match:
+
+        - processed/cached: file name
+        - warning: message, warning class
+        - error: stripped line
+        - loading: number of input files
+        - extracted: number of tables, seconds
+        - timing: step name, seconds
+
+        A warning or error classifies the rest of the line. Progress lines that do
+        not have the expected shape count as activity markers.
+    """
+    matches = []
+    for trigger in _TRIGGER_PATTERNS[success_seen, activity_seen].finditer(line):
+        kind = _TRIGGERS[trigger.group()]
+        start = trigger.start()
+
+        if kind == PROCESSED:
+            match = _PROCESSED_FILE.match(line, start)
+            if match:
+                matches.append((PROCESSED, match.group(1), None))
+
+        elif kind == CACHED:
+            match = _CACHED_FILE.match(line, start)
+            if match:
+                matches.append((CACHED, match.group(1), None))
+
+        elif kind == WARNING:
+            match = _WARNING_TEXT.match(line, trigger.end())
+            if match:
+                prefix = line[max(0, start - 11):start].lower()
+                warning_class = next(
+                    (name for word, name in _WARNING_PREFIXES.items() if prefix.endswith(word)),
+                    "Warning"
+                )
+                matches.append((WARNING, match.group(1).strip(), warning_class))
+                break
+
+        elif kind == ERROR:
+            if _ERROR_LINE.match(line) or _LOG_LEVEL_ERROR.search(line, max(0, start - 8)):
+                matches.append((ERROR, line.strip(), None))
+                break
+
+        elif kind == LOADING:
+            match = _LOADING_FILES.match(line, start)
+            if match:
+                matches.append((LOADING, match.group(1), None))
+            elif not activity_seen:
+                matches.append((ACTIVITY, None, None))
+
+        elif kind == EXTRACTED:
+            match = _EXTRACTED_TABLES.match(line, start)
+            if match:
+                matches.append((EXTRACTED, match.group(1), match.group(2)))
+            elif not activity_seen:
+                matches.append((ACTIVITY, None, None))
+
+        elif kind == TIMING:
+            match = _TIMING.search(line, 0, trigger.end() + 32)
+            if match and match.start() < start:
+                matches.append((TIMING, match.group(1), match.group(2)))
+            elif not activity_seen:
+                matches.append((ACTIVITY, None, None))
+
+        else:
+            matches.append((kind, None, None))
+
+    return matches
+
+
+class XL2TimesLogParser:
+    """
+    Incrementally extracts status, warnings, errors and processed files from
+    xl2times output.
+
+    Lines are fed one at a time as they are read from the process, so the full
+    log never has to be held in memory. Each line is classified with a single
+    scan of a precompiled trigger pattern (see ``classify_line``).
+    """
+
+    WARNING_TYPES = ["warning", "futurewarning", "userwarning", "deprecationwarning"]
+
+    def __init__(self):
+        """Initialize an empty parser state."""
+        self.success_seen = False
+        self.activity_seen = False
+        self.files_processed: List[str] = []
+        self.files_read: List[str] = []
+        self.files_cached: List[str] = []
+        self.warnings: List[str] = []
+        self.warning_classes: Dict[str, int] = {}
+        self.errors: List[str] = []
+        self.lines = 0
+        self.files_total: Optional[int] = None
+        self.tables_extracted: Optional[int] = None
+        self.timings: List[Tuple[str, float]] = []
+        self._files_seen = set()
+
+    def feed(self, line: str) -> None:
+        """Consume one line of combined xl2times stdout/stderr."""
+        self.lines += 1
+
+        for kind, payload, detail in classify_line(line, self.success_seen, self.activity_seen):
+            if kind == PROCESSED:
+                self.files_processed.append(payload)
+                self.files_read.append(payload)
+                self._files_seen.add(payload)
+            elif kind == CACHED:
+                if payload not in self._files_seen:
+                    self.files_processed.append(payload)
+                    self.files_cached.append(payload)
+                    self._files_seen.add(payload)
+            elif kind == WARNING:
+                self.warnings.append(payload)
+                self.warning_classes[detail] = self.warning_classes.get(detail, 0) + 1
+            elif kind == ERROR:
+                self.errors.append(payload)
+            elif kind == SUCCESS:
+                self.success_seen = True
+            elif kind == ACTIVITY:
+                self.activity_seen = True
+            elif kind == LOADING:
+                self.files_total = int(payload)
+                self.activity_seen = True
+            elif kind == EXTRACTED:
+                self.tables_extracted = int(payload)
+                self.timings.append(("extract", float(detail)))
+                self.activity_seen = True
+            elif kind == TIMING:
+                self.timings.append((payload, float(detail)))
+                self.activity_seen = True
+
+    def feed_stderr(self, line: str) -> None:
+        """Consume one line of separate stderr output."""
+        line = line.strip()
+        if line and 'error' in line.lower():
+            # Skip if it's actually a warning disguised as error in stderr
+            if any(warn_type in line.lower() for warn_type in self.WARNING_TYPES):
+                # Treat as warning instead
+                self.warnings.append(line)
+            else:
+                self.errors.append(line)
+
+    def progress(self) -> Dict[str, Any]:
+        """Return a snapshot of how far the run has got."""
+        return {
+            "lines": self.lines,
+            "files_total": self.files_total,
+            "files_loaded": len(self.files_processed),
+            "tables_extracted": self.tables_extracted,
+            "transforms_done": sum(1 for name, _ in self.timings if name != "extract"),
+            "last_step": self.timings[-1][0] if self.timings else None,
+            "warnings": len(self.warnings),
+            "errors": len(self.errors)
+        }
+
+    def result(self) -> Dict[str, Any]:
+        """Return the parse result for everything fed so far."""
+        result = {
+            "success": False,
+            "message": "",
+            "files_processed": list(self.files_processed),
+            "warnings": list(self.warnings),
+            "warning_classes": dict(self.warning_classes),
+            "errors": list(self.errors),
+            "output_files": []
+        }
+
+        if self.success_seen:
+            result["success"] = True
+            result["message"] = "Excel files successfully converted"
+
+        # If we haven't found success indicators but have no real errors and have output, assume success
+        if not result["success"] and not result["errors"] and self.activity_seen:
+            result["success"] = True
+            result["message"] = "Processing completed"
+
+        # Only mark as failed if we have actual errors (not warnings)
+        if result["errors"]:
+            result["success"] = False
+            result["message"] = "Errors occurred during conversion"
+        elif result["success"] and result["warnings"]:
+            result["message"] = f"Conversion completed with {len(result['warnings'])} warnings"
+
+        return result
@@ -0,0 +1,261 @@
+"""Compressed store of xl2times run logs with an index of their warning and error lines."""
+
+import gzip
+import io
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from loguru import logger
+
+try:
+    import zstandard
+except ImportError:  # optional; gzip is used instead
+    zstandard = None
+
+COMPRESSIONS = ("gzip", "zstd", "none")
+_SUFFIXES = {"gzip": ".log.gz", "zstd": ".log.zst", "none": ".log"}
+# Warning and error lines kept per run for the index
+MAX_INDEXED_LINES = 500
+_COPY_CHUNK = 1024 * 1024
+_TOKEN = re.compile(r"[a-z0-9_]+")
+
+
+def tokenize(text: str) -> Set[str]:
+    """Lower-case word tokens of ``text``."""
+    return set(_TOKEN.findall(text.lower()))
+
+
+class LogStore:
+    """
+    Keeps one log per xl2times run under a unique, time-ordered run ID.
+
+    A run writes its log uncompressed to ``<root>/<run_id>.log`` (warm pool
+    workers append to it directly). When the run finishes, the log is stream-
+    compressed to ``<run_id>.log.gz`` (or ``.log.zst``), and ``<run_id>.json``
+    records the command, outcome and the run's warning and error lines. An
+    inverted index from word tokens to run IDs is built from those records,
+    so searches never decompress logs. Runs older than ``max_age`` seconds,
+    then the oldest runs beyond ``max_bytes`` of compressed logs, are deleted.
+    """
+
+    def __init__(self, root: Path, compression: str = "gzip", max_bytes: int = 0, max_age: float = 0):
+        """Initialize the store rooted at ``root``; 0 disables a retention limit."""
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Log compression must be one of {', '.join(COMPRESSIONS)}")
+        if compression == "zstd" and zstandard is None:
+            logger.warning("zstandard is not installed; compressing run logs with gzip")
+            compression = "gzip"
+        self.root = Path(root)
+        self.compression = compression
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._runs: Optional[Dict[str, Dict[str, Any]]] = None
+        self._postings: Dict[str, Set[str]] = {}
+
+    def new_run(self) -> Tuple[str, Path]:
+        """Return a new run ID and the path its log is written to while it runs."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        # Sortable to the microsecond; the random suffix separates runs started together
+        now = time.time_ns()
+        run_id = f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(now / 1e9))}.{now // 1000 % 1_000_000:06d}-{uuid.uuid4().hex[:6]}"
+        return run_id, self.root / f"{run_id}.log"
+
+    def finish(
+        self,
+        run_id: str,
+        info: Dict[str, Any],
+        warnings: List[str],
+        errors: List[str]
+    ) -> Path:
+        """
+        Compress a finished run's log, record it in the index and apply retention.
+
+        Args:
+            run_id: ID from ``new_run``
+            info: Run details stored with the log (command, return code, success)
+            warnings: Warning lines of the run
+            errors: Error lines of the run
+
+        Returns:
+            Path of the stored log
+        """
+        live = self.root / f"{run_id}.log"
+        stored = self._compress(live)
+        lines = [{"level": "error", "text": text} for text in errors]
+        lines += [{"level": "warning", "text": text} for text in warnings]
+        record = {
+            "run_id": run_id,
+            "finished_at": time.time(),
+            **info,
+            "log": stored.name,
+            "bytes": stored.stat().st_size if stored.exists() else 0,
+            "warnings": len(warnings),
+            "errors": len(errors),
+            "lines": lines[:MAX_INDEXED_LINES]
+        }
+        temp = self.root / f".{run_id}.json.tmp"
+        temp.write_text(json.dumps(record), encoding="utf-8")
+        os.replace(temp, self.root / f"{run_id}.json")
+
+        with self._lock:
+            if self._runs is not None:
+                self._add(record)
+        self.prune()
+        return stored
+
+    def search(
+        self, query: str = "", level: Optional[str] = None, limit: int = 20, session: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Find runs whose warning or error lines contain every word of ``query``.
+
+        With ``session``, only runs started by that client session are searched.
+
+        Returns:
+            Newest runs first, each with its matching lines (all indexed lines
+            of the level when ``query`` is empty)
+        """
+        words = tokenize(query)
+        with self._lock:
+            runs = self._load()
+            if words:
+                candidates = set.intersection(*(self._postings.get(word, set()) for word in words))
+            else:
+                candidates = set(runs)
+            records = [
+                runs[run_id] for run_id in sorted(candidates, reverse=True)
+                if session is None or runs[run_id].get("session") == session
+            ]
+
+        matches = []
+        for record in records:
+            lines = [
+                line for line in record["lines"]
+                if (level is None or line["level"] == level) and words <= tokenize(line["text"])
+            ]
+            if lines or (not words and level is None):
+                matches.append({**self._summary(record), "matches": lines})
+                if len(matches) >= limit:
+                    break
+        return matches
+
+    def get(self, run_id: str, session: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Return the stored record of a run.
+
+        Raises:
+            ValueError: If the run is unknown, was removed by retention or, with
+                ``session``, was not started by that session
+        """
+        with self._lock:
+            record = self._load().get(run_id)
+        if record is None or (session is not None and record.get("session") != session):
+            raise ValueError(f"Unknown run: {run_id}")
+        return record
+
+    def read_lines(self, run_id: str) -> Iterator[str]:
+        """Stream the lines of a run's log, decompressing as they are read."""
+        path = self.root / self.get(run_id)["log"]
+        if path.name.endswith(".zst"):
+            if zstandard is None:
+                raise ValueError(f"Reading {path.name} requires zstandard to be installed")
+            with open(path, "rb") as raw, zstandard.ZstdDecompressor().stream_reader(raw) as reader:
+                yield from (line.rstrip("\n") for line in io.TextIOWrapper(reader, encoding="utf-8", errors="replace"))
+        else:
+            opener = gzip.open if path.name.endswith(".gz") else open
+            with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+                yield from (line.rstrip("\n") for line in f)
+
+    def grep(self, run_id: str, query: str = "", tail: int = 100) -> List[str]:
+        """Return the last ``tail`` log lines of a run containing ``query`` (case-insensitive)."""
+        needle = query.lower()
+        return list(deque((line for line in self.read_lines(run_id) if needle in line.lower()), maxlen=tail))
+
+    def prune(self) -> None:
+        """Delete runs beyond the age and size limits."""
+        if not self.max_age and not self.max_bytes:
+            return
+        with self._lock:
+            runs = self._load()
+            removed = []
+            oldest_allowed = time.time() - self.max_age if self.max_age else None
+            total = sum(record["bytes"] for record in runs.values())
+            for run_id in sorted(runs):
+                record = runs[run_id]
+                if (oldest_allowed is not None and record["finished_at"] < oldest_allowed) or \
+                        (self.max_bytes and total > self.max_bytes):
+                    total -= record["bytes"]
+                    removed.append(record)
+            for record in removed:
+                self._remove(record)
+        for record in removed:
+            for path in (self.root / record["log"], self.root / f"{record['run_id']}.json"):
+                path.unlink(missing_ok=True)
+        if removed:
+            logger.info(f"Removed {len(removed)} old run logs")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of stored runs and their compressed size."""
+        with self._lock:
+            runs = self._load()
+            return {
+                "runs": len(runs),
+                "bytes": sum(record["bytes"] for record in runs.values()),
+                "compression": self.compression
+            }
+
+    def _compress(self, live: Path) -> Path:
+        """Stream-compress ``live`` next to itself and remove it."""
+        if self.compression == "none" or not live.exists():
+            return live
+        target = live.with_name(live.name.removesuffix(".log") + _SUFFIXES[self.compression])
+        with open(live, "rb") as source:
+            if self.compression == "gzip":
+                with gzip.open(target, "wb", compresslevel=6) as sink:
+                    shutil.copyfileobj(source, sink, _COPY_CHUNK)
+            else:
+                with open(target, "wb") as raw, zstandard.ZstdCompressor(level=3).stream_writer(raw) as sink:
+                    shutil.copyfileobj(source, sink, _COPY_CHUNK)
+        live.unlink()
+        return target
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Read all run records on first use (caller holds the lock)."""
+        if self._runs is None:
+            self._runs = {}
+            if self.root.is_dir():
+                for path in self.root.glob("*.json"):
+                    try:
+                        self._add(json.loads(path.read_text(encoding="utf-8")))
+                    except (OSError, ValueError, KeyError) as e:
+                        logger.warning(f"Skipping unreadable run log record {path.name}: {e}")
+        return self._runs
+
+    def _add(self, record: Dict[str, Any]) -> None:
+        self._runs[record["run_id"]] = record
+        for line in record["lines"]:
+            for word in tokenize(line["text"]):
+                self._postings.setdefault(word, set()).add(record["run_id"])
+
+    def _remove(self, record: Dict[str, Any]) -> None:
+        self._runs.pop(record["run_id"], None)
+        for line in record["lines"]:
+            for word in tokenize(line["text"]):
+                posting = self._postings.get(word)
+                if posting is not None:
+                    posting.discard(record["run_id"])
+                    if not posting:
+                        del self._postings[word]
+
+    @staticmethod
+    def _summary(record: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in record.items() if key != "lines"}
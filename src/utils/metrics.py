@@ -0,0 +1,307 @@
+"""In-process metrics registry with Prometheus text exposition."""
+
+import asyncio
+import math
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from ..config import config
+
+LabelValues = Tuple[str, ...]
+
+# Default histogram buckets for durations in seconds
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+# Buckets for model (input workbook) sizes in bytes
+SIZE_BUCKETS = tuple(2 ** n * 1024 for n in range(4, 20, 2))
+# Buckets for output file counts
+COUNT_BUCKETS = (0, 1, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+PERCENTILES = (50, 90, 99)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _percentile(ordered: List[float], percentile: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    rank = max(1, math.ceil(percentile / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """A monotonically increasing count."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        super().__init__(name, help_text, labels)
+        self.values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        """Add ``amount`` to the counter for ``labels``."""
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def total(self, **labels: Any) -> float:
+        """Sum over every label set matching the given labels."""
+        positions = [(self.label_names.index(k), str(v)) for k, v in labels.items()]
+        return sum(
+            value for key, value in self.values.items()
+            if all(key[i] == v for i, v in positions)
+        )
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for key, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{_label_text(self.label_names, key)} {_format_value(value)}")
+        return lines
+
+    def summary(self) -> Any:
+        if not self.label_names:
+            return self.values.get((), 0)
+        return {",".join(key): value for key, value in sorted(self.values.items())}
+
+
+class Gauge(_Metric):
+    """A value that goes up and down, either set directly or read from a callback."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, callback: Optional[Callable[[], float]] = None):
+        super().__init__(name, help_text)
+        self.value = 0.0
+        self.callback = callback
+
+    def inc(self, amount: float = 1) -> None:
+        """Increase the gauge."""
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        """Decrease the gauge."""
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        """Set the gauge."""
+        self.value = value
+
+    def get(self) -> float:
+        """Return the current value, calling the callback if there is one."""
+        if self.callback is not None:
+            try:
+                return float(self.callback())
+            except Exception as e:
+                logger.debug(f"Gauge {self.name} callback failed: {e}")
+                return math.nan
+        return self.value
+
+    def render(self) -> List[str]:
+        return self._header() + [f"{self.name} {_format_value(self.get())}"]
+
+    def summary(self) -> Any:
+        return self.get()
+
+
+class _HistogramSeries:
+    def __init__(self, buckets: Sequence[float], window: int):
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+        self.recent: Deque[float] = deque(maxlen=window)
+
+
+class Histogram(_Metric):
+    """
+    Cumulative bucket counts for Prometheus, plus a rolling window of the most
+    recent observations for percentile summaries.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help_text: str, buckets: Sequence[float], labels: Sequence[str] = (), window: int = 1000
+    ):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self.window = max(1, window)
+        self.series: Dict[LabelValues, _HistogramSeries] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """Record one observation."""
+        key = self._key(labels)
+        with self._lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = _HistogramSeries(self.buckets, self.window)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series.counts[i] += 1
+                    break
+            series.sum += value
+            series.count += 1
+            series.recent.append(value)
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for key, series in sorted(self.series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series.counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_label_text(self.label_names, key, le)} {cumulative}")
+            labels = _label_text(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series.sum)}")
+            lines.append(f"{self.name}_count{labels} {series.count}")
+        return lines
+
+    def _series_summary(self, series: _HistogramSeries) -> Dict[str, Any]:
+        ordered = sorted(series.recent)
+        summary: Dict[str, Any] = {"count": series.count, "sum": round(series.sum, 6)}
+        if ordered:
+            summary["window"] = len(ordered)
+            for p in PERCENTILES:
+                summary[f"p{p}"] = round(_percentile(ordered, p), 6)
+            summary["max"] = round(ordered[-1], 6)
+        return summary
+
+    def summary(self) -> Any:
+        if not self.label_names:
+            series = self.series.get(())
+            return self._series_summary(series) if series else {"count": 0, "sum": 0.0}
+        return {",".join(key): self._series_summary(series) for key, series in sorted(self.series.items())}
+
+
+class MetricsRegistry:
+    """Holds every metric of the server; metrics are created on first use."""
+
+    def __init__(self, window: int = 1000):
+        """
+        Initialize an empty registry.
+
+        Args:
+            window: Number of recent observations each histogram keeps for percentiles
+        """
+        self.window = window
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, name: str, factory: Callable[[], _Metric]) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = factory()
+            return metric
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        """Return the counter ``name``, creating it if needed."""
+        return self._get_or_create(name, lambda: Counter(name, help_text, labels))
+
+    def gauge(self, name: str, help_text: str, callback: Optional[Callable[[], float]] = None) -> Gauge:
+        """Return the gauge ``name``, creating it if needed; a given callback replaces the current one."""
+        gauge = self._get_or_create(name, lambda: Gauge(name, help_text))
+        if callback is not None:
+            gauge.callback = callback
+        return gauge
+
+    def histogram(
+        self, name: str, help_text: str, buckets: Sequence[float] = DURATION_BUCKETS, labels: Sequence[str] = ()
+    ) -> Histogram:
+        """Return the histogram ``name``, creating it if needed."""
+        return self._get_or_create(name, lambda: Histogram(name, help_text, buckets, labels, self.window))
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for name in sorted(self._metrics):
+            lines.extend(self._metrics[name].render())
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Return counters, gauges and histogram percentiles as plain values."""
+        summary: Dict[str, Dict[str, Any]] = {"counters": {}, "gauges": {}, "histograms": {}}
+        sections = {"counter": "counters", "gauge": "gauges", "histogram": "histograms"}
+        for name in sorted(self._metrics):
+            metric = self._metrics[name]
+            summary[sections[metric.kind]][name] = metric.summary()
+        return summary
+
+
+async def start_metrics_server(registry: MetricsRegistry, host: str, port: int) -> asyncio.AbstractServer:
+    """
+    Serve ``registry`` over HTTP at ``/metrics`` in the Prometheus text format.
+
+    Only GET requests are answered; the server is meant for a local scraper.
+    """
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+            while (await asyncio.wait_for(reader.readline(), timeout=5)) not in (b"\r\n", b"\n", b""):
+                pass
+
+            parts = request_line.decode("latin-1").split()
+            path = parts[1].split("?")[0] if len(parts) > 1 else ""
+            if len(parts) < 2 or parts[0] != "GET":
+                status, body, content_type = "405 Method Not Allowed", b"", "text/plain"
+            elif path in ("/metrics", "/"):
+                status, content_type = "200 OK", "text/plain; version=0.0.4; charset=utf-8"
+                body = registry.render().encode("utf-8")
+            else:
+                status, body, content_type = "404 Not Found", b"", "text/plain"
+
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    logger.info(f"Serving Prometheus metrics on http://{host}:{port}/metrics")
+    return server
+
+
+# Metrics shared by every handler of the server
+registry = MetricsRegistry(window=config.METRICS_WINDOW_SIZE)
@@ -0,0 +1,95 @@
+"""Snapshots of output directories and manifests of the files a run wrote."""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Relative path -> (mtime_ns, size, inode)
+Snapshot = Dict[str, Tuple[int, int, int]]
+
+
+def snapshot(directory: Optional[str]) -> Snapshot:
+    """
+    Record every file under ``directory`` in a single ``os.scandir`` walk.
+
+    Returns:
+        Stat signature of each file keyed by its path relative to ``directory``;
+        empty if the directory does not exist
+    """
+    files: Snapshot = {}
+    if not directory:
+        return files
+
+    root = os.fspath(directory)
+    pending = [(root, "")]
+    while pending:
+        path, prefix = pending.pop()
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    relative = prefix + entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append((entry.path, relative + "/"))
+                    elif entry.is_file():
+                        stat = entry.stat()
+                        files[relative] = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+    return files
+
+
+def written_since(before: Snapshot, after: Snapshot) -> List[str]:
+    """Return the sorted relative paths that are new in ``after`` or were rewritten since ``before``."""
+    return sorted(relative for relative, signature in after.items() if before.get(relative) != signature)
+
+
+def manifest_entry(directory: str, path: str, hashes: bool = True) -> Dict[str, Any]:
+    """Describe one output file by its path relative to ``directory``, size and optional sha256."""
+    path = Path(path)
+    entry: Dict[str, Any] = {"path": path.relative_to(directory).as_posix(), "size": path.stat().st_size}
+    if hashes:
+        with open(path, "rb") as f:
+            entry["sha256"] = hashlib.file_digest(f, "sha256").hexdigest()
+    return entry
+
+
+def collect_outputs(directory: str, before: Snapshot, hashes: bool = True) -> Dict[str, Any]:
+    """
+    Find the files a run wrote to ``directory`` and describe them.
+
+    Files that were already there and were not touched by the run (for
+    example outputs of earlier runs in a shared directory) are left out.
+
+    Args:
+        directory: Output directory of the run
+        before: Snapshot taken before the run started
+        hashes: Whether to include the sha256 of every written file
+
+    Returns:
+        Dictionary with ``output_files`` (absolute paths), ``manifest`` (relative
+        path, size and optional sha256 per file, total bytes and the number of
+        untouched files) and ``first_mtime`` (earliest mtime of a written
+        file in seconds, or None)
+    """
+    after = snapshot(directory)
+    written = written_since(before, after)
+    base = Path(directory)
+
+    files = []
+    for relative in written:
+        try:
+            files.append(manifest_entry(directory, base / relative, hashes))
+        except OSError:
+            continue  # removed while scanning
+
+    first_mtime_ns = min((after[relative][0] for relative in written), default=None)
+    return {
+        "output_files": [str(base / entry["path"]) for entry in files],
+        "manifest": {
+            "files": files,
+            "total_bytes": sum(entry["size"] for entry in files),
+            "untouched_files": len(after) - len(written)
+        },
+        "first_mtime": first_mtime_ns / 1e9 if first_mtime_ns is not None else None
+    }
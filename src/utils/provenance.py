@@ -0,0 +1,339 @@
+"""Row-level provenance index from converted tables back to their source workbooks."""
+
+import csv
+import hashlib
+import io
+import json
+import mmap
+import os
+import struct
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .columnar import CSV_SUFFIX, find_csv_outputs
+from .raw_tables import RawTablesIndex
+
+PROVENANCE_FILE = "provenance.idx"
+MERGED_TABLES_FILE = "merged_tables.txt"
+RAW_TABLES_FILE = "raw_tables.txt"
+
+_MAGIC = b"XLPROV01"
+# magic, slot count, entry count, metadata offset, metadata length
+_FILE_HEADER = struct.Struct("<8sIIQQ")
+# key hash (0 = empty slot), key offset, source id, row number in the output CSV
+_SLOT = struct.Struct("<QQII")
+_KEY_LENGTH = struct.Struct("<I")
+NO_SOURCE = 0xFFFFFFFF
+
+# merged_tables.txt columns that describe where a row came from rather than its data
+_ORIGIN_COLUMNS = {"source_filename", "module_type", "submodule", "module_name"}
+# Candidate source rows scored per output row
+_MAX_CANDIDATES = 2000
+
+_KEY_SEPARATOR = "\x1f"
+
+# Open indexes, keyed by path and invalidated on mtime/size change
+_INDEX_CACHE_SIZE = 16
+_index_cache: "OrderedDict[str, ProvenanceIndex]" = OrderedDict()
+_index_lock = threading.Lock()
+
+
+def normalize(value: Any) -> str:
+    """Canonical form of a cell value: numbers as floats, text stripped and upper-cased."""
+    text = str(value).strip()
+    try:
+        return repr(float(text))
+    except ValueError:
+        return text.upper()
+
+
+def row_key(table: str, values: Iterable[Any]) -> bytes:
+    """Key of an output row: its table name and the normalized values of its key columns."""
+    return _KEY_SEPARATOR.join([table.upper(), *(normalize(v) for v in values)]).encode("utf-8")
+
+
+def key_columns(columns: List[str]) -> List[str]:
+    """Columns identifying a row of a TIMES table: all except VALUE."""
+    return [c for c in columns if c.upper() != "VALUE"] or columns
+
+
+def _hash(key: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little") | 1
+
+
+def iter_merged_tables(path: Path) -> Iterator[Tuple[str, List[str], List[List[str]]]]:
+    """
+    Stream the tables of a merged_tables.txt file.
+
+    Each block starts with ``tag:`` and ``types:`` lines followed by the table
+    as CSV, ending at blank lines.
+
+    Yields:
+        (tag, header, rows) for every block
+    """
+    tag = None
+    lines: List[str] = []
+
+    def block():
+        rows = list(csv.reader(io.StringIO("".join(lines))))
+        return tag, (rows[0] if rows else []), rows[1:]
+
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if line.startswith("tag: "):
+                if tag is not None:
+                    yield block()
+                tag, lines = line[len("tag: "):].strip(), []
+            elif tag is not None and not line.startswith("types: ") and line.strip():
+                lines.append(line)
+    if tag is not None:
+        yield block()
+
+
+class _SourceMatcher:
+    """Finds the merged_tables.txt row, and raw_tables.txt block, behind an output row."""
+
+    def __init__(self, merged_tables: Path, raw_tables: Optional[Path]):
+        self.rows: List[Tuple[frozenset, Optional[str], str, str]] = []  # tokens, attribute, workbook, tag
+        self.postings: Dict[str, List[int]] = {}
+        for tag, header, rows in iter_merged_tables(merged_tables):
+            lowered = [c.lower() for c in header]
+            data_columns = [i for i, c in enumerate(lowered) if c not in _ORIGIN_COLUMNS]
+            source_column = lowered.index("source_filename") if "source_filename" in lowered else None
+            attribute_column = lowered.index("attribute") if "attribute" in lowered else None
+            for values in rows:
+                tokens = frozenset(normalize(values[i]) for i in data_columns if i < len(values) and values[i].strip())
+                workbook = values[source_column] if source_column is not None and source_column < len(values) else ""
+                attribute = (
+                    values[attribute_column].upper()
+                    if attribute_column is not None and attribute_column < len(values) else None
+                )
+                row_id = len(self.rows)
+                self.rows.append((tokens, attribute, workbook, tag))
+                for token in tokens:
+                    self.postings.setdefault(token, []).append(row_id)
+
+        # Raw blocks by (workbook stem, tag), with the values of their cells
+        self.blocks: Dict[Tuple[str, str], List[Tuple[Any, frozenset]]] = {}
+        if raw_tables is not None:
+            index = RawTablesIndex(raw_tables)
+            for table, (text, _) in zip(index.tables, index.read(index.tables)):
+                tokens = frozenset(
+                    normalize(value) for row in csv.reader(io.StringIO(text)) for value in row if value.strip()
+                )
+                key = (Path(table.filename).stem.upper(), table.tag.split(":")[0].strip().upper())
+                self.blocks.setdefault(key, []).append((table, tokens))
+        self._block_cache: Dict[int, Optional[Any]] = {}
+
+    def match(self, table: str, values: List[str]) -> Optional[Tuple[str, str, Optional[Any]]]:
+        """Return (workbook, tag, raw table or None) of the best matching source row, if any."""
+        tokens = {normalize(v) for v in values if v.strip()}
+        postings = [self.postings[t] for t in tokens if t in self.postings]
+        if not postings:
+            return None
+
+        # The rarest values (usually process or commodity names) pin down the candidates;
+        # all postings as rare as the rarest are used so ties do not depend on set order
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if len(posting) > len(postings[0]) or len(candidates) + len(posting) > _MAX_CANDIDATES:
+                break
+            candidates.update(posting)
+        best, best_score = None, -1
+        for row_id in sorted(candidates)[:_MAX_CANDIDATES]:
+            row_tokens, attribute, _, _ = self.rows[row_id]
+            score = 2 * len(tokens & row_tokens) + (attribute == table.upper())
+            if score > best_score:
+                best, best_score = row_id, score
+
+        row_tokens, _, workbook, tag = self.rows[best]
+        if best not in self._block_cache:
+            self._block_cache[best] = self._raw_block(workbook, tag, row_tokens)
+        return workbook, tag, self._block_cache[best]
+
+    def _raw_block(self, workbook: str, tag: str, tokens: frozenset) -> Optional[Any]:
+        blocks = self.blocks.get((workbook.upper(), tag.upper()), [])
+        if len(blocks) <= 1:
+            return blocks[0][0] if blocks else None
+        return max(blocks, key=lambda block: len(tokens & block[1]))[0]
+
+
+def build_provenance_index(
+    output_dir: Path, raw_tables: Optional[Path] = None, output_files: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Build ``provenance.idx`` for the converted tables in ``output_dir``.
+
+    Every ``*_output.csv`` row (of ``output_files`` when given, the files the
+    run wrote) is keyed by its table and key columns (all but
+    VALUE) and linked to the merged_tables.txt row sharing the most values
+    with it, which names the source workbook and VEDA tag. When raw tables of
+    the model are available (``raw_tables`` or raw_tables.txt in the output
+    directory), the sheet and range of the source table are added.
+
+    The index is an open-addressing hash table written to one file and read
+    through mmap, so a lookup touches a few slots whatever the model size.
+
+    Returns:
+        Summary with the index path, entry count and unmatched rows
+
+    Raises:
+        FileNotFoundError: If the output directory has no merged_tables.txt
+    """
+    output_dir = Path(output_dir)
+    merged_tables = output_dir / MERGED_TABLES_FILE
+    if not merged_tables.is_file():
+        raise FileNotFoundError(f"{MERGED_TABLES_FILE} not found in {output_dir}")
+    if raw_tables is None and (output_dir / RAW_TABLES_FILE).is_file():
+        raw_tables = output_dir / RAW_TABLES_FILE
+
+    matcher = _SourceMatcher(merged_tables, raw_tables)
+    sources: Dict[Tuple, int] = {}
+    tables: Dict[str, Dict[str, Any]] = {}
+    entries: Dict[bytes, Tuple[int, int]] = {}
+    unmatched = 0
+    duplicates = 0
+
+    for csv_path in find_csv_outputs(output_dir, output_files):
+        name = csv_path.name[:-len(CSV_SUFFIX)]
+        with open(csv_path, newline="", encoding="utf-8", errors="replace") as f:
+            reader = csv.reader(f)
+            columns = next(reader, [])
+            keys = key_columns(columns)
+            positions = [columns.index(c) for c in keys]
+            rows = 0
+            for rows, values in enumerate(reader, 1):
+                key = row_key(name, (values[i] if i < len(values) else "" for i in positions))
+                if key in entries:
+                    duplicates += 1
+                    continue
+                match = matcher.match(name, values)
+                if match is None:
+                    unmatched += 1
+                    entries[key] = (NO_SOURCE, rows)
+                    continue
+                workbook, tag, raw = match
+                source = (
+                    workbook, tag,
+                    raw.filename if raw else None, raw.sheetname if raw else None, raw.range if raw else None
+                )
+                entries[key] = (sources.setdefault(source, len(sources)), rows)
+        tables[name.upper()] = {"name": name, "file": csv_path.name, "key_columns": keys, "rows": rows}
+
+    metadata = {
+        "tables": tables,
+        "sources": [
+            {"workbook": workbook, "tag": tag, "filename": filename, "sheetname": sheetname, "range": range_}
+            for workbook, tag, filename, sheetname, range_ in sources
+        ],
+        "raw_tables": str(raw_tables) if raw_tables else None
+    }
+    path = output_dir / PROVENANCE_FILE
+    _write_index(path, entries, metadata)
+    return {
+        "path": str(path),
+        "entries": len(entries),
+        "unmatched_rows": unmatched,
+        "duplicate_keys": duplicates,
+        "sources": len(sources),
+        "with_ranges": raw_tables is not None
+    }
+
+
+def _write_index(path: Path, entries: Dict[bytes, Tuple[int, int]], metadata: Dict[str, Any]) -> None:
+    slot_count = 8
+    while slot_count < 2 * len(entries):
+        slot_count *= 2
+
+    keys_offset = _FILE_HEADER.size + slot_count * _SLOT.size
+    slots = bytearray(slot_count * _SLOT.size)
+    keys = bytearray()
+    mask = slot_count - 1
+    for key, (source, row) in entries.items():
+        key_hash = _hash(key)
+        slot = key_hash & mask
+        while _SLOT.unpack_from(slots, slot * _SLOT.size)[0]:
+            slot = (slot + 1) & mask
+        _SLOT.pack_into(slots, slot * _SLOT.size, key_hash, keys_offset + len(keys), source, row)
+        keys += _KEY_LENGTH.pack(len(key)) + key
+
+    meta = json.dumps(metadata).encode("utf-8")
+    meta_offset = keys_offset + len(keys)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(_FILE_HEADER.pack(_MAGIC, slot_count, len(entries), meta_offset, len(meta)))
+        f.write(slots)
+        f.write(keys)
+        f.write(meta)
+    os.replace(tmp, path)
+
+
+class ProvenanceIndex:
+    """Memory-mapped view of a ``provenance.idx`` file."""
+
+    def __init__(self, path: Path):
+        """Open the index at ``path``."""
+        self.path = Path(path)
+        stat = self.path.stat()
+        self.mtime_ns = stat.st_mtime_ns
+        self.size = stat.st_size
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.slot_count, self.entries, meta_offset, meta_length = _FILE_HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{self.path} is not a provenance index")
+        metadata = json.loads(self._mm[meta_offset:meta_offset + meta_length])
+        self.tables: Dict[str, Dict[str, Any]] = metadata["tables"]
+        self.sources: List[Dict[str, Any]] = metadata["sources"]
+
+    def is_current(self) -> bool:
+        """Return True if the file has not changed since it was opened."""
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return False
+        return stat.st_mtime_ns == self.mtime_ns and stat.st_size == self.size
+
+    def lookup(self, table: str, values: Iterable[Any]) -> Optional[Tuple[Optional[Dict[str, Any]], int]]:
+        """
+        Find an output row by its table and key column values.
+
+        Returns:
+            (source or None if no source row was found, row number in the
+            output CSV), or None if the row is not in the index
+        """
+        key = row_key(table, values)
+        key_hash = _hash(key)
+        mask = self.slot_count - 1
+        slot = key_hash & mask
+        while True:
+            slot_hash, key_offset, source, row = _SLOT.unpack_from(self._mm, _FILE_HEADER.size + slot * _SLOT.size)
+            if slot_hash == 0:
+                return None
+            if slot_hash == key_hash:
+                (length,) = _KEY_LENGTH.unpack_from(self._mm, key_offset)
+                start = key_offset + _KEY_LENGTH.size
+                if self._mm[start:start + length] == key:
+                    return (None if source == NO_SOURCE else self.sources[source]), row
+            slot = (slot + 1) & mask
+
+
+def get_provenance_index(path: Path) -> ProvenanceIndex:
+    """Return the opened index at ``path``, reusing it while the file is unchanged."""
+    key = str(Path(path).resolve())
+    with _index_lock:
+        index = _index_cache.get(key)
+        if index is not None and index.is_current():
+            _index_cache.move_to_end(key)
+            return index
+
+    index = ProvenanceIndex(Path(path))
+    with _index_lock:
+        _index_cache[key] = index
+        _index_cache.move_to_end(key)
+        while len(_index_cache) > _INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+    return index
@@ -0,0 +1,159 @@
+"""Memory-mapped offset index over xl2times raw_tables.txt files."""
+
+import mmap
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+_HEADER = b"sheetname: "
+_HEADER_FIELDS = ("sheetname", "range", "filename", "tag", "types")
+
+# Indexes of recently used files, keyed by path and invalidated on mtime/size change
+_INDEX_CACHE_SIZE = 16
+_index_cache: "OrderedDict[str, RawTablesIndex]" = OrderedDict()
+_index_lock = threading.Lock()
+
+
+@dataclass
+class RawTable:
+    """Location and header of one table block in raw_tables.txt."""
+
+    index: int
+    sheetname: str
+    range: str
+    filename: str
+    tag: str
+    types: str
+    start: int
+    data_start: int
+    end: int
+    rows: int
+
+    def header(self) -> Dict[str, Any]:
+        """Return the block's header fields."""
+        return {
+            "index": self.index,
+            "sheetname": self.sheetname,
+            "range": self.range,
+            "filename": self.filename,
+            "tag": self.tag,
+            "types": self.types,
+            "rows": self.rows
+        }
+
+
+class RawTablesIndex:
+    """
+    Offsets of every table block in a raw_tables.txt file.
+
+    Blocks are found by their ``sheetname:`` header line, so building the index
+    scans the memory-mapped file once without decoding it, and reading a table
+    later only touches its own bytes.
+    """
+
+    def __init__(self, path: Path):
+        """Index the file at ``path``."""
+        self.path = Path(path)
+        stat = self.path.stat()
+        self.mtime_ns = stat.st_mtime_ns
+        self.size = stat.st_size
+        self.tables: List[RawTable] = []
+
+        if self.size:
+            with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                self._build(mm)
+
+    def is_current(self) -> bool:
+        """Return True if the file has not changed since it was indexed."""
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return False
+        return stat.st_mtime_ns == self.mtime_ns and stat.st_size == self.size
+
+    def read(self, tables: List[RawTable], max_rows: Optional[int] = None) -> List[Tuple[str, bool]]:
+        """
+        Read the CSV data of ``tables``.
+
+        Returns:
+            (csv text, truncated) per table; at most ``max_rows`` data rows are
+            returned after the CSV header line
+        """
+        if not tables:
+            return []
+
+        data = []
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for table in tables:
+                end = table.end
+                truncated = False
+                if max_rows is not None and table.rows > max_rows:
+                    # Skip the CSV header line plus max_rows rows
+                    end = table.data_start
+                    for _ in range(max_rows + 1):
+                        end = mm.find(b"\n", end, table.end) + 1
+                    truncated = True
+                text = mm[table.data_start:end].decode("utf-8", errors="replace").rstrip("\n")
+                data.append((text, truncated))
+        return data
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the number of tables per tag and the file size."""
+        tags: Dict[str, int] = {}
+        for table in self.tables:
+            tags[table.tag] = tags.get(table.tag, 0) + 1
+        return {
+            "path": str(self.path),
+            "size_bytes": self.size,
+            "tables": len(self.tables),
+            "tags": tags
+        }
+
+    def _build(self, mm: mmap.mmap) -> None:
+        starts = [0] if mm[:len(_HEADER)] == _HEADER else []
+        pos = mm.find(b"\n" + _HEADER)
+        while pos != -1:
+            starts.append(pos + 1)
+            pos = mm.find(b"\n" + _HEADER, pos + 1)
+
+        for i, start in enumerate(starts):
+            end = starts[i + 1] if i + 1 < len(starts) else len(mm)
+            fields = dict.fromkeys(_HEADER_FIELDS, "")
+            pos = start
+            for name in _HEADER_FIELDS:
+                line_end = mm.find(b"\n", pos, end)
+                if line_end == -1:
+                    line_end = end
+                line = mm[pos:line_end].decode("utf-8", errors="replace")
+                prefix = f"{name}: "
+                if not line.startswith(prefix):
+                    break
+                fields[name] = line[len(prefix):].rstrip("\r")
+                pos = line_end + 1
+
+            data_start = min(pos, end)
+            # Lines after the CSV header, ignoring the blank separator lines
+            rows = max(0, mm[data_start:end].rstrip(b"\n").count(b"\n"))
+            self.tables.append(RawTable(
+                index=i, start=start, data_start=data_start, end=end, rows=rows, **fields
+            ))
+
+
+def get_raw_tables_index(path: Path) -> RawTablesIndex:
+    """Return the index of a raw_tables.txt file, reusing it while the file is unchanged."""
+    key = str(Path(path).resolve())
+    with _index_lock:
+        index = _index_cache.get(key)
+        if index is not None and index.is_current():
+            _index_cache.move_to_end(key)
+            return index
+
+    index = RawTablesIndex(Path(path))
+    with _index_lock:
+        _index_cache[key] = index
+        _index_cache.move_to_end(key)
+        while len(_index_cache) > _INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+    return index
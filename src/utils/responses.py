@@ -0,0 +1,168 @@
+"""Compact serialization of tool responses within a size budget."""
+
+import json
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+# Room left per truncated field for its entry under "truncated"
+_TRUNCATION_OVERHEAD = 160
+# Fields are looked for this many dict levels deep
+_MAX_DEPTH = 3
+
+
+def dumps(value: Any) -> str:
+    """Serialize to compact JSON, with orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; the stdlib encoder handles them
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def _size(value: Any) -> int:
+    return len(dumps(value))
+
+
+def _fields(value: Dict[str, Any], path: Tuple[str, ...] = ()) -> List[Tuple[Tuple[str, ...], Any]]:
+    """Return (path, value) of the lists and strings reachable through dicts."""
+    fields = []
+    for key, item in value.items():
+        if isinstance(item, (list, str)):
+            fields.append((path + (key,), item))
+        elif isinstance(item, dict) and len(path) + 1 < _MAX_DEPTH:
+            fields.extend(_fields(item, path + (key,)))
+    return fields
+
+
+def _set(value: Dict[str, Any], path: Tuple[str, ...], item: Any) -> Dict[str, Any]:
+    """Return a copy of ``value`` with ``path`` replaced, copying only the dicts on the path."""
+    copy = dict(value)
+    copy[path[0]] = item if len(path) == 1 else _set(value[path[0]], path[1:], item)
+    return copy
+
+
+def take(value: Any, share: int, offset: int = 0, minimum: int = 0) -> Any:
+    """
+    Return the part of a list or string starting at ``offset`` that serializes
+    to about ``share`` bytes, but at least ``minimum`` items or characters.
+    """
+    if isinstance(value, str):
+        return value[offset:offset + max(share, minimum)]
+    items = []
+    used = 2
+    for item in value[offset:]:
+        used += _size(item) + 1
+        if used > share and len(items) >= minimum:
+            break
+        items.append(item)
+    return items
+
+
+class ResponseStore:
+    """
+    Keeps the full values of truncated response fields for continuation.
+
+    Entries are evicted least recently used first; a handle is only valid for
+    the session that received it.
+    """
+
+    def __init__(self, max_entries: int):
+        """Initialize an empty store holding at most ``max_entries`` fields."""
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Optional[str], str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, field: str, value: Any, owner: Optional[str] = None) -> str:
+        """Store a field's full value and return its handle."""
+        handle = uuid.uuid4().hex[:12]
+        with self._lock:
+            self._entries[handle] = (owner, field, value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return handle
+
+    def get(self, handle: str, owner: Optional[str] = None) -> Tuple[str, Any]:
+        """
+        Return the field name and full value behind a handle.
+
+        Raises:
+            ValueError: If the handle is unknown, expired or belongs to another session
+        """
+        with self._lock:
+            entry = self._entries.get(handle)
+            if entry is None or entry[0] != owner:
+                raise ValueError(f"Unknown or expired handle: {handle}")
+            self._entries.move_to_end(handle)
+        return entry[1], entry[2]
+
+
+def fit_response(
+    result: Dict[str, Any], budget: int, store: ResponseStore, owner: Optional[str] = None
+) -> Tuple[str, bool]:
+    """
+    Serialize ``result`` in at most about ``budget`` bytes.
+
+    A response over budget has its largest lists and strings cut to a fair
+    share of the budget each (fields smaller than their share are kept
+    whole). Every cut field is listed under ``truncated`` with its total
+    length, the number of items or characters returned and a handle for
+    xl2times_more.
+
+    Returns:
+        (JSON text, whether any field was truncated)
+    """
+    text = dumps(result)
+    if budget <= 0 or len(text) <= budget:
+        return text, False
+
+    fields = sorted(((path, value, _size(value)) for path, value in _fields(result)), key=lambda f: f[2])
+    available = budget - (len(text) - sum(size for _, _, size in fields))
+
+    truncated: Dict[str, Any] = {}
+    fitted = result
+    for i, (path, value, size) in enumerate(fields):
+        share = available // (len(fields) - i)
+        if size <= share:
+            available -= size
+            continue
+        part = take(value, share - _TRUNCATION_OVERHEAD)
+        available -= share
+        name = ".".join(path)
+        fitted = _set(fitted, path, part)
+        truncated[name] = {
+            "total": len(value),
+            "returned": len(part),
+            "handle": store.put(name, value, owner)
+        }
+
+    fitted = dict(fitted)
+    fitted["truncated"] = truncated
+    return dumps(fitted), True
+
+
+def continue_field(
+    store: ResponseStore, handle: str, offset: int, budget: int, owner: Optional[str] = None
+) -> Dict[str, Any]:
+    """Return the next part of a truncated field, starting at ``offset``, within the budget."""
+    field, value = store.get(handle, owner)
+    if offset < 0 or offset > len(value):
+        raise ValueError(f"offset must be between 0 and {len(value)}")
+    share = budget - _TRUNCATION_OVERHEAD if budget > 0 else _size(value)
+    part = take(value, share, offset, minimum=1)
+    end = offset + len(part)
+    return {
+        "field": field,
+        "offset": offset,
+        "total": len(value),
+        "items" if isinstance(value, list) else "text": part,
+        "next_offset": end if end < len(value) else None,
+        "handle": handle
+    }
@@ -0,0 +1,186 @@
+"""Persistent content-addressed cache of xl2times run results."""
+
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+
+class ResultCache:
+    """
+    Caches successful xl2times results together with their output files.
+
+    Entries live in ``<root>/<key>/`` as ``result.json`` plus a ``files/`` tree that
+    mirrors the run's output directory. The entry directory's mtime is refreshed on
+    every hit, and the least recently used entries are evicted once the cache holds
+    more than ``max_entries`` entries or ``max_bytes`` bytes.
+    """
+
+    def __init__(self, root: Path, max_bytes: int, max_entries: int):
+        """Initialize the cache rooted at ``root``."""
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(workbooks: List[Tuple[str, str]], arguments: List[str], version: str) -> str:
+        """
+        Build a cache key.
+
+        Args:
+            workbooks: (name, content hash) for every input workbook
+            arguments: Normalized xl2times arguments
+            version: xl2times version string
+
+        Returns:
+            Hex digest identifying the run
+        """
+        payload = json.dumps(
+            {"workbooks": sorted(workbooks), "arguments": arguments, "version": version},
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, output_dir: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result and restore its output files into ``output_dir``.
+
+        Returns:
+            The stored result dictionary with output paths under ``output_dir``,
+            or None on a miss
+        """
+        entry = self.root / key
+        result_path = entry / "result.json"
+        try:
+            result = json.loads(result_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        files_dir = entry / "files"
+        output_files = []
+        try:
+            for relative in result.pop("output_files_relative", []):
+                target = Path(output_dir) / relative
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(files_dir / relative, target)
+                output_files.append(str(target))
+
+            # Refresh recency for LRU eviction
+            os.utime(entry)
+        except OSError as e:
+            # The entry lost files (e.g. evicted mid-copy); drop it and rerun
+            logger.warning(f"Dropping incomplete cached xl2times result {key[:12]}: {e}")
+            shutil.rmtree(entry, ignore_errors=True)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+
+        result["output_files"] = output_files
+        result["output_directory"] = output_dir
+        return result
+
+    def put(self, key: str, result: Dict[str, Any], output_dir: str) -> None:
+        """Store a successful result and copy its output files into the cache."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        staging = self.root / f".tmp-{uuid.uuid4().hex}"
+        files_dir = staging / "files"
+        files_dir.mkdir(parents=True)
+
+        try:
+            relative_files = []
+            base = Path(output_dir)
+            for output_file in result.get("output_files", []):
+                relative = Path(output_file).relative_to(base)
+                target = files_dir / relative
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(output_file, target)
+                relative_files.append(relative.as_posix())
+
+            stored = {k: v for k, v in result.items() if k not in ("output_files", "output_directory")}
+            stored["output_files_relative"] = relative_files
+            (staging / "result.json").write_text(json.dumps(stored), encoding="utf-8")
+
+            entry = self.root / key
+            if entry.exists():
+                shutil.rmtree(entry, ignore_errors=True)
+            os.replace(staging, entry)
+            self.stores += 1
+
+        except Exception as e:
+            logger.warning(f"Could not store xl2times result in cache: {e}")
+            shutil.rmtree(staging, ignore_errors=True)
+            return
+
+        self._evict()
+
+    def files_dir(self, key: str) -> Optional[Path]:
+        """
+        Return the directory holding a cached run's output files.
+
+        Args:
+            key: Cache key of the run, or a unique prefix of at least 8 characters
+        """
+        if len(key) < 8 or not self.root.exists():
+            return None
+        matches = [
+            entry for entry in self.root.iterdir()
+            if entry.name.startswith(key) and not entry.name.startswith(".tmp-")
+        ]
+        if len(matches) != 1 or not (matches[0] / "files").is_dir():
+            return None
+        return matches[0] / "files"
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current cache size."""
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            "enabled": True,
+            "directory": str(self.root),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "entries": len(entries),
+            "size_bytes": sum(size for _, _, size in entries),
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes
+        }
+
+    def _entries(self) -> List[Tuple[float, Path, int]]:
+        """Return (mtime, path, size) for every cache entry."""
+        if not self.root.exists():
+            return []
+
+        entries = []
+        for entry in self.root.iterdir():
+            if not entry.is_dir() or entry.name.startswith(".tmp-"):
+                continue
+            size = sum(f.stat().st_size for f in entry.rglob("*") if f.is_file())
+            entries.append((entry.stat().st_mtime, entry, size))
+        return entries
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache is within its limits."""
+        entries = sorted(self._entries())
+        total = sum(size for _, _, size in entries)
+
+        while entries and (len(entries) > self.max_entries or total > self.max_bytes):
+            _, entry, size = entries.pop(0)
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            self.evictions += 1
+            logger.debug(f"Evicted cached xl2times result {entry.name}")
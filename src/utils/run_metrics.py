@@ -0,0 +1,107 @@
+"""Per-run phase timings, resource usage and the structured metrics log."""
+
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Phases of a run, in the order they happen
+PHASES = (
+    "queue_wait",
+    "spawn",
+    "extraction",
+    "transforms",
+    "output_write",
+    "output_scan",
+    "log_parse",
+    "response_serialization",
+)
+
+# xl2times "<step> took N seconds" lines for steps that write the output files
+_OUTPUT_STEP = re.compile(r"write|dump|save|output", re.IGNORECASE)
+
+
+@dataclass
+class RunMetrics:
+    """Phase timings (seconds) and child resource usage collected during one run."""
+
+    phases: Dict[str, float] = field(default_factory=dict)
+    resources: Optional[Dict[str, Any]] = None
+
+    def add(self, phase: str, seconds: float) -> None:
+        """Add ``seconds`` to a phase."""
+        self.phases[phase] = self.phases.get(phase, 0.0) + max(0.0, seconds)
+
+    @contextmanager
+    def timer(self, phase: str) -> Iterator[None]:
+        """Time the body of a ``with`` block as part of ``phase``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, time.perf_counter() - start)
+
+    def add_log_timings(self, timings: List[Tuple[str, float]]) -> None:
+        """
+        Split the step timings xl2times logged into extraction, transforms and output write.
+
+        ``timings`` are the (step, seconds) pairs collected by
+        :class:`~src.utils.log_parser.XL2TimesLogParser`.
+        """
+        for step, seconds in timings:
+            if step == "extract":
+                self.add("extraction", seconds)
+            elif _OUTPUT_STEP.search(step):
+                self.add("output_write", seconds)
+            else:
+                self.add("transforms", seconds)
+
+    def as_dict(self) -> Dict[str, float]:
+        """Return the phases in run order, rounded to milliseconds."""
+        ordered = [p for p in PHASES if p in self.phases] + [p for p in self.phases if p not in PHASES]
+        return {phase: round(self.phases[phase], 3) for phase in ordered}
+
+
+def read_rusage(path: Path) -> Optional[Dict[str, Any]]:
+    """Read the JSON written by ``rusage_launcher.py``, or None if it is missing or invalid."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            rusage = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return rusage if isinstance(rusage, dict) else None
+
+
+def combine_resources(resources: List[Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+    """Total CPU time and the largest peak RSS of several processes that ran in parallel."""
+    known = [r for r in resources if r]
+    if not known:
+        return None
+    return {
+        "cpu_user": round(sum(r.get("cpu_user", 0.0) for r in known), 3),
+        "cpu_system": round(sum(r.get("cpu_system", 0.0) for r in known), 3),
+        "max_rss_mb": max(r.get("max_rss_mb", 0.0) for r in known),
+        "processes": len(known)
+    }
+
+
+class MetricsLog:
+    """Appends one JSON object per line to a metrics file."""
+
+    def __init__(self, path: Path):
+        """Initialize the log; the file is created on first write."""
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def write(self, event: str, **fields: Any) -> None:
+        """Append an event record with a timestamp."""
+        record = {"time": round(time.time(), 3), "event": event, **fields}
+        line = json.dumps(record, default=str) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
@@ -0,0 +1,174 @@
+"""Concurrency-limited scheduler for xl2times runs."""
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Union
+
+from .file_manager import find_input_workbooks
+
+
+class SchedulerFullError(Exception):
+    """Exception raised when the run queue is full."""
+    pass
+
+
+@dataclass
+class Ticket:
+    """A granted run slot."""
+
+    memory_estimate: int
+    priority: int
+    queue_wait: float = 0.0
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    sequence: int
+    memory_estimate: int = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+def estimate_run_memory(input_files: Union[str, List[str]], factor: float, base_bytes: int) -> int:
+    """
+    Estimate the peak memory of an xl2times run from its input workbook sizes.
+
+    xlsx files are compressed and expand considerably once loaded into pandas,
+    so the estimate is ``base_bytes + factor * total input size``.
+    """
+    workbooks = find_input_workbooks(input_files) or []
+    total = 0
+    for _, path in workbooks:
+        try:
+            total += path.stat().st_size
+        except OSError:
+            pass
+    return int(base_bytes + factor * total)
+
+
+class JobScheduler:
+    """
+    Admits at most ``max_parallel`` runs at a time, within a memory budget.
+
+    Runs that cannot start immediately wait in a bounded priority queue (lower
+    ``priority`` values first, FIFO within a priority). Only the head of the
+    queue is ever admitted, so a large job is not starved by smaller ones behind
+    it. A job whose estimate exceeds the whole budget runs alone.
+    """
+
+    def __init__(self, max_parallel: int, max_queued: int, memory_budget: int = 0):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_parallel: Maximum number of concurrent runs
+            max_queued: Maximum number of runs waiting for a slot
+            memory_budget: Total estimated memory of concurrent runs in bytes (0 for no limit)
+        """
+        self.max_parallel = max(1, max_parallel)
+        self.max_queued = max_queued
+        self.memory_budget = memory_budget
+
+        self.running = 0
+        self.memory_in_use = 0
+        self.completed = 0
+        self.rejected = 0
+        self._queue: List[_Waiter] = []
+        self._queued = 0
+        self._sequence = itertools.count()
+
+    @asynccontextmanager
+    async def slot(self, memory_estimate: int = 0, priority: int = 0) -> AsyncIterator[Ticket]:
+        """
+        Wait for a run slot and hold it for the duration of the ``async with`` block.
+
+        Raises:
+            SchedulerFullError: If the queue already holds ``max_queued`` runs
+        """
+        ticket = Ticket(memory_estimate=memory_estimate, priority=priority)
+        start = time.time()
+        await self._acquire(memory_estimate, priority)
+        ticket.queue_wait = time.time() - start
+        try:
+            yield ticket
+        finally:
+            self._release(memory_estimate)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return current load and limits."""
+        return {
+            "running": self.running,
+            "queued": self._queued,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "max_parallel": self.max_parallel,
+            "max_queued": self.max_queued,
+            "memory_in_use_mb": round(self.memory_in_use / (1024 * 1024), 1),
+            "memory_budget_mb": round(self.memory_budget / (1024 * 1024), 1)
+        }
+
+    async def _acquire(self, memory_estimate: int, priority: int) -> None:
+        if self._queued == 0 and self._can_start(memory_estimate):
+            self._start(memory_estimate)
+            return
+
+        if self._queued >= self.max_queued:
+            self.rejected += 1
+            raise SchedulerFullError(
+                f"xl2times run queue is full ({self._queued} runs waiting, "
+                f"{self.running} running)"
+            )
+
+        waiter = _Waiter(priority, next(self._sequence), memory_estimate,
+                         asyncio.get_running_loop().create_future())
+        heapq.heappush(self._queue, waiter)
+        self._queued += 1
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Admitted just as we were cancelled: give the slot back
+                self._release(memory_estimate, completed=False)
+            else:
+                waiter.future.cancel()
+                self._queued -= 1
+                self._wake()
+            raise
+
+    def _can_start(self, memory_estimate: int) -> bool:
+        if self.running >= self.max_parallel:
+            return False
+        if self.memory_budget <= 0 or self.running == 0:
+            return True
+        return self.memory_in_use + memory_estimate <= self.memory_budget
+
+    def _start(self, memory_estimate: int) -> None:
+        self.running += 1
+        self.memory_in_use += memory_estimate
+
+    def _release(self, memory_estimate: int, completed: bool = True) -> None:
+        self.running -= 1
+        self.memory_in_use -= memory_estimate
+        if completed:
+            self.completed += 1
+        self._wake()
+
+    def _wake(self) -> None:
+        """Admit waiters from the head of the queue while they fit."""
+        while self._queue:
+            head = self._queue[0]
+            if head.future.done():
+                # Cancelled while waiting
+                heapq.heappop(self._queue)
+                continue
+            if not self._can_start(head.memory_estimate):
+                break
+            heapq.heappop(self._queue)
+            self._queued -= 1
+            self._start(head.memory_estimate)
+            head.future.set_result(None)
@@ -0,0 +1,139 @@
+"""Per-session output workspaces for network transports."""
+
+import shutil
+import threading
+import uuid
+import weakref
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+# Arguments of read-side tools that name an output location
+OUTPUT_DIR_ARGUMENTS: Dict[str, tuple] = {
+    "xl2times_query": ("output_dir",),
+    "xl2times_raw_tables": ("path",),
+    "xl2times_provenance": ("output_dir",),
+}
+
+# Tools that start server-wide background work; configured by the operator, not by sessions
+ADMIN_TOOLS = ("xl2times_watch",)
+
+# Session of the tool call being handled, inherited by the tasks it starts;
+# None on stdio and for work the server starts itself
+current_session: ContextVar[Optional[str]] = ContextVar("xl2times_session", default=None)
+
+
+class SessionWorkspaces:
+    """
+    Gives every client session its own directory under ``root``.
+
+    When one server process serves many sessions, output locations in tool
+    arguments are resolved inside the calling session's workspace: relative
+    paths are joined to it, absolute paths must already lie inside it, and a
+    run without ``output_dir`` writes to ``<workspace>/output``. Sessions can
+    therefore neither overwrite nor read each other's converted tables.
+    Input workbooks (for xl2times_run and xl2times_scan alike) are read where
+    they are, result cache keys are only accepted from the session whose run
+    returned them, and admin tools are refused. A workspace is deleted once
+    its session object is closed and released.
+    """
+
+    def __init__(self, root: Path):
+        """Initialize workspaces under ``root``; directories are created on first use."""
+        self.root = Path(root)
+        self._ids: "weakref.WeakKeyDictionary[Any, str]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._cache_keys: Dict[str, Set[str]] = {}
+
+    def session_id(self, session: Any) -> str:
+        """Return a stable ID for a live session object."""
+        with self._lock:
+            session_id = self._ids.get(session)
+            if session_id is None:
+                session_id = self._ids[session] = uuid.uuid4().hex[:16]
+                weakref.finalize(session, self.release, session_id)
+            return session_id
+
+    def release(self, session_id: str) -> None:
+        """Delete a closed session's workspace and forget its cache keys."""
+        with self._lock:
+            self._cache_keys.pop(session_id, None)
+        shutil.rmtree(self.root / session_id, ignore_errors=True)
+
+    def workspace(self, session_id: str) -> Path:
+        """Return the session's workspace directory, creating it if needed."""
+        path = self.root / session_id
+        path.mkdir(parents=True, exist_ok=True)
+        return path.resolve()
+
+    def resolve(self, session_id: str, value: str) -> str:
+        """
+        Resolve an output path inside the session's workspace.
+
+        Raises:
+            ValueError: If the path points outside the workspace
+        """
+        workspace = self.workspace(session_id)
+        path = Path(value)
+        resolved = (path if path.is_absolute() else workspace / path).resolve()
+        if not resolved.is_relative_to(workspace):
+            raise ValueError(f"{value} is outside this session's workspace {workspace}")
+        return str(resolved)
+
+    def remember_cache_key(self, session_id: str, key: str) -> None:
+        """Record a result cache key returned to the session, so it may pass it to xl2times_diff."""
+        with self._lock:
+            self._cache_keys.setdefault(session_id, set()).add(key)
+
+    def scope_arguments(self, tool: str, arguments: Dict[str, Any], session_id: str) -> Dict[str, Any]:
+        """
+        Return a copy of a tool's arguments with its output locations resolved for the session.
+
+        Raises:
+            ValueError: If a path is outside the workspace, a cache key was not
+                returned to this session, or the tool is an admin tool
+        """
+        if tool in ADMIN_TOOLS:
+            raise ValueError(f"{tool} is not available to network sessions; the server operator configures it")
+        scoped = dict(arguments)
+        if tool in ("xl2times_run", "xl2times_submit"):
+            scoped["output_dir"] = self.resolve(session_id, scoped.get("output_dir") or "output")
+        elif tool == "xl2times_batch":
+            defaults = dict(scoped.get("defaults") or {})
+            if defaults.get("output_dir"):
+                defaults["output_dir"] = self.resolve(session_id, defaults["output_dir"])
+            scoped["defaults"] = defaults
+            models = []
+            for i, model in enumerate(scoped.get("models") or []):
+                model = dict(model)
+                # Models inheriting defaults.output_dir get their subdirectory from the batch handler
+                if model.get("output_dir") or not defaults.get("output_dir"):
+                    model["output_dir"] = self.resolve(session_id, model.get("output_dir") or f"batch/{i}")
+                models.append(model)
+            scoped["models"] = models
+        elif tool == "xl2times_diff":
+            for key in ("a", "b"):
+                value = scoped.get(key)
+                if not value:
+                    continue
+                if self._is_path(session_id, value):
+                    scoped[key] = self.resolve(session_id, value)
+                else:
+                    self._check_cache_key(session_id, value)
+        else:
+            for key in OUTPUT_DIR_ARGUMENTS.get(tool, ()):
+                if scoped.get(key):
+                    scoped[key] = self.resolve(session_id, scoped[key])
+        return scoped
+
+    def _check_cache_key(self, session_id: str, value: str) -> None:
+        """Reject a cache key (or prefix) that matches no run returned to the session."""
+        with self._lock:
+            owned = self._cache_keys.get(session_id, set())
+            if not any(key.startswith(value) for key in owned):
+                raise ValueError(f"{value} is not the cache key of a run in this session")
+
+    def _is_path(self, session_id: str, value: str) -> bool:
+        """Tell an output directory apart from a cache key in xl2times_diff arguments."""
+        path = Path(value)
+        return path.is_absolute() or len(path.parts) > 1 or (self.workspace(session_id) / path).exists()
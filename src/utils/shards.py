@@ -0,0 +1,185 @@
+"""Helpers for running xl2times on region groups and merging the results."""
+
+import csv
+import io
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .columnar import find_csv_outputs
+from .file_manager import hash_file
+from .provenance import MERGED_TABLES_FILE
+from .raw_tables import get_raw_tables_index
+
+
+def split_regions(
+    regions: List[str], shards: int, links: Optional[List[Tuple[str, str]]] = None
+) -> List[List[str]]:
+    """
+    Deal regions into at most ``shards`` non-empty groups.
+
+    Regions joined by a trade link are kept in the same group, since xl2times
+    drops links to regions outside ``--regions``. Each set of linked regions
+    goes to the group with the fewest regions so far, which deals unlinked
+    regions round-robin.
+    """
+    parent = {region: region for region in regions}
+
+    def find(region: str) -> str:
+        while parent[region] != region:
+            parent[region] = parent[parent[region]]
+            region = parent[region]
+        return region
+
+    for a, b in links or []:
+        if a in parent and b in parent:
+            parent[find(b)] = find(a)
+
+    components: Dict[str, List[str]] = {}
+    for region in regions:
+        components.setdefault(find(region), []).append(region)
+
+    shards = max(1, min(shards, len(components)))
+    groups: List[List[str]] = [[] for _ in range(shards)]
+    for component in components.values():
+        min(groups, key=len).extend(component)
+    return groups
+
+
+def regions_from_raw_tables(raw_tables_path: Path) -> List[str]:
+    """Return the model regions declared in the ``~BookRegions_Map`` tables of raw_tables.txt."""
+    index = get_raw_tables_index(raw_tables_path)
+    tables = [t for t in index.tables if t.tag.lower() == "~bookregions_map"]
+
+    regions: List[str] = []
+    for text, _ in index.read(tables):
+        reader = csv.DictReader(io.StringIO(text))
+        for row in reader:
+            region = (row.get("Region") or row.get("REGION") or "").strip()
+            if region and region not in regions:
+                regions.append(region)
+    return regions
+
+
+def trade_links_from_raw_tables(raw_tables_path: Path) -> List[Tuple[str, str]]:
+    """
+    Return the region pairs joined by ``~TradeLinks`` tables in raw_tables.txt.
+
+    Matrix tables list origin regions in the first column and destination
+    regions as the other column headers; a non-empty cell declares a link.
+    ``~TradeLinks_DINS`` tables name the regions in ``Reg1``/``Reg2`` columns.
+    """
+    index = get_raw_tables_index(raw_tables_path)
+    tables = [
+        t for t in index.tables
+        if t.tag.lower().startswith("~tradelinks") and not t.tag.lower().startswith("~tradelinks_desc")
+    ]
+
+    links: List[Tuple[str, str]] = []
+    for table, (text, _) in zip(tables, index.read(tables)):
+        rows = list(csv.reader(io.StringIO(text)))
+        if not rows:
+            continue
+        header = [cell.strip() for cell in rows[0]]
+
+        if table.tag.lower().startswith("~tradelinks_dins"):
+            columns = {name.lower(): i for i, name in enumerate(header)}
+            if "reg1" not in columns or "reg2" not in columns:
+                continue
+            for row in rows[1:]:
+                a, b = (row[columns[c]].strip() if columns[c] < len(row) else "" for c in ("reg1", "reg2"))
+                if a and b and a != b:
+                    links.append((a, b))
+            continue
+
+        for row in rows[1:]:
+            origin = row[0].strip() if row else ""
+            for destination, cell in zip(header[1:], row[1:]):
+                if origin and destination and origin != destination and cell.strip() not in ("", "0"):
+                    links.append((origin, destination))
+    return links
+
+
+def merge_shard_outputs(
+    shard_dirs: List[Path], output_dir: Path, shard_files: Optional[List[List[str]]] = None
+) -> Dict[str, Any]:
+    """
+    Merge the ``*_output.csv`` tables of several shard runs into ``output_dir``.
+
+    ``shard_files`` lists the files each shard run wrote; when omitted, every
+    table in the shard directories is merged.
+
+    A table whose file is identical in every shard (sets such as ALL_REG, COM,
+    CUR, or any other table that does not depend on the region) is copied
+    byte for byte. Other tables are concatenated in shard order, dropping
+    rows already written by an earlier shard (a shard's own repeated rows
+    are kept). The shards' merged_tables.txt files are concatenated so the
+    provenance index can be built for the merged output; if a shard did not
+    write one, none is written.
+
+    Returns:
+        Counts of copied and merged tables and of duplicate rows removed, and
+        whether merged_tables.txt was written
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    tables: Dict[str, List[Path]] = {}
+    for i, shard_dir in enumerate(shard_dirs):
+        for csv_file in find_csv_outputs(shard_dir, shard_files[i] if shard_files is not None else None):
+            tables.setdefault(csv_file.name, []).append(csv_file)
+
+    identical = 0
+    merged = 0
+    duplicates = 0
+    for name, files in sorted(tables.items()):
+        target = output_dir / name
+        if len(files) == len(shard_dirs) and len({hash_file(f) for f in files}) == 1:
+            shutil.copyfile(files[0], target)
+            identical += 1
+            continue
+
+        earlier = set()
+        header = None
+        with open(target, "w", newline="", encoding="utf-8") as out:
+            for csv_file in files:
+                current = set()
+                with open(csv_file, newline="", encoding="utf-8") as f:
+                    lines = iter(f)
+                    first = next(lines, None)
+                    if first is None:
+                        continue
+                    if header is None:
+                        header = first
+                        out.write(first)
+                    elif first != header:
+                        raise ValueError(f"Shards wrote {name} with different columns")
+                    for line in lines:
+                        if line in earlier:
+                            duplicates += 1
+                            continue
+                        current.add(line)
+                        out.write(line)
+                earlier |= current
+        merged += 1
+
+    sources = []
+    for i, shard_dir in enumerate(shard_dirs):
+        source = shard_dir / MERGED_TABLES_FILE
+        listed = shard_files is None or str(source) in shard_files[i]
+        if listed and source.is_file():
+            sources.append(source)
+    merged_tables_txt = bool(sources) and len(sources) == len(shard_dirs)
+    if merged_tables_txt:
+        with open(output_dir / MERGED_TABLES_FILE, "wb") as out:
+            for source in sources:
+                with open(source, "rb") as f:
+                    shutil.copyfileobj(f, out)
+                out.write(b"\n")
+
+    return {
+        "tables": len(tables),
+        "identical_tables": identical,
+        "merged_tables": merged,
+        "duplicate_rows_removed": duplicates,
+        "merged_tables_txt": merged_tables_txt
+    }
@@ -0,0 +1,113 @@
+"""Structural diff between the converted tables of two xl2times runs."""
+
+import csv
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from .columnar import CSV_SUFFIX, find_csv_outputs
+from .file_manager import hash_file
+
+
+def _parse_value(text: str) -> Any:
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def _load_rows(path: Path, key_columns: List[str]) -> Dict[Tuple[str, ...], Tuple[Any, ...]]:
+    """Map each key to the sorted VALUEs of the rows that have it (None for tables without VALUE)."""
+    grouped: Dict[Tuple[str, ...], List[Any]] = {}
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        key_positions = [header.index(c) for c in key_columns]
+        value_position = header.index("VALUE") if "VALUE" in header else None
+        for row in reader:
+            key = tuple(row[i] if i < len(row) else "" for i in key_positions)
+            value = None
+            if value_position is not None and value_position < len(row):
+                value = _parse_value(row[value_position])
+            grouped.setdefault(key, []).append(value)
+    return {key: tuple(sorted(values, key=repr)) for key, values in grouped.items()}
+
+
+def _read_header(path: Path) -> List[str]:
+    with open(path, newline="", encoding="utf-8") as f:
+        return next(csv.reader(f), [])
+
+
+def diff_tables(a: Path, b: Path, max_samples: int = 20) -> Dict[str, Any]:
+    """
+    Hash-join two versions of one table on its key columns.
+
+    Key columns are all columns except VALUE that both versions share. Rows
+    present in one version only are added/removed; rows whose VALUE differs
+    are changed.
+    """
+    header_a, header_b = _read_header(a), _read_header(b)
+    key_columns = [c for c in header_a if c in header_b and c != "VALUE"]
+
+    rows_a = _load_rows(a, key_columns)
+    rows_b = _load_rows(b, key_columns)
+
+    added = [key for key in rows_b if key not in rows_a]
+    removed = [key for key in rows_a if key not in rows_b]
+    changed = [key for key, values in rows_a.items() if key in rows_b and rows_b[key] != values]
+
+    def _values(values: Tuple[Any, ...]) -> Any:
+        return values[0] if len(values) == 1 else list(values)
+
+    result = {
+        "key_columns": key_columns,
+        "rows_a": sum(len(v) for v in rows_a.values()),
+        "rows_b": sum(len(v) for v in rows_b.values()),
+        "added": len(added),
+        "removed": len(removed),
+        "changed": len(changed),
+        "samples": {
+            "added": [list(key) for key in added[:max_samples]],
+            "removed": [list(key) for key in removed[:max_samples]],
+            "changed": [
+                {"key": list(key), "a": _values(rows_a[key]), "b": _values(rows_b[key])}
+                for key in changed[:max_samples]
+            ]
+        }
+    }
+    if header_a != header_b:
+        result["columns_added"] = [c for c in header_b if c not in header_a]
+        result["columns_removed"] = [c for c in header_a if c not in header_b]
+    return result
+
+
+def diff_output_dirs(a: Path, b: Path, max_samples: int = 20) -> Dict[str, Any]:
+    """
+    Compare every ``*_output.csv`` table of two output directories.
+
+    Tables whose files have the same content hash are counted as unchanged
+    without being parsed.
+    """
+    tables_a = {f.name[:-len(CSV_SUFFIX)]: f for f in find_csv_outputs(a)}
+    tables_b = {f.name[:-len(CSV_SUFFIX)]: f for f in find_csv_outputs(b)}
+
+    unchanged = 0
+    changed = []
+    for name in sorted(tables_a.keys() & tables_b.keys()):
+        path_a, path_b = tables_a[name], tables_b[name]
+        if path_a.stat().st_size == path_b.stat().st_size and hash_file(path_a) == hash_file(path_b):
+            unchanged += 1
+            continue
+        table_diff = diff_tables(path_a, path_b, max_samples)
+        if table_diff["added"] or table_diff["removed"] or table_diff["changed"] or "columns_added" in table_diff:
+            changed.append({"table": name, **table_diff})
+        else:
+            # Same rows in a different order
+            unchanged += 1
+
+    return {
+        "tables_compared": len(tables_a.keys() & tables_b.keys()),
+        "tables_unchanged": unchanged,
+        "tables_added": sorted(tables_b.keys() - tables_a.keys()),
+        "tables_removed": sorted(tables_a.keys() - tables_b.keys()),
+        "tables_changed": changed
+    }
@@ -0,0 +1,180 @@
+"""In-memory, indexed store of a run's converted TIMES tables."""
+
+import csv
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .columnar import CSV_SUFFIX, find_csv_outputs
+
+# Output directories are checked for rewritten tables at most this often (seconds)
+REVALIDATE_INTERVAL = 1.0
+
+# Query dimensions and the TIMES columns they map to, in order of preference
+DIMENSIONS: Dict[str, Tuple[str, ...]] = {
+    "region": ("REG", "ALL_REG", "ALL_R"),
+    "process": ("PRC",),
+    "commodity": ("COM", "C"),
+    "year": ("YEAR", "DATAYEAR"),
+    "timeslice": ("TS", "ALL_TS"),
+}
+INDEXED_COLUMNS = frozenset(column for columns in DIMENSIONS.values() for column in columns)
+
+
+def _parse_value(text: str) -> Any:
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+class Table:
+    """
+    One converted table held column by column.
+
+    Every TIMES dimension column (region, process, commodity, year, timeslice)
+    gets a hash index from value to row numbers, so filters on them never scan.
+    """
+
+    def __init__(self, name: str, columns: List[str], rows: Iterable[List[str]]):
+        """Load ``rows`` (lists of CSV strings) into columns and build the indexes."""
+        self.name = name
+        self.columns = columns
+        self.data: Dict[str, List[Any]] = {column: [] for column in columns}
+
+        appenders = [self.data[column].append for column in columns]
+        value_position = columns.index("VALUE") if "VALUE" in columns else -1
+        for row in rows:
+            for position, (append, text) in enumerate(zip(appenders, row)):
+                append(_parse_value(text) if position == value_position else text)
+        self.num_rows = len(self.data[columns[0]]) if columns else 0
+
+        self.indexes: Dict[str, Dict[str, List[int]]] = {}
+        for column in columns:
+            if column in INDEXED_COLUMNS:
+                index: Dict[str, List[int]] = {}
+                for row_number, value in enumerate(self.data[column]):
+                    index.setdefault(value, []).append(row_number)
+                self.indexes[column] = index
+
+    def dimension_column(self, dimension: str) -> Optional[str]:
+        """Return this table's column for a query dimension, if it has one."""
+        return next((c for c in DIMENSIONS[dimension] if c in self.data), None)
+
+    def select(
+        self, filters: Dict[str, List[str]], columns: Optional[List[str]] = None, limit: Optional[int] = None
+    ) -> Tuple[List[str], List[List[Any]], int]:
+        """
+        Return rows matching every filter.
+
+        Args:
+            filters: Column name to accepted values
+            columns: Columns to return (all columns if not given)
+            limit: Maximum number of rows to return
+
+        Returns:
+            (column names, rows, number of matching rows)
+        """
+        columns = [c for c in columns if c in self.data] if columns else self.columns
+
+        matched: Optional[List[int]] = None
+        scans = []
+        # Intersect indexed filters starting from the most selective
+        candidates = []
+        for column, values in filters.items():
+            index = self.indexes.get(column)
+            if index is None:
+                scans.append((column, {_parse_value(v) if column == "VALUE" else v for v in values}))
+                continue
+            rows: List[int] = []
+            for value in values:
+                rows.extend(index.get(value, ()))
+            candidates.append(rows)
+
+        for rows in sorted(candidates, key=len):
+            if matched is None:
+                matched = sorted(rows)
+            else:
+                keep = set(rows)
+                matched = [row for row in matched if row in keep]
+            if not matched:
+                break
+
+        if matched is None:
+            matched = range(self.num_rows)
+        for column, values in scans:
+            data = self.data[column]
+            matched = [row for row in matched if data[row] in values]
+
+        total = len(matched)
+        if limit is not None:
+            matched = matched[:limit]
+        selected = [self.data[c] for c in columns]
+        return columns, [[data[row] for data in selected] for row in matched], total
+
+
+class TableStore:
+    """All ``*_output.csv`` tables of one output directory."""
+
+    def __init__(self, output_dir: Path):
+        """Load every table in ``output_dir``."""
+        self.output_dir = Path(output_dir)
+        self.tables: Dict[str, Table] = {}
+        self.signature = self._signature()
+        self.checked_at = time.monotonic()
+
+        for csv_file in find_csv_outputs(self.output_dir):
+            with open(csv_file, newline="", encoding="utf-8") as f:
+                reader = csv.reader(f)
+                header = next(reader, [])
+                name = csv_file.name[:-len(CSV_SUFFIX)]
+                self.tables[name] = Table(name, header, reader)
+
+    def is_current(self) -> bool:
+        """Return True if no output table was added, removed or rewritten since loading."""
+        return self._signature() == self.signature
+
+    def _signature(self) -> Tuple[Tuple[str, int, int], ...]:
+        signature = []
+        for csv_file in find_csv_outputs(self.output_dir):
+            stat = csv_file.stat()
+            signature.append((csv_file.name, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+
+class TableStoreCache:
+    """Keeps the stores of the most recently queried output directories."""
+
+    def __init__(self, max_entries: int):
+        """Initialize an empty cache holding at most ``max_entries`` stores."""
+        self.max_entries = max(1, max_entries)
+        self._stores: "OrderedDict[str, TableStore]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.evictions = 0
+
+    def get(self, output_dir: Path) -> TableStore:
+        """Return the store for ``output_dir``, loading it if missing or stale."""
+        key = str(Path(output_dir).resolve())
+        with self._lock:
+            store = self._stores.get(key)
+            if store is not None and time.monotonic() - store.checked_at >= REVALIDATE_INTERVAL:
+                if store.is_current():
+                    store.checked_at = time.monotonic()
+                else:
+                    store = None
+            if store is not None:
+                self._stores.move_to_end(key)
+                return store
+
+        store = TableStore(Path(output_dir))
+        with self._lock:
+            self.loads += 1
+            self._stores[key] = store
+            self._stores.move_to_end(key)
+            while len(self._stores) > self.max_entries:
+                self._stores.popitem(last=False)
+                self.evictions += 1
+        return store
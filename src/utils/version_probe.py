@@ -0,0 +1,132 @@
+"""Asynchronous, cached detection of the installed xl2times version."""
+
+import asyncio
+import re
+import shutil
+import time
+from typing import List, Optional, Tuple
+
+from loguru import logger
+
+# Anchored on the program name so launcher output such as uvx's
+# "Downloading pandas (11.7MiB)" is never taken for a version
+_VERSION = re.compile(r"xl2times\S*\s+v?(\d+\.\d+(?:\.\d+)*)")
+
+# Reads the installed package version, for xl2times releases without --version
+_METADATA_SCRIPT = "import importlib.metadata as m; print('xl2times', m.version('xl2times'))"
+
+# A failed probe is retried sooner than a successful one is refreshed, so
+# installing xl2times is noticed without restarting the server
+UNAVAILABLE_TTL = 60.0
+
+
+class VersionProbe:
+    """
+    Runs ``<command> --version`` without blocking the event loop and caches the
+    parsed version for ``ttl`` seconds. xl2times releases without a
+    ``--version`` flag are asked for their package metadata through
+    ``python_command``, an interpreter that can import xl2times.
+
+    The cached value is keyed by the command and the executable it resolves to
+    on PATH, so changing XL2TIMES_COMMAND or installing a different executable
+    invalidates it. Concurrent callers share a single probe.
+    """
+
+    def __init__(self, ttl: float, timeout: float = 30, python_command: Optional[List[str]] = None):
+        """
+        Initialize the probe.
+
+        Args:
+            ttl: Seconds a detected version stays valid
+            timeout: Seconds to wait for each probe command
+            python_command: Interpreter command used to read the package version
+        """
+        self.ttl = ttl
+        self.timeout = timeout
+        self.python_command = python_command
+        self._key: Optional[Tuple[Tuple[str, ...], Optional[str]]] = None
+        self._version: Optional[str] = None
+        self._expires = 0.0
+        self._lock = asyncio.Lock()
+        self._warm_task: Optional[asyncio.Task] = None
+
+    async def get(self, command: List[str]) -> Optional[str]:
+        """
+        Return the xl2times version.
+
+        Returns:
+            Version number, "unknown" if xl2times runs but reports no version,
+            or None if it is not available
+        """
+        key = (tuple(command), shutil.which(command[0]) if command else None)
+        if self._is_fresh(key):
+            return self._version
+
+        async with self._lock:
+            if self._is_fresh(key):
+                return self._version
+
+            version = await self._probe(command)
+            self._key = key
+            self._version = version
+            self._expires = time.monotonic() + (self.ttl if version is not None else min(self.ttl, UNAVAILABLE_TTL))
+            return version
+
+    def warm(self, command: List[str]) -> None:
+        """Start probing in the background if an event loop is running."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._warm_task = loop.create_task(self.get(command))
+
+    def invalidate(self) -> None:
+        """Forget the cached version."""
+        self._key = None
+        self._expires = 0.0
+
+    def _is_fresh(self, key: Tuple[Tuple[str, ...], Optional[str]]) -> bool:
+        return self._key == key and time.monotonic() < self._expires
+
+    async def _probe(self, command: List[str]) -> Optional[str]:
+        """Run ``--version`` (falling back to package metadata, then ``--help``) and parse its stdout."""
+        return_code, output = await self._run(command + ["--version"])
+        match = _VERSION.search(output) if return_code == 0 else None
+        if match:
+            return match.group(1)
+
+        # xl2times has no --version flag; ask the installed package instead
+        if self.python_command:
+            metadata_code, metadata = await self._run(self.python_command + ["-c", _METADATA_SCRIPT])
+            match = _VERSION.search(metadata) if metadata_code == 0 else None
+            if match:
+                return match.group(1)
+
+        if return_code != 0:
+            return_code, _ = await self._run(command + ["--help"])
+        if return_code == 0:
+            return "unknown"
+
+        logger.warning(f"xl2times is not available: {' '.join(command)}")
+        return None
+
+    async def _run(self, cmd: List[str]) -> Tuple[Optional[int], str]:
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+        except OSError as e:
+            logger.warning(f"Could not run {' '.join(cmd)}: {e}")
+            return None, ""
+
+        try:
+            stdout, _ = await asyncio.wait_for(process.communicate(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            logger.warning(f"{' '.join(cmd)} timed out after {self.timeout} seconds")
+            return None, ""
+
+        return process.returncode, stdout.decode("utf-8", errors="replace")
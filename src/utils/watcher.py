@@ -0,0 +1,193 @@
+"""Debounced change notification for workbooks under model directories."""
+
+import asyncio
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from loguru import logger
+
+from .file_manager import find_input_workbooks, is_workbook
+
+# inotify(7) event flags
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+_WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+_EVENT = struct.Struct("iIII")
+
+
+def _load_inotify():
+    """Return libc with inotify, or None where it is not available."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    return libc if hasattr(libc, "inotify_init1") else None
+
+
+def workbook_signature(directory: Path) -> Dict[str, Tuple[int, int]]:
+    """Return (mtime_ns, size) of every workbook under ``directory``."""
+    signature = {}
+    for name, path in find_input_workbooks(str(directory)) or []:
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        signature[name] = (stat.st_mtime_ns, stat.st_size)
+    return signature
+
+
+class WorkbookWatcher:
+    """
+    Calls back once the workbooks under a registered directory stop changing.
+
+    Uses inotify on Linux, reading events on the event loop, and falls back to
+    polling workbook mtimes and sizes elsewhere (or when a watch cannot be
+    added). Only xlsx/xlsm files count: Excel's ``~$`` lock files and the
+    temporary files it writes before renaming over a workbook are ignored.
+    The callback runs ``debounce`` seconds after the last change.
+    """
+
+    def __init__(
+        self,
+        on_change: Callable[[Path], None],
+        debounce: float,
+        poll_interval: float,
+        use_inotify: bool = True
+    ):
+        """Initialize the watcher; nothing is watched until ``add`` is called."""
+        self.on_change = on_change
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self._libc = _load_inotify() if use_inotify else None
+        self._fd: Optional[int] = None
+        self._watches: Dict[int, Tuple[Path, Path]] = {}  # wd -> (root, directory)
+        self._polled: Dict[Path, Dict[str, Tuple[int, int]]] = {}
+        self._poll_task: Optional[asyncio.Task] = None
+        self._timers: Dict[Path, asyncio.TimerHandle] = {}
+
+    def backend(self, root: Path) -> str:
+        """How ``root`` is watched: ``inotify`` or ``polling``."""
+        return "polling" if root in self._polled else "inotify"
+
+    def add(self, root: Path) -> None:
+        """Start watching ``root`` and its subdirectories."""
+        if self._libc is None or not self._add_tree(root, root):
+            self._start_polling(root)
+
+    def remove(self, root: Path) -> None:
+        """Stop watching ``root``."""
+        self._polled.pop(root, None)
+        timer = self._timers.pop(root, None)
+        if timer is not None:
+            timer.cancel()
+        for wd, (watch_root, _) in list(self._watches.items()):
+            if watch_root == root:
+                self._libc.inotify_rm_watch(self._fd, wd)
+                self._watches.pop(wd, None)
+
+    def close(self) -> None:
+        """Stop all watches and pending callbacks."""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            self._poll_task = None
+        self._polled.clear()
+        if self._fd is not None:
+            asyncio.get_running_loop().remove_reader(self._fd)
+            os.close(self._fd)
+            self._fd = None
+            self._watches.clear()
+
+    def _add_tree(self, root: Path, directory: Path) -> bool:
+        """Watch ``directory`` and every directory below it; False if inotify is unusable."""
+        if self._fd is None:
+            fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd < 0:
+                logger.warning(f"inotify unavailable: {os.strerror(ctypes.get_errno())}")
+                self._libc = None
+                return False
+            self._fd = fd
+            asyncio.get_running_loop().add_reader(fd, self._read_events)
+
+        for current, subdirs, _ in os.walk(directory):
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(current), _WATCH_MASK)
+            if wd < 0:
+                # Usually fs.inotify.max_user_watches; poll this tree instead
+                logger.warning(f"Cannot watch {current}: {os.strerror(ctypes.get_errno())}")
+                self.remove(root)
+                return False
+            self._watches[wd] = (root, Path(current))
+            subdirs[:] = [d for d in subdirs if not d.startswith(".")]
+        return True
+
+    def _read_events(self) -> None:
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return
+
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0").decode("utf-8", "surrogateescape")
+            offset += length
+
+            watch = self._watches.get(wd)
+            if watch is None:
+                continue
+            root, directory = watch
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+            elif mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and not name.startswith("."):
+                    if not self._add_tree(root, directory / name):
+                        self._start_polling(root)
+                    self._schedule(root)  # a moved-in directory may bring workbooks
+            elif name and is_workbook(Path(name)):
+                self._schedule(root)
+
+    def _start_polling(self, root: Path) -> None:
+        logger.info(f"Polling {root} for workbook changes every {self.poll_interval}s")
+        self._polled[root] = workbook_signature(root)
+        if self._poll_task is None:
+            self._poll_task = asyncio.get_running_loop().create_task(self._poll())
+
+    async def _poll(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            for root, before in list(self._polled.items()):
+                after = await asyncio.to_thread(workbook_signature, root)
+                if root in self._polled and after != before:
+                    self._polled[root] = after
+                    self._schedule(root)
+
+    def _schedule(self, root: Path) -> None:
+        """(Re)start the debounce timer of ``root``."""
+        timer = self._timers.pop(root, None)
+        if timer is not None:
+            timer.cancel()
+        self._timers[root] = asyncio.get_running_loop().call_later(self.debounce, self._fire, root)
+
+    def _fire(self, root: Path) -> None:
+        self._timers.pop(root, None)
+        try:
+            self.on_change(root)
+        except Exception as e:
+            logger.error(f"Watch callback for {root} failed: {e}")
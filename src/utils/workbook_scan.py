@@ -0,0 +1,272 @@
+"""Streaming scan of VEDA workbooks for tags, table ranges and regions, without xl2times."""
+
+import posixpath
+import re
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from xml.parsers import expat
+
+REGION_MAP_TAG = "~BOOKREGIONS_MAP"
+
+_CELL_REF = re.compile(r"([A-Z]+)(\d*)")
+_READ_CHUNK = 64 * 1024
+
+
+def column_letters(index: int) -> str:
+    """Convert a 1-based column index to letters."""
+    letters = ""
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _column_index(letters: str) -> int:
+    index = 0
+    for letter in letters:
+        index = index * 26 + ord(letter) - 64
+    return index
+
+
+def _local(name: str) -> str:
+    return name.rsplit(":", 1)[-1]
+
+
+def _parse(stream, start=None, end=None, text=None) -> None:
+    """Run expat over a file-like object chunk by chunk with the given callbacks."""
+    parser = expat.ParserCreate()
+    parser.buffer_text = True
+    if start:
+        parser.StartElementHandler = start
+    if end:
+        parser.EndElementHandler = end
+    if text:
+        parser.CharacterDataHandler = text
+    while chunk := stream.read(_READ_CHUNK):
+        parser.Parse(chunk, False)
+    parser.Parse(b"", True)
+
+
+def _shared_strings(archive: zipfile.ZipFile, path: str) -> List[str]:
+    """Read the shared string table, skipping phonetic runs."""
+    strings: List[str] = []
+    state = {"parts": None, "in_t": False, "phonetic": 0}
+
+    def start(name, attrs):
+        name = _local(name)
+        if name == "si":
+            state["parts"] = []
+        elif name == "rPh":
+            state["phonetic"] += 1
+        elif name == "t" and not state["phonetic"]:
+            state["in_t"] = True
+
+    def end(name):
+        name = _local(name)
+        if name == "si":
+            strings.append("".join(state["parts"]))
+            state["parts"] = None
+        elif name == "rPh":
+            state["phonetic"] -= 1
+        elif name == "t":
+            state["in_t"] = False
+
+    def text(data):
+        if state["in_t"] and state["parts"] is not None:
+            state["parts"].append(data)
+
+    with archive.open(path) as f:
+        _parse(f, start, end, text)
+    return strings
+
+
+def _sheets(archive: zipfile.ZipFile) -> List[tuple]:
+    """Return (sheet name, archive path) in workbook order."""
+    targets: Dict[str, str] = {}
+
+    def rel(name, attrs):
+        if _local(name) == "Relationship":
+            target = attrs.get("Target", "")
+            targets[attrs.get("Id")] = target.lstrip("/") if target.startswith("/") else posixpath.join("xl", target)
+
+    with archive.open("xl/_rels/workbook.xml.rels") as f:
+        _parse(f, rel)
+
+    sheets = []
+
+    def sheet(name, attrs):
+        if _local(name) == "sheet":
+            rel_id = next((v for k, v in attrs.items() if _local(k) == "id"), None)
+            if rel_id in targets:
+                sheets.append((attrs.get("name", ""), posixpath.normpath(targets[rel_id])))
+
+    with archive.open("xl/workbook.xml") as f:
+        _parse(f, sheet)
+    return sheets
+
+
+class _SheetScanner:
+    """
+    Finds VEDA tables in one worksheet as its rows stream past.
+
+    A table starts at a cell whose text begins with ``~``. Its header is the
+    run of non-empty cells on the next row and its data continues until a row
+    with nothing under the header. Only the current row is held in memory,
+    plus the rows of ~BookRegions_Map tables.
+    """
+
+    def __init__(self, name: str, shared: List[str]):
+        self.name = name
+        self.shared = shared
+        self.tables: List[Dict[str, Any]] = []
+        self.problems: List[str] = []
+        self._pending: List[Dict[str, Any]] = []
+        self._open: List[Dict[str, Any]] = []
+        self._row = 0
+        self._cells: Dict[int, str] = {}
+        self._cell: Optional[Dict[str, Any]] = None
+        self._text: Optional[List[str]] = None
+
+    def start(self, name, attrs):
+        name = _local(name)
+        if name == "row":
+            self._row = int(attrs["r"]) if "r" in attrs else self._row + 1
+            self._cells = {}
+        elif name == "c":
+            match = _CELL_REF.match(attrs.get("r", ""))
+            column = _column_index(match.group(1)) if match else max(self._cells, default=0) + 1
+            self._cell = {"column": column, "type": attrs.get("t", "n"), "value": ""}
+        elif name in ("v", "t") and self._cell is not None:
+            self._text = []
+
+    def end(self, name):
+        name = _local(name)
+        if name in ("v", "t") and self._cell is not None and self._text is not None:
+            self._cell["value"] += "".join(self._text)
+            self._text = None
+        elif name == "c" and self._cell is not None:
+            cell, self._cell = self._cell, None
+            value = cell["value"]
+            if cell["type"] == "s" and value:
+                value = self.shared[int(value)] if int(value) < len(self.shared) else ""
+            value = value.strip()
+            if value:
+                self._cells[cell["column"]] = value
+        elif name == "row":
+            self._process_row(self._row, self._cells)
+
+    def text(self, data):
+        if self._text is not None:
+            self._text.append(data)
+
+    def finish(self) -> None:
+        """Close the tables still open at the end of the sheet."""
+        for table in self._open:
+            self._close(table)
+        for pending in self._pending:
+            self._headerless(pending)
+        self._open, self._pending = [], []
+
+    def _process_row(self, row: int, cells: Dict[int, str]) -> None:
+        # Rows missing from the XML are empty, which ends tables and orphans tags
+        for table in [t for t in self._open if row > t["last_row"] + 1]:
+            self._open.remove(table)
+            self._close(table)
+        for pending in [p for p in self._pending if row > p["row"] + 1]:
+            self._pending.remove(pending)
+            self._headerless(pending)
+
+        for table in list(self._open):
+            values = [cells.get(c, "") for c in range(table["column"], table["column"] + len(table["header"]))]
+            if any(values):
+                table["rows"] += 1
+                table["last_row"] = row
+                if table["data"] is not None:
+                    table["data"].append(values)
+            else:
+                self._open.remove(table)
+                self._close(table)
+
+        for pending in [p for p in self._pending if p["row"] + 1 == row]:
+            self._pending.remove(pending)
+            header = []
+            column = pending["column"]
+            while column in cells:
+                header.append(cells[column])
+                column += 1
+            if not header:
+                self._headerless(pending)
+                continue
+            self._open.append({
+                **pending,
+                "header": header,
+                "header_row": row,
+                "last_row": row,
+                "rows": 0,
+                "data": [] if pending["tag"].upper() == REGION_MAP_TAG else None
+            })
+
+        for column, value in sorted(cells.items()):
+            if value.startswith("~"):
+                self._pending.append({"tag": value.split(":")[0].strip(), "row": row, "column": column})
+
+    def _close(self, table: Dict[str, Any]) -> None:
+        first = column_letters(table["column"])
+        last = column_letters(table["column"] + len(table["header"]) - 1)
+        entry = {
+            "tag": table["tag"],
+            "range": f"{first}{table['header_row']}:{last}{table['last_row']}",
+            "columns": len(table["header"]),
+            "rows": table["rows"]
+        }
+        if table["data"] is not None:
+            columns = [h.lower() for h in table["header"]]
+            if "region" in columns:
+                entry["regions"] = [row[columns.index("region")] for row in table["data"] if row[columns.index("region")]]
+        self.tables.append(entry)
+
+    def _headerless(self, pending: Dict[str, Any]) -> None:
+        self.problems.append(
+            f"{self.name}!{column_letters(pending['column'])}{pending['row']}: "
+            f"{pending['tag']} has no header row below it"
+        )
+
+
+def scan_workbook(path: str) -> Dict[str, Any]:
+    """
+    Scan one xlsx/xlsm workbook for VEDA tables.
+
+    Sheets are streamed through expat, so memory holds the shared strings and
+    one row at a time rather than the workbook.
+
+    Returns:
+        File name and size, tables per sheet (tag, range, columns, rows),
+        regions from ~BookRegions_Map tables and any problems found
+    """
+    path = Path(path)
+    result: Dict[str, Any] = {
+        "file": str(path),
+        "size_bytes": path.stat().st_size,
+        "sheets": [],
+        "regions": [],
+        "problems": []
+    }
+    try:
+        with zipfile.ZipFile(path) as archive:
+            names = set(archive.namelist())
+            shared = _shared_strings(archive, "xl/sharedStrings.xml") if "xl/sharedStrings.xml" in names else []
+            for sheet_name, sheet_path in _sheets(archive):
+                if sheet_path not in names:
+                    continue  # chart sheets and missing parts
+                scanner = _SheetScanner(sheet_name, shared)
+                with archive.open(sheet_path) as f:
+                    _parse(f, scanner.start, scanner.end, scanner.text)
+                scanner.finish()
+                result["sheets"].append({"name": sheet_name, "tables": scanner.tables})
+                result["problems"].extend(scanner.problems)
+                for table in scanner.tables:
+                    result["regions"].extend(table.pop("regions", []))
+    except (zipfile.BadZipFile, KeyError, expat.ExpatError, ValueError) as e:
+        result["problems"].append(f"Could not read {path.name}: {e}")
+    return result
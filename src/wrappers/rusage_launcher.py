@@ -0,0 +1,79 @@
+"""Run a command and record its resource usage.
+
+Usage::
+
+    python rusage_launcher.py RUSAGE_FILE COMMAND [ARGS...]
+
+The command inherits stdin, stdout and stderr. Once it exits, its CPU time
+and peak RSS, as reported by ``os.wait4``, are written to ``RUSAGE_FILE`` as
+JSON and the launcher exits with the command's return code (or re-raises the
+signal that killed it). SIGTERM and SIGINT are forwarded to the command.
+
+Like ``xl2times_worker.py`` this script only uses the standard library, so it
+can be started with any interpreter.
+"""
+
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+
+def _max_rss_mb(max_rss: int) -> float:
+    """Convert ``ru_maxrss`` (kilobytes on Linux, bytes on macOS) to MB."""
+    if sys.platform == "darwin":
+        return max_rss / (1024 * 1024)
+    return max_rss / 1024
+
+
+def main(argv) -> int:
+    """Run ``argv[1:]``, write its rusage to ``argv[0]`` and return its exit status."""
+    if len(argv) < 2:
+        print("usage: rusage_launcher.py RUSAGE_FILE COMMAND [ARGS...]", file=sys.stderr)
+        return 2
+
+    rusage_file, command = argv[0], argv[1:]
+    start = time.perf_counter()
+    try:
+        child = subprocess.Popen(command)
+    except OSError as e:
+        print(f"{command[0]}: {e}", file=sys.stderr)
+        return 127
+
+    def forward(signum, frame):
+        try:
+            os.kill(child.pid, signum)
+        except ProcessLookupError:
+            pass
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+
+    while True:
+        try:
+            _, status, rusage = os.wait4(child.pid, 0)
+            break
+        except InterruptedError:
+            continue
+    wall_time = time.perf_counter() - start
+    # The child is reaped; stop Popen from trying again
+    child.returncode = os.waitstatus_to_exitcode(status)
+
+    with open(rusage_file, "w", encoding="utf-8") as f:
+        json.dump({
+            "cpu_user": round(rusage.ru_utime, 3),
+            "cpu_system": round(rusage.ru_stime, 3),
+            "max_rss_mb": round(_max_rss_mb(rusage.ru_maxrss), 1),
+            "wall_time": round(wall_time, 3)
+        }, f)
+
+    if child.returncode < 0:
+        signal.signal(-child.returncode, signal.SIG_DFL)
+        os.kill(os.getpid(), -child.returncode)
+    return child.returncode
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,220 @@
+"""Pool of warm xl2times worker processes."""
+
+import asyncio
+import itertools
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from loguru import logger
+
+WORKER_SCRIPT = Path(__file__).with_name("xl2times_worker.py")
+
+
+class WorkerPoolError(Exception):
+    """Exception raised when the worker pool cannot serve a job."""
+    pass
+
+
+class _Worker:
+    """A single long-lived worker process."""
+
+    def __init__(self, process: asyncio.subprocess.Process):
+        self.process = process
+        self.jobs = 0
+        self.rss_mb = 0.0
+
+    @property
+    def alive(self) -> bool:
+        return self.process.returncode is None
+
+    def kill(self) -> None:
+        if self.alive:
+            self.process.kill()
+
+
+class WorkerPool:
+    """
+    Keeps ``size`` xl2times worker processes alive and hands jobs to idle ones.
+
+    Each worker imports xl2times once, so a job only pays for the conversion itself
+    instead of uvx environment resolution, interpreter startup and pandas imports.
+    Workers are recycled after ``max_jobs`` jobs or once their RSS exceeds
+    ``max_rss_mb``.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        command: List[str],
+        max_jobs: int = 50,
+        max_rss_mb: int = 2048,
+        startup_timeout: float = 120
+    ):
+        """Initialize the pool. Workers are started lazily on first use."""
+        self.size = size
+        self.command = command
+        self.max_jobs = max_jobs
+        self.max_rss_mb = max_rss_mb
+        self.startup_timeout = startup_timeout
+        self.available = True
+
+        self._idle: Optional[asyncio.Queue] = None
+        self._workers: Set[_Worker] = set()
+        self._capacity = 0
+        self._job_ids = itertools.count(1)
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def run(
+        self, argv: List[str], output_file: str, cwd: str, timeout: float, stats: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """
+        Run xl2times with ``argv`` on an idle worker.
+
+        Args:
+            argv: xl2times arguments (without the command itself)
+            output_file: File that receives the combined stdout/stderr of the job
+            cwd: Working directory for the job
+            timeout: Seconds to wait for the job before killing the worker
+            stats: Optional dictionary filled with the seconds spent waiting for
+                a worker (``acquire_time``) and the job's ``cpu_user``,
+                ``cpu_system`` and peak ``max_rss_mb`` and the worker's ``rss_mb``
+                as reported by the worker
+
+        Returns:
+            The xl2times return code
+
+        Raises:
+            WorkerPoolError: If no worker could be started
+            asyncio.TimeoutError: If the job did not finish within ``timeout``
+        """
+        self._ensure_started()
+        acquire_start = time.perf_counter()
+        worker = await self._acquire()
+        acquire_time = time.perf_counter() - acquire_start
+
+        job = {"id": next(self._job_ids), "argv": argv, "output_file": output_file, "cwd": cwd}
+        try:
+            worker.process.stdin.write((json.dumps(job) + "\n").encode("utf-8"))
+            await worker.process.stdin.drain()
+            line = await asyncio.wait_for(worker.process.stdout.readline(), timeout=timeout)
+        except BaseException:
+            # Timeout, cancellation or a broken pipe: the worker is in an unknown
+            # state, so throw it away and start a fresh one.
+            self._retire(worker, kill=True)
+            raise
+
+        if not line:
+            self._retire(worker, kill=True)
+            raise WorkerPoolError("xl2times worker exited unexpectedly")
+
+        reply = json.loads(line)
+        if stats is not None:
+            stats["acquire_time"] = acquire_time
+            stats.update({k: v for k, v in reply.items() if k in ("cpu_user", "cpu_system", "rss_mb", "max_rss_mb")})
+        worker.jobs += 1
+        worker.rss_mb = reply.get("rss_mb", 0.0)
+
+        if worker.jobs >= self.max_jobs or worker.rss_mb > self.max_rss_mb:
+            logger.info(
+                f"Recycling xl2times worker {worker.process.pid} "
+                f"after {worker.jobs} jobs ({worker.rss_mb:.0f}MB RSS)"
+            )
+            self._retire(worker)
+        else:
+            self._idle.put_nowait(worker)
+
+        return reply["return_code"]
+
+    async def close(self) -> None:
+        """Stop all workers."""
+        if self._tasks:
+            _, pending = await asyncio.wait(list(self._tasks), timeout=5)
+            for task in pending:
+                task.cancel()
+        for worker in list(self._workers):
+            if worker.alive:
+                worker.process.stdin.close()
+                try:
+                    await asyncio.wait_for(worker.process.wait(), timeout=5)
+                except asyncio.TimeoutError:
+                    worker.kill()
+        self._workers.clear()
+        self._capacity = 0
+
+    def _ensure_started(self) -> None:
+        """Create the idle queue and start workers on first use."""
+        if self._idle is not None:
+            return
+        self._idle = asyncio.Queue()
+        for _ in range(self.size):
+            self._spawn_in_background()
+
+    async def _acquire(self) -> _Worker:
+        """Wait for an idle, live worker."""
+        while True:
+            if self._capacity == 0:
+                self.available = False
+                raise WorkerPoolError("No xl2times workers could be started")
+
+            worker = await self._idle.get()
+            if worker is None:
+                # Wake-up sentinel from a failed spawn; re-check capacity
+                continue
+            if worker.alive:
+                return worker
+            self._retire(worker)
+
+    def _retire(self, worker: _Worker, kill: bool = False) -> None:
+        """Remove a worker from the pool and start a replacement."""
+        if worker in self._workers:
+            self._workers.discard(worker)
+            self._capacity -= 1
+        if kill:
+            worker.kill()
+        elif worker.alive:
+            worker.process.stdin.close()
+        self._track(worker.process.wait())
+        self._spawn_in_background()
+
+    def _spawn_in_background(self) -> None:
+        self._capacity += 1
+        self._track(self._spawn())
+
+    def _track(self, coro) -> None:
+        """Run a coroutine in the background, keeping a reference until it is done."""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _spawn(self) -> None:
+        """Start one worker and add it to the idle queue once it is ready."""
+        process = None
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *self.command, str(WORKER_SCRIPT),
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+            line = await asyncio.wait_for(process.stdout.readline(), timeout=self.startup_timeout)
+            message = json.loads(line) if line else {"error": "worker exited during startup"}
+
+            if not message.get("ready"):
+                raise WorkerPoolError(message.get("error", "worker failed to start"))
+
+        except Exception as e:
+            logger.warning(f"Could not start xl2times worker: {e}")
+            if process is not None:
+                if process.returncode is None:
+                    process.kill()
+                await process.wait()
+            self._capacity -= 1
+            self._idle.put_nowait(None)
+            return
+
+        worker = _Worker(process)
+        self._workers.add(worker)
+        logger.debug(f"xl2times worker {process.pid} ready")
+        self._idle.put_nowait(worker)
@@ -0,0 +1,175 @@
+"""Long-lived xl2times worker process.
+
+This script is started by :class:`~src.wrappers.worker_pool.WorkerPool` with an
+interpreter that has xl2times installed (``XL2TIMES_WORKER_COMMAND``). It imports
+xl2times once and then serves jobs until stdin is closed.
+
+Protocol (one JSON object per line):
+    stdin:  {"id": 1, "argv": [...], "output_file": "...", "cwd": "..."}
+    stdout: {"ready": true, "pid": 123} once at startup, then
+            {"id": 1, "return_code": 0, "rss_mb": 512.0, "max_rss_mb": 640.0,
+             "cpu_user": 1.2, "cpu_system": 0.1} per job
+
+``rss_mb`` is the worker's resident set size after the job. ``max_rss_mb`` is
+the peak during the job; it is only reported where the peak can be reset
+before each job (Linux ``/proc/self/clear_refs``).
+
+While a job runs, file descriptors 1 and 2 are redirected to ``output_file`` so
+that everything xl2times prints ends up there. The script only uses the standard
+library because it runs inside the xl2times environment, not this package's.
+"""
+
+import json
+import os
+import sys
+import traceback
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+
+def _rss_mb() -> float:
+    """Return the current resident set size of this process in MB."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+
+    if resource is None:
+        return 0.0
+
+    # Fall back to peak RSS (kilobytes on Linux, bytes on macOS)
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return max_rss / (1024 * 1024)
+    return max_rss / 1024
+
+
+def _reset_peak_rss() -> bool:
+    """Reset this process's peak RSS (VmHWM) so it covers only the next job."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb() -> float:
+    """Return the peak resident set size since the last reset in MB."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0.0
+
+
+def _cpu_times() -> tuple:
+    """Return the user and system CPU seconds used by this process so far."""
+    if resource is None:
+        times = os.times()
+        return times.user, times.system
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime, usage.ru_stime
+
+
+def _send(control, message: dict) -> None:
+    """Write a protocol message to the control channel."""
+    control.write(json.dumps(message) + "\n")
+    control.flush()
+
+
+def _run_job(xl2times_main, job: dict) -> int:
+    """Run one xl2times invocation with stdout/stderr redirected to a file."""
+    sys.stdout.flush()
+    sys.stderr.flush()
+
+    saved_stdout = os.dup(1)
+    saved_stderr = os.dup(2)
+    saved_cwd = os.getcwd()
+    output_fd = os.open(job["output_file"], os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+    try:
+        os.dup2(output_fd, 1)
+        os.dup2(output_fd, 2)
+        if job.get("cwd"):
+            os.chdir(job["cwd"])
+
+        try:
+            xl2times_main(job["argv"])
+            return_code = 0
+        except SystemExit as e:
+            if e.code is None:
+                return_code = 0
+            elif isinstance(e.code, int):
+                return_code = e.code
+            else:
+                print(e.code, file=sys.stderr)
+                return_code = 1
+        except BaseException:
+            traceback.print_exc()
+            return_code = 1
+
+        return return_code
+
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.dup2(saved_stdout, 1)
+        os.dup2(saved_stderr, 2)
+        os.close(saved_stdout)
+        os.close(saved_stderr)
+        os.close(output_fd)
+        os.chdir(saved_cwd)
+
+
+def main() -> int:
+    """Import xl2times and serve jobs from stdin until EOF."""
+    # Keep a private handle on the real stdout for protocol messages, then point
+    # fd 1 at /dev/null so stray prints can never corrupt the control channel.
+    control = os.fdopen(os.dup(1), "w", buffering=1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    os.close(devnull)
+
+    try:
+        from xl2times.__main__ import main as xl2times_main
+    except Exception as e:
+        _send(control, {"ready": False, "error": f"Could not import xl2times: {e}"})
+        return 1
+
+    _send(control, {"ready": True, "pid": os.getpid()})
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        job = json.loads(line)
+        peak_reset = _reset_peak_rss()
+        user_before, system_before = _cpu_times()
+        return_code = _run_job(xl2times_main, job)
+        user_after, system_after = _cpu_times()
+        reply = {
+            "id": job.get("id"),
+            "return_code": return_code,
+            "rss_mb": round(_rss_mb(), 1),
+            "cpu_user": round(user_after - user_before, 3),
+            "cpu_system": round(system_after - system_before, 3)
+        }
+        if peak_reset:
+            reply["max_rss_mb"] = round(_peak_rss_mb(), 1)
+        _send(control, reply)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
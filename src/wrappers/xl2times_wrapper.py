@@ -2,15 +2,42 @@
 
 import asyncio
 import os
-import re
-import tempfile
+import shutil
+import signal
+import sys
 import time
+import uuid
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, TextIO, Tuple, Union
 
 from loguru import logger
 
 from ..config import config
+from ..utils.extraction_cache import ExtractionCache
+from ..utils.file_manager import find_input_workbooks, hash_file
+from ..utils.log_parser import XL2TimesLogParser
+from ..utils.log_store import LogStore
+from ..utils.output_manifest import collect_outputs, snapshot
+from ..utils.result_cache import ResultCache
+from ..utils.run_metrics import RunMetrics, combine_resources, read_rusage
+from ..utils.scheduler import JobScheduler, SchedulerFullError, estimate_run_memory
+from ..utils.sessions import current_session
+from ..utils.shards import (
+    merge_shard_outputs,
+    regions_from_raw_tables,
+    split_regions,
+    trade_links_from_raw_tables,
+)
+from ..utils.version_probe import VersionProbe
+from .worker_pool import WorkerPool, WorkerPoolError
+
+RUSAGE_LAUNCHER = Path(__file__).with_name("rusage_launcher.py")
+
+# Output is read in chunks and split into lines; a line longer than
+# MAX_LINE_BYTES is flushed as-is instead of being buffered further
+STREAM_CHUNK_BYTES = 64 * 1024
+MAX_LINE_BYTES = 1024 * 1024
 
 
 class XL2TimesError(Exception):
@@ -18,6 +45,26 @@ class XL2TimesError(Exception):
     pass
 
 
+class XL2TimesTimeoutError(XL2TimesError):
+    """Exception raised when xl2times does not finish within the timeout."""
+    pass
+
+
+@dataclass
+class RunProgress:
+    """Live view of a run, updated by the wrapper while it executes."""
+
+    phase: str = "pending"
+    parser: Optional[XL2TimesLogParser] = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current phase and log-derived progress counters."""
+        progress = {"phase": self.phase}
+        if self.parser is not None:
+            progress.update(self.parser.progress())
+        return progress
+
+
 class XL2TimesWrapper:
     """Wrapper for executing xl2times commands."""
 
@@ -25,6 +72,38 @@ class XL2TimesWrapper:
         """Initialize the wrapper."""
         self.command = config.XL2TIMES_COMMAND.split()
         self.timeout = config.XL2TIMES_TIMEOUT
+        self.pool: Optional[WorkerPool] = None
+        if config.XL2TIMES_POOL_SIZE > 0:
+            self.pool = WorkerPool(
+                size=config.XL2TIMES_POOL_SIZE,
+                command=config.XL2TIMES_WORKER_COMMAND.split(),
+                max_jobs=config.XL2TIMES_WORKER_MAX_JOBS,
+                max_rss_mb=config.XL2TIMES_WORKER_MAX_RSS_MB
+            )
+        self.result_cache: Optional[ResultCache] = None
+        if config.RESULT_CACHE_ENABLED:
+            self.result_cache = ResultCache(
+                root=Path(config.TEMP_DIR) / "result_cache",
+                max_bytes=config.RESULT_CACHE_MAX_MB * 1024 * 1024,
+                max_entries=config.RESULT_CACHE_MAX_ENTRIES
+            )
+        self.extraction_cache: Optional[ExtractionCache] = None
+        if config.EXTRACTION_CACHE_ENABLED:
+            self.extraction_cache = ExtractionCache(Path(config.TEMP_DIR) / "extraction_cache")
+        self.scheduler = JobScheduler(
+            max_parallel=config.MAX_PARALLEL_RUNS,
+            max_queued=config.MAX_QUEUED_RUNS,
+            memory_budget=config.RUN_MEMORY_BUDGET_MB * 1024 * 1024
+        )
+        self.version_probe = VersionProbe(
+            ttl=config.XL2TIMES_VERSION_TTL, python_command=config.XL2TIMES_WORKER_COMMAND.split()
+        )
+        self.log_store = LogStore(
+            root=Path(config.TEMP_DIR) / "logs",
+            compression=config.RUN_LOG_COMPRESSION,
+            max_bytes=config.RUN_LOG_MAX_MB * 1024 * 1024,
+            max_age=config.RUN_LOG_RETENTION_DAYS * 86400
+        )
 
     async def run(
         self,
@@ -36,7 +115,10 @@ class XL2TimesWrapper:
         dd: bool = False,
         only_read: bool = False,
         no_cache: bool = False,
-        verbose: int = 2  # Default to -vv for LLM requirements
+        verbose: int = 2,  # Default to -vv for LLM requirements
+        priority: int = 0,
+        progress: Optional[RunProgress] = None,
+        shards: int = 0
     ) -> Dict[str, Any]:
         """
         Execute xl2times with the specified parameters.
@@ -51,6 +133,10 @@ class XL2TimesWrapper:
             only_read: Only read files and output raw_tables.txt
             no_cache: Ignore cache and re-extract from XLSX
             verbose: Verbosity level (0-4)
+            priority: Scheduling priority; lower values run first
+            progress: Optional progress object updated while the run executes
+            shards: Split the regions into this many groups and convert them in
+                parallel (0 or 1 for a single process)
 
         Returns:
             Dictionary with execution results
@@ -58,102 +144,668 @@ class XL2TimesWrapper:
         Raises:
             XL2TimesError: If execution fails
         """
-        # Create log file for this execution
-        timestamp = int(time.time())
-        log_file = Path(config.TEMP_DIR) / f"xl2times_run_{timestamp}.log"
-        log_file.parent.mkdir(parents=True, exist_ok=True)
+        # Serve repeated runs on unchanged workbooks from the result cache
+        cache_key = None
+        if self.result_cache is not None and output_dir and not no_cache:
+            cache_key = await self._cache_key(
+                input_files,
+                regions=regions,
+                include_dummy_imports=include_dummy_imports,
+                ground_truth_dir=ground_truth_dir,
+                dd=dd,
+                only_read=only_read
+            )
+            if cache_key:
+                cached = await asyncio.to_thread(self.result_cache.get, cache_key, output_dir)
+                if cached is not None:
+                    logger.info(f"Returning cached xl2times result {cache_key[:12]}")
+                    cached["cache"] = {"hit": True, "key": cache_key}
+                    cached["queue_wait_time"] = 0.0
+                    cached["run_time"] = 0.0
+                    cached["phases"] = {}
+                    cached["resources"] = None
+                    return cached
 
         # Ensure verbose is at least 2 (LLM requirement)
         verbose = max(verbose, 2)
+        progress = progress or RunProgress()
+
+        # Raw table reads only re-read workbooks that changed since they were last extracted
+        result = None
+        if self.extraction_cache is not None and only_read and output_dir and not no_cache:
+            result = await self._run_incremental_read(input_files, output_dir, verbose, priority, progress)
+
+        # Region sharding only applies to full conversions writing CSV tables
+        if result is None and shards > 1 and output_dir and not (only_read or dd or ground_truth_dir):
+            result = await self._run_sharded(
+                input_files, output_dir, regions, shards,
+                include_dummy_imports=include_dummy_imports,
+                no_cache=no_cache,
+                verbose=verbose,
+                priority=priority,
+                progress=progress
+            )
 
-        # Build command
-        cmd = self._build_command(
-            input_files=input_files,
-            output_dir=output_dir,
-            regions=regions,
-            include_dummy_imports=include_dummy_imports,
-            ground_truth_dir=ground_truth_dir,
-            dd=dd,
-            only_read=only_read,
-            no_cache=no_cache,
-            verbose=verbose
+        if result is None:
+            # Build command
+            cmd = self._build_command(
+                input_files=input_files,
+                output_dir=output_dir,
+                regions=regions,
+                include_dummy_imports=include_dummy_imports,
+                ground_truth_dir=ground_truth_dir,
+                dd=dd,
+                only_read=only_read,
+                no_cache=no_cache,
+                verbose=verbose
+            )
+            result = await self._run_scheduled(cmd, input_files, output_dir, priority, progress)
+
+        progress.phase = "finished"
+
+        if cache_key:
+            if result["success"]:
+                await asyncio.to_thread(self.result_cache.put, cache_key, result, output_dir)
+            result["cache"] = {"hit": False, "key": cache_key}
+
+        return result
+
+    async def _run_scheduled(
+        self,
+        cmd: List[str],
+        input_files: Union[str, List[str]],
+        output_dir: Optional[str],
+        priority: int,
+        progress: RunProgress,
+        hashes: bool = True
+    ) -> Dict[str, Any]:
+        """Wait for a scheduler slot, then execute a built command."""
+        # Wait for a run slot so concurrent conversions cannot exhaust the host
+        memory_estimate = estimate_run_memory(
+            input_files,
+            factor=config.RUN_MEMORY_FACTOR,
+            base_bytes=config.RUN_MEMORY_BASE_MB * 1024 * 1024
         )
+        progress.phase = "queued"
+        try:
+            async with self.scheduler.slot(memory_estimate, priority) as ticket:
+                if ticket.queue_wait > 0.1:
+                    logger.info(f"xl2times run waited {ticket.queue_wait:.2f}s for a slot")
+                progress.phase = "running"
+                run_start = time.time()
+                result = await self._execute(cmd, output_dir, progress, hashes)
+                run_time = time.time() - run_start
+        except SchedulerFullError as e:
+            raise XL2TimesError(str(e))
+
+        result["queue_wait_time"] = ticket.queue_wait
+        result["run_time"] = run_time
+        result["phases"] = {"queue_wait": round(ticket.queue_wait, 3), **result.get("phases", {})}
+        result["memory_estimate_mb"] = round(memory_estimate / (1024 * 1024), 1)
+        return result
 
-        logger.info(f"Executing xl2times command: {' '.join(cmd)}")
-        logger.info(f"Logging to: {log_file}")
+    async def _run_incremental_read(
+        self,
+        input_files: Union[str, List[str]],
+        output_dir: str,
+        verbose: int,
+        priority: int,
+        progress: RunProgress
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Produce raw_tables.txt from the extraction cache, re-reading only the
+        workbooks whose content is not cached yet.
+
+        Returns:
+            Result dictionary, or None if the inputs cannot be resolved to workbooks
+        """
+        workbooks = find_input_workbooks(input_files)
+        if not workbooks:
+            return None
+
+        cache = self.extraction_cache
+        names = {path: name for name, path in workbooks}
+        hashes = await asyncio.to_thread(cache.fingerprint, list(names))
+        stale = [path for path in names if not cache.has(hashes[path])]
+        reused = [names[path] for path in names if path not in stale]
+
+        if stale:
+            logger.info(f"Re-reading {len(stale)} of {len(names)} workbooks ({len(reused)} cached)")
+            staging = Path(config.TEMP_DIR) / "extraction_cache" / "staging" / uuid.uuid4().hex
+            stale_files = [str(path) for path in stale]
+            cmd = self._build_command(
+                input_files=stale_files,
+                output_dir=str(staging),
+                only_read=True,
+                verbose=verbose
+            )
+            try:
+                result = await self._run_scheduled(cmd, stale_files, str(staging), priority, progress, hashes=False)
+                raw_tables = staging / "raw_tables.txt"
+                if result["success"] and raw_tables.exists():
+                    await asyncio.to_thread(
+                        cache.store_from_raw_tables, raw_tables, {path: hashes[path] for path in stale}
+                    )
+                elif result["success"]:
+                    result["success"] = False
+                    result["errors"].append("xl2times did not write raw_tables.txt")
+            finally:
+                shutil.rmtree(staging, ignore_errors=True)
+
+            if not result["success"]:
+                result["output_files"] = []
+                result["output_directory"] = output_dir
+                result["extraction"] = {"reused": reused, "reread": [names[path] for path in stale]}
+                return result
+        else:
+            logger.info(f"All {len(names)} workbooks served from the extraction cache")
+            result = {
+                "success": True,
+                "return_code": 0,
+                "log_file": "",
+                "warnings": [],
+                "errors": [],
+                "execution_time": 0,
+                "command": "",
+                "queue_wait_time": 0.0,
+                "run_time": 0.0,
+                "phases": {},
+                "resources": None
+            }
+
+        raw_tables = Path(output_dir) / "raw_tables.txt"
+        before = await asyncio.to_thread(snapshot, output_dir)
+        write_start = time.perf_counter()
+        await asyncio.to_thread(cache.write_raw_tables, raw_tables, list(names), hashes)
+        phases = result["phases"]
+        phases["output_write"] = round(phases.get("output_write", 0.0) + time.perf_counter() - write_start, 3)
+
+        outputs = await asyncio.to_thread(collect_outputs, output_dir, before, config.OUTPUT_MANIFEST_HASHES)
+        reread = [names[path] for path in stale]
+        result["output_files"] = outputs["output_files"]
+        result["output_manifest"] = outputs["manifest"]
+        result["output_directory"] = output_dir
+        result["files_processed"] = [name for name, _ in workbooks]
+        result["extraction"] = {"reused": reused, "reread": reread}
+        result["message"] = (
+            f"Read {len(reread)} changed Excel files and reused cached tables for {len(reused)}, "
+            f"generated raw_tables.txt."
+        )
+        return result
+
+    async def write_cached_raw_tables(self, input_files: Union[str, List[str]], target: Path) -> bool:
+        """
+        Write raw_tables.txt for the inputs from the extraction cache, without running xl2times.
 
+        Returns:
+            True if every input workbook was cached and the file was written
+        """
+        if self.extraction_cache is None:
+            return False
+        workbooks = find_input_workbooks(input_files)
+        if not workbooks:
+            return False
+
+        cache = self.extraction_cache
+        paths = [path for _, path in workbooks]
+        hashes = await asyncio.to_thread(cache.fingerprint, paths)
+        if not all(cache.has(hashes[path]) for path in paths):
+            return False
+        target.parent.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(cache.write_raw_tables, target, paths, hashes)
+        return True
+
+    async def prime_extraction_cache(self, workbooks: List[Path], priority: int = 0) -> int:
+        """
+        Read workbooks into the extraction cache in a single xl2times process.
+
+        Returns:
+            Number of workbooks that had to be read
+        """
+        if self.extraction_cache is None or not workbooks:
+            return 0
+
+        hashes = await asyncio.to_thread(self.extraction_cache.fingerprint, workbooks)
+        stale = [path for path in workbooks if not self.extraction_cache.has(hashes[path])]
+        if not stale:
+            return 0
+
+        staging = Path(config.TEMP_DIR) / "extraction_cache" / "prime" / uuid.uuid4().hex
         try:
-            # Execute command
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.STDOUT,  # Combine stderr into stdout
-                cwd=os.getcwd()
+            result = await self._run_incremental_read(
+                [str(path) for path in stale], str(staging), 2, priority, RunProgress()
+            )
+            if result is None or not result["success"]:
+                raise XL2TimesError("; ".join(result["errors"]) if result else "workbooks not found")
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        return len(stale)
+
+    async def _run_sharded(
+        self,
+        input_files: Union[str, List[str]],
+        output_dir: str,
+        regions: Optional[List[str]],
+        shards: int,
+        include_dummy_imports: bool,
+        no_cache: bool,
+        verbose: int,
+        priority: int,
+        progress: RunProgress
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Convert region groups in parallel and merge their tables into ``output_dir``.
+
+        Each shard is a separate xl2times run with ``--regions`` set to its group,
+        scheduled like any other run. Regions joined by ``~TradeLinks`` stay in
+        one group. Region-independent tables come out identical in every shard
+        and are copied unchanged.
+
+        Returns:
+            Result dictionary, or None if the regions cannot be split into two groups
+        """
+        model_regions, links = await self._read_regions_and_links(input_files, verbose, priority)
+        regions = list(regions or []) or model_regions
+        if len(regions) < 2:
+            logger.info("Model has fewer than two regions; running without sharding")
+            return None
+
+        groups = split_regions(regions, shards, links)
+        if len(groups) < 2:
+            logger.warning("All regions are joined by trade links; running without sharding")
+            return None
+        root = Path(config.TEMP_DIR) / "shards" / uuid.uuid4().hex
+        shard_dirs = [root / f"shard_{i}" for i in range(len(groups))]
+        logger.info(f"Running xl2times in {len(groups)} region shards")
+
+        async def run_shard(group: List[str], shard_dir: Path) -> Dict[str, Any]:
+            cmd = self._build_command(
+                input_files=input_files,
+                output_dir=str(shard_dir),
+                regions=group,
+                include_dummy_imports=include_dummy_imports,
+                no_cache=no_cache,
+                verbose=verbose
             )
+            return await self._run_scheduled(cmd, input_files, str(shard_dir), priority, RunProgress(), hashes=False)
 
-            # Wait for completion with timeout
+        before = await asyncio.to_thread(snapshot, output_dir)
+        start = time.time()
+        progress.phase = "running"
+        tasks = [asyncio.create_task(run_shard(g, d)) for g, d in zip(groups, shard_dirs)]
+        try:
             try:
-                stdout, _ = await asyncio.wait_for(
-                    process.communicate(),
-                    timeout=self.timeout
+                results = await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+
+            success = all(r["success"] for r in results)
+            merge = None
+            merge_time = 0.0
+            if success:
+                merge_start = time.perf_counter()
+                merge = await asyncio.to_thread(
+                    merge_shard_outputs, shard_dirs, Path(output_dir), [r["output_files"] for r in results]
                 )
-            except asyncio.TimeoutError:
-                process.kill()
-                await process.wait()
-                raise XL2TimesError(f"xl2times execution timed out after {self.timeout} seconds")
-
-            # Decode output
-            stdout_str = stdout.decode('utf-8', errors='replace')
-
-            # Write full output to log file
-            with open(log_file, 'w', encoding='utf-8') as f:
-                f.write(f"# XL2TIMES Execution Log\n")
-                f.write(f"# Command: {' '.join(cmd)}\n")
-                f.write(f"# Timestamp: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp))}\n")
-                f.write(f"# Return Code: {process.returncode}\n")
-                f.write(f"# Working Directory: {os.getcwd()}\n\n")
-                f.write(stdout_str)
-
-            # Collect all output files if output_dir exists
-            output_files = []
-            if output_dir and Path(output_dir).exists():
-                output_files = [str(f) for f in Path(output_dir).rglob("*") if f.is_file()]
-                # Sort for consistent ordering
-                output_files.sort()
+                merge_time = time.perf_counter() - merge_start
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+        outputs = None
+        if success:
+            outputs = await asyncio.to_thread(collect_outputs, output_dir, before, config.OUTPUT_MANIFEST_HASHES)
+        output_files = outputs["output_files"] if outputs else []
+        warnings = list(dict.fromkeys(w for r in results for w in r["warnings"]))
+        errors = [f"[shard {i}] {e}" for i, r in enumerate(results) for e in r["errors"]]
+        first = results[0]
+
+        # Shards run side by side: phases are summed over shards, except waiting for a slot
+        metrics = RunMetrics()
+        for r in results:
+            for phase, seconds in r.get("phases", {}).items():
+                if phase != "queue_wait":
+                    metrics.add(phase, seconds)
+        metrics.add("shard_merge", merge_time)
+        phases = {"queue_wait": round(max(r["queue_wait_time"] for r in results), 3), **metrics.as_dict()}
+
+        result = {
+            "success": success,
+            "return_code": next((r["return_code"] for r in results if r["return_code"] != 0), 0),
+            "log_id": first.get("log_id"),
+            "log_file": first["log_file"],
+            "output_files": output_files,
+            "output_manifest": outputs["manifest"] if outputs else None,
+            "output_directory": output_dir,
+            "warnings": warnings,
+            "errors": errors,
+            "files_processed": first["files_processed"],
+            "extraction": first.get("extraction"),
+            "execution_time": 0,
+            "command": "\n".join(r["command"] for r in results),
+            "queue_wait_time": max(r["queue_wait_time"] for r in results),
+            "run_time": time.time() - start,
+            "memory_estimate_mb": sum(r["memory_estimate_mb"] for r in results),
+            "phases": phases,
+            "resources": combine_resources([r.get("resources") for r in results]),
+            "shards": [
+                {
+                    "regions": group,
+                    "success": r["success"],
+                    "return_code": r["return_code"],
+                    "queue_wait_time": r["queue_wait_time"],
+                    "run_time": r["run_time"],
+                    "resources": r.get("resources"),
+                    "log_id": r.get("log_id"),
+                    "log_file": r["log_file"]
+                }
+                for group, r in zip(groups, results)
+            ],
+            "merge": merge
+        }
+        if success:
+            result["message"] = (
+                f"Successfully processed {len(first['files_processed'])} Excel files in {len(groups)} region shards, "
+                f"generated {len(output_files)} output files."
+            )
+        else:
+            result["message"] = f"{sum(not r['success'] for r in results)} of {len(groups)} region shards failed."
+        return result
+
+    async def _read_regions_and_links(
+        self, input_files: Union[str, List[str]], verbose: int, priority: int
+    ) -> Tuple[List[str], List[Tuple[str, str]]]:
+        """Read the model's regions and trade links from its ~BookRegions_Map and ~TradeLinks tables."""
+        staging = Path(config.TEMP_DIR) / "shards" / f"regions-{uuid.uuid4().hex}"
+        try:
+            result = None
+            if self.extraction_cache is not None:
+                result = await self._run_incremental_read(input_files, str(staging), verbose, priority, RunProgress())
+            if result is None:
+                cmd = self._build_command(input_files, output_dir=str(staging), only_read=True, verbose=verbose)
+                result = await self._run_scheduled(cmd, input_files, str(staging), priority, RunProgress(), hashes=False)
+
+            raw_tables = staging / "raw_tables.txt"
+            if not result["success"] or not raw_tables.exists():
+                return [], []
+            regions = await asyncio.to_thread(regions_from_raw_tables, raw_tables)
+            links = await asyncio.to_thread(trade_links_from_raw_tables, raw_tables)
+            return regions, links
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    async def _execute(
+        self, cmd: List[str], output_dir: Optional[str], progress: RunProgress, hashes: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Execute a built xl2times command and build the result dictionary.
+
+        Only files the run wrote to ``output_dir`` are reported, so earlier
+        outputs in a shared directory are not listed. ``hashes`` adds their
+        sha256 to the manifest (internal staging runs skip it).
+        """
+        # Each run logs under its own ID; the log is compressed and indexed when it ends
+        timestamp = int(time.time())
+        log_id, log_file = self.log_store.new_run()
+        log_info: Dict[str, Any] = {"started_at": timestamp, "command": ' '.join(cmd), "output_dir": output_dir}
+        # Network sessions only see the logs of their own runs
+        if current_session.get() is not None:
+            log_info["session"] = current_session.get()
+        log_stored = False
+
+        logger.info(f"Executing xl2times command: {' '.join(cmd)}")
+        logger.info(f"Logging to: {log_file}")
+
+        parser = XL2TimesLogParser()
+        progress.parser = parser
+        metrics = RunMetrics()
+
+        try:
+            before = await asyncio.to_thread(snapshot, output_dir)
+
+            # Output is streamed line by line into the log file and the parser,
+            # so memory stays flat regardless of log volume
+            with open(log_file, 'w', encoding='utf-8') as log:
+                log.write(f"# XL2TIMES Execution Log\n")
+                log.write(f"# Run ID: {log_id}\n")
+                log.write(f"# Command: {' '.join(cmd)}\n")
+                log.write(f"# Timestamp: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp))}\n")
+                log.write(f"# Working Directory: {os.getcwd()}\n\n")
+                log.flush()
+
+                # Prefer a warm worker; fall back to spawning the command
+                return_code = None
+                if self.pool is not None and self.pool.available:
+                    try:
+                        return_code = await self._execute_in_pool(cmd, log, parser, metrics)
+                    except WorkerPoolError as e:
+                        logger.warning(f"xl2times worker pool unavailable, spawning subprocess: {e}")
+
+                if return_code is None:
+                    return_code = await self._execute_subprocess(cmd, log, parser, metrics)
+                finished_at = time.time()
+
+                log.write(f"\n# Return Code: {return_code}\n")
+
+            # Collect the files this run wrote, with their sizes and hashes
+            outputs = None
+            with metrics.timer("output_scan"):
+                if output_dir:
+                    outputs = await asyncio.to_thread(
+                        collect_outputs, output_dir, before, hashes and config.OUTPUT_MANIFEST_HASHES
+                    )
+            output_files = outputs["output_files"] if outputs else []
+            last_written = outputs["first_mtime"] if outputs else None
+
+            # Phases xl2times reports itself; without a logged write step, the
+            # output write is estimated from when the first output file was finished
+            metrics.add_log_timings(parser.timings)
+            if "output_write" not in metrics.phases and last_written is not None:
+                metrics.add("output_write", finished_at - last_written)
 
             # Parse output for status and warnings
-            parsed_result = self._parse_output(stdout_str, "")
+            parsed_result = parser.result()
+            success = return_code == 0 and parsed_result.get("success", False)
+            log_info.update(return_code=return_code, success=success)
+            log_file = await asyncio.to_thread(
+                self.log_store.finish, log_id, log_info, parser.warnings, parser.errors
+            )
+            log_stored = True
 
             # Build final result for LLM
             result = {
-                "success": process.returncode == 0 and parsed_result.get("success", False),
-                "return_code": process.returncode,
+                "success": success,
+                "return_code": return_code,
+                "log_id": log_id,
                 "log_file": str(log_file),
                 "output_files": output_files,
+                "output_manifest": outputs["manifest"] if outputs else None,
                 "output_directory": output_dir or "",
                 "warnings": parsed_result.get("warnings", []),
                 "errors": parsed_result.get("errors", []),
                 "files_processed": parsed_result.get("files_processed", []),
+                "extraction": {"reused": list(parser.files_cached), "reread": list(parser.files_read)},
                 "execution_time": 0,  # Will be set by handler
                 "command": ' '.join(cmd),
-                "message": self._generate_llm_message(process.returncode, parsed_result, len(output_files))
+                "message": self._generate_llm_message(return_code, parsed_result, len(output_files)),
+                "phases": metrics.as_dict(),
+                "resources": metrics.resources
             }
 
             # Add errors if non-zero return code
-            if process.returncode != 0:
-                result["errors"].append(f"xl2times exited with code {process.returncode}")
+            if return_code != 0:
+                result["errors"].append(f"xl2times exited with code {return_code}")
                 result["success"] = False
 
-            logger.info(f"xl2times execution completed with return code {process.returncode}")
+            logger.info(f"xl2times execution completed with return code {return_code}")
             return result
 
-        except FileNotFoundError:
-            raise XL2TimesError(f"xl2times command not found: {' '.join(self.command)}")
-        except Exception as e:
-            if isinstance(e, XL2TimesError):
+        except BaseException as e:
+            # Failed, timed-out and cancelled runs keep their (partial) log too
+            if not log_stored and log_file.exists():
+                log_info.update(return_code=None, success=False)
+                try:
+                    self.log_store.finish(log_id, log_info, parser.warnings, parser.errors + [f"Run aborted: {e!r}"])
+                except OSError as store_error:
+                    logger.warning(f"Could not store log of run {log_id}: {store_error}")
+            if isinstance(e, FileNotFoundError):
+                raise XL2TimesError(f"xl2times command not found: {' '.join(self.command)}")
+            if isinstance(e, XL2TimesError) or not isinstance(e, Exception):
                 raise
             raise XL2TimesError(f"xl2times execution failed: {str(e)}")
 
+    async def _cache_key(self, input_files: Union[str, List[str]], **options: Any) -> Optional[str]:
+        """
+        Build the result cache key for a run.
+
+        Returns None if the inputs cannot be hashed or the xl2times version is
+        unknown, since results of an unidentified build must not be reused.
+        """
+        workbooks = find_input_workbooks(input_files)
+        if not workbooks:
+            return None
+
+        hashes = await asyncio.to_thread(
+            lambda: [(name, hash_file(path)) for name, path in workbooks]
+        )
+
+        # Normalize options through the same code path as the real command,
+        # leaving out inputs, output location and verbosity
+        options["regions"] = sorted(options.get("regions") or [])
+        arguments = self._build_command(input_files=[], **options)[len(self.command):]
+
+        version = await self.get_version()
+        if version == "unknown":
+            logger.debug("xl2times version is unknown; not using the result cache")
+            return None
+        return ResultCache.make_key(hashes, arguments, f"{' '.join(self.command)}@{version}")
+
+    async def get_version(self) -> str:
+        """Return the xl2times version, or "unknown"."""
+        return await self.version_probe.get(self.command) or "unknown"
+
+    async def _execute_subprocess(
+        self, cmd: List[str], log: TextIO, parser: XL2TimesLogParser, metrics: RunMetrics
+    ) -> int:
+        """Run xl2times as a fresh subprocess, streaming its output, and return its return code."""
+        # The launcher reaps xl2times with os.wait4 and reports its CPU time and peak RSS;
+        # a command that cannot be found is left to fail in create_subprocess_exec
+        rusage_file = None
+        if config.RUN_RUSAGE_ENABLED and hasattr(os, "wait4") and shutil.which(cmd[0]):
+            rusage_file = Path(config.TEMP_DIR) / f"rusage_{uuid.uuid4().hex}.json"
+            cmd = [sys.executable, str(RUSAGE_LAUNCHER), str(rusage_file), *cmd]
+
+        spawn_start = time.perf_counter()
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,  # Combine stderr into stdout
+            cwd=os.getcwd(),
+            start_new_session=rusage_file is not None
+        )
+
+        # Wait for completion with timeout
+        try:
+            await asyncio.wait_for(
+                self._stream_output(process.stdout, log, parser, metrics, spawn_start),
+                timeout=self.timeout
+            )
+            await process.wait()
+        except asyncio.TimeoutError:
+            self._kill(process, process_group=rusage_file is not None)
+            await process.wait()
+            raise XL2TimesTimeoutError(f"xl2times execution timed out after {self.timeout} seconds")
+        except asyncio.CancelledError:
+            self._kill(process, process_group=rusage_file is not None)
+            raise
+        finally:
+            if rusage_file is not None and rusage_file.exists():
+                metrics.resources = read_rusage(rusage_file)
+                rusage_file.unlink(missing_ok=True)
+
+        return process.returncode
+
+    @staticmethod
+    def _kill(process: asyncio.subprocess.Process, process_group: bool) -> None:
+        """Kill a process, and with ``process_group`` everything in its session."""
+        if process_group and isinstance(process.pid, int):
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+                return
+            except OSError:
+                pass
+        process.kill()
+
+    async def _stream_output(
+        self,
+        stream: asyncio.StreamReader,
+        log: TextIO,
+        parser: XL2TimesLogParser,
+        metrics: RunMetrics,
+        spawn_start: float
+    ) -> None:
+        """
+        Copy process output into the log file and parser one line at a time.
+
+        The time until the first output arrives is recorded as the spawn phase
+        (interpreter start, uvx environment resolution, imports); the time spent
+        splitting, logging and parsing lines as the log_parse phase.
+        """
+        pending = b""
+        while chunk := await stream.read(STREAM_CHUNK_BYTES):
+            if "spawn" not in metrics.phases:
+                metrics.add("spawn", time.perf_counter() - spawn_start)
+            with metrics.timer("log_parse"):
+                pending += chunk
+                *lines, pending = pending.split(b"\n")
+                if len(pending) > MAX_LINE_BYTES:
+                    # Pathologically long line: flush what we have rather than buffer it
+                    lines.append(pending)
+                    pending = b""
+                for raw in lines:
+                    line = raw.decode('utf-8', errors='replace').rstrip('\r')
+                    log.write(line + "\n")
+                    parser.feed(line)
+
+        if pending:
+            with metrics.timer("log_parse"):
+                line = pending.decode('utf-8', errors='replace').rstrip('\r')
+                log.write(line + "\n")
+                parser.feed(line)
+
+    async def _execute_in_pool(
+        self, cmd: List[str], log: TextIO, parser: XL2TimesLogParser, metrics: RunMetrics
+    ) -> int:
+        """Run xl2times on a warm pool worker and return its return code."""
+        argv = cmd[len(self.command):]
+        offset = log.tell()
+
+        stats: Dict[str, Any] = {}
+        try:
+            # The worker appends its output straight to the log file
+            return_code = await self.pool.run(argv, log.name, cwd=os.getcwd(), timeout=self.timeout, stats=stats)
+        except asyncio.TimeoutError:
+            raise XL2TimesTimeoutError(f"xl2times execution timed out after {self.timeout} seconds")
+
+        # A warm worker has nothing to spawn; waiting for an idle one is its spawn phase
+        metrics.add("spawn", stats.get("acquire_time", 0.0))
+        if "cpu_user" in stats:
+            metrics.resources = {"cpu_user": stats["cpu_user"], "cpu_system": stats.get("cpu_system", 0.0)}
+            # The worker's RSS after the job is not the job's peak, so only a measured peak is reported
+            if "max_rss_mb" in stats:
+                metrics.resources["max_rss_mb"] = stats["max_rss_mb"]
+
+        with metrics.timer("log_parse"):
+            with open(log.name, 'rb') as f:
+                f.seek(offset)
+                for raw in f:
+                    parser.feed(raw.decode('utf-8', errors='replace').rstrip('\r\n'))
+
+        log.seek(0, os.SEEK_END)
+        return return_code
+
     def _build_command(
         self,
         input_files: Union[str, List[str]],
@@ -206,98 +858,14 @@ class XL2TimesWrapper:
         return cmd
 
     def _parse_output(self, stdout: str, stderr: str) -> Dict[str, Any]:
-        """Parse xl2times output to extract relevant information."""
-        result = {
-            "success": False,
-            "message": "",
-            "files_processed": [],
-            "warnings": [],
-            "errors": [],
-            "output_files": []
-        }
-
-        # Check for success message or completion indicators
-        success_indicators = [
-            "successfully converted",
-            "Excel files successfully converted to CSV",
-            "written to output"
-        ]
-        
-        for indicator in success_indicators:
-            if indicator in stdout.lower():
-                result["success"] = True
-                result["message"] = "Excel files successfully converted"
-                break
-
-        # Extract processed files from various log formats
+        """Parse complete xl2times output to extract relevant information."""
+        parser = XL2TimesLogParser()
         for line in stdout.split('\n'):
-            # Look for file processing messages (multiple patterns for different verbosity levels)
-            if re.search(r'Processing\s+(\S+\.xlsx?)', line):
-                match = re.search(r'Processing\s+(\S+\.xlsx?)', line)
-                if match:
-                    result["files_processed"].append(match.group(1))
-            elif re.search(r'Using cached data for.*?([^/\\]+\.xlsx?)', line):
-                # Match cached file loading messages from -vv output
-                match = re.search(r'Using cached data for.*?([^/\\]+\.xlsx?)', line)
-                if match:
-                    filename = match.group(1)
-                    if filename not in result["files_processed"]:
-                        result["files_processed"].append(filename)
-            elif re.search(r'Loading \d+ files from', line):
-                # Also look for the "Loading X files from directory" message
-                # This gives us the file count but we'll get individual files from other patterns
-                pass
-
-        # Extract warnings from stdout
-        for line in stdout.split('\n'):
-            line = line.strip()
-            if not line:
-                continue
-                
-            # Check for various warning patterns
-            warning_match = None
-            if re.search(r'WARNING\s*:', line, re.IGNORECASE):
-                warning_match = re.search(r'WARNING\s*:\s*(.+)', line, re.IGNORECASE)
-            elif re.search(r'FutureWarning\s*:', line, re.IGNORECASE):
-                warning_match = re.search(r'FutureWarning\s*:\s*(.+)', line, re.IGNORECASE)
-            elif re.search(r'UserWarning\s*:', line, re.IGNORECASE):
-                warning_match = re.search(r'UserWarning\s*:\s*(.+)', line, re.IGNORECASE)
-            elif re.search(r'DeprecationWarning\s*:', line, re.IGNORECASE):
-                warning_match = re.search(r'DeprecationWarning\s*:\s*(.+)', line, re.IGNORECASE)
-            
-            if warning_match:
-                result["warnings"].append(warning_match.group(1).strip())
-
-        # Extract actual errors from stderr (exclude warnings)
+            parser.feed(line)
         if stderr:
             for line in stderr.split('\n'):
-                line = line.strip()
-                if line and 'error' in line.lower():
-                    # Skip if it's actually a warning disguised as error in stderr
-                    if any(warn_type in line.lower() for warn_type in ['warning', 'futurewarning', 'userwarning', 'deprecationwarning']):
-                        # Treat as warning instead
-                        result["warnings"].append(line)
-                    else:
-                        result["errors"].append(line)
-
-        # Determine final success status
-        # If we haven't found success indicators but have no real errors and have output, assume success
-        if not result["success"] and not result["errors"]:
-            # Look for signs of completion in stdout
-            if any(indicator in stdout.lower() for indicator in [
-                "loading", "extracted", "transform", "took", "seconds"
-            ]):
-                result["success"] = True
-                result["message"] = "Processing completed"
-
-        # Only mark as failed if we have actual errors (not warnings)
-        if result["errors"]:
-            result["success"] = False
-            result["message"] = "Errors occurred during conversion"
-        elif result["success"] and result["warnings"]:
-            result["message"] = f"Conversion completed with {len(result['warnings'])} warnings"
-
-        return result
+                parser.feed_stderr(line)
+        return parser.result()
 
     def _generate_llm_message(self, return_code: int, parsed_result: Dict[str, Any], output_file_count: int) -> str:
         """Generate a concise message for LLM consumption."""
@@ -0,0 +1,130 @@
+"""Tests for the xl2times_batch tool."""
+
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.handlers.batch_handler import BatchHandler
+from src.handlers.xl2times_handler import XL2TimesHandler
+from src.utils.extraction_cache import ExtractionCache
+from src.utils.result_cache import ResultCache
+
+
+def _block(filename, value):
+    return (
+        f"sheetname: Sheet1\nrange: B2:C3\nfilename: {filename}\ntag: ~FI_T\n"
+        f"types: VALUE (object)\nVALUE\n{value}\n\n\n"
+    )
+
+
+@pytest.mark.asyncio
+async def test_shared_workbooks_are_read_once(tmp_path):
+    """Workbooks identical across models are read by xl2times a single time."""
+    models = []
+    for name in ("model_a", "model_b"):
+        model = tmp_path / name
+        model.mkdir()
+        (model / "SysSettings.xlsx").write_bytes(b"shared settings")
+        (model / f"Scen_{name}.xlsx").write_bytes(name.encode())
+        models.append(model)
+
+    handler = XL2TimesHandler()
+    wrapper = handler.wrapper
+    wrapper.result_cache = None
+    wrapper.extraction_cache = ExtractionCache(tmp_path / "cache")
+    read_calls = []
+
+    async def fake_execute(cmd, log, parser, metrics):
+        args = cmd[len(wrapper.command):]
+        inputs = args[:args.index("--output_dir")]
+        staging = Path(args[args.index("--output_dir") + 1])
+        staging.mkdir(parents=True)
+        read_calls.append(sorted(Path(f).name for f in inputs))
+        (staging / "raw_tables.txt").write_text("".join(_block(f, Path(f).read_bytes().decode()) for f in inputs))
+        parser.feed("Extracted 1 tables, 1 rows in 0.01 seconds")
+        return 0
+
+    with patch.object(wrapper, "_execute_subprocess", AsyncMock(side_effect=fake_execute)):
+        result = await BatchHandler(handler).run_batch({
+            "models": [
+                {"input": str(models[0]), "output_dir": str(tmp_path / "out_a")},
+                {"input": str(models[1]), "output_dir": str(tmp_path / "out_b")}
+            ],
+            "defaults": {"only_read": True}
+        })
+
+    assert read_calls == [["Scen_model_a.xlsx", "Scen_model_b.xlsx", "SysSettings.xlsx"]]
+    assert [m["success"] for m in result["models"]] == [True, True]
+    assert result["models"][1]["extraction"] == {"reused": 2, "reread": 0}
+
+    aggregate = result["aggregate"]
+    assert (aggregate["workbooks"], aggregate["distinct_workbooks"]) == (4, 3)
+    assert aggregate["shared_workbooks"] == [{"name": "SysSettings.xlsx", "models": 2}]
+    assert aggregate["succeeded"] == 2
+    assert aggregate["models_per_minute"] > 0
+    assert "VALUE\nshared settings\n" in (tmp_path / "out_b" / "raw_tables.txt").read_text()
+
+
+@pytest.mark.asyncio
+async def test_identical_models_run_once(tmp_path):
+    """The same model and options in two output directories converts once; the repeat is a cache hit."""
+    model = tmp_path / "model"
+    model.mkdir()
+    (model / "SysSettings.xlsx").write_bytes(b"settings")
+
+    handler = XL2TimesHandler()
+    wrapper = handler.wrapper
+    wrapper.result_cache = ResultCache(tmp_path / "cache", max_bytes=10**6, max_entries=10)
+    wrapper.version_probe.get = AsyncMock(return_value="1.0.0")
+
+    async def fake_execute(cmd, log, parser, metrics):
+        output_dir = Path(cmd[cmd.index("--output_dir") + 1])
+        output_dir.mkdir(parents=True, exist_ok=True)
+        (output_dir / "COM_output.csv").write_text("COM\nCOA\n")
+        parser.feed("Excel files successfully converted to CSV")
+        return 0
+
+    with patch.object(wrapper, "_execute_subprocess", AsyncMock(side_effect=fake_execute)) as execute:
+        result = await BatchHandler(handler).run_batch({"models": [
+            {"input": str(model), "output_dir": str(tmp_path / "a")},
+            {"input": str(model), "output_dir": str(tmp_path / "b")}
+        ]})
+
+    assert execute.await_count == 1
+    assert [m["cache_hit"] for m in result["models"]] == [False, True]
+    assert (tmp_path / "b" / "COM_output.csv").exists()
+
+
+@pytest.mark.asyncio
+async def test_models_sharing_default_output_dir_get_subdirectories(tmp_path):
+    """Models inheriting defaults.output_dir write to their own subdirectory; shared dirs are rejected."""
+    model = tmp_path / "model"
+    model.mkdir()
+    (model / "SysSettings.xlsx").write_bytes(b"settings")
+
+    handler = XL2TimesHandler()
+    wrapper = handler.wrapper
+    wrapper.result_cache = None
+
+    async def fake_execute(cmd, log, parser, metrics):
+        output_dir = Path(cmd[cmd.index("--output_dir") + 1])
+        output_dir.mkdir(parents=True, exist_ok=True)
+        (output_dir / "COM_output.csv").write_text("COM\nCOA\n")
+        parser.feed("Excel files successfully converted to CSV")
+        return 0
+
+    with patch.object(wrapper, "_execute_subprocess", AsyncMock(side_effect=fake_execute)):
+        result = await BatchHandler(handler).run_batch({
+            "defaults": {"output_dir": str(tmp_path / "out")},
+            "models": [{"input": str(model)}, {"input": str(model), "regions": ["R1"]}]
+        })
+
+    assert [m["output_dir"] for m in result["models"]] == [str(tmp_path / "out" / "0"), str(tmp_path / "out" / "1")]
+    assert (tmp_path / "out" / "1" / "COM_output.csv").exists()
+
+    with pytest.raises(ValueError, match="same output_dir"):
+        await BatchHandler(handler).run_batch({"models": [
+            {"input": str(model), "output_dir": str(tmp_path / "a")},
+            {"input": str(model), "output_dir": str(tmp_path / "a")}
+        ]})
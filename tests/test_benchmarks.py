@@ -0,0 +1,75 @@
+"""Tests for the end-to-end benchmark suite and its stub xl2times."""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+import bench_suite  # noqa: E402
+from xlsx_util import find_tables, read_workbook  # noqa: E402
+
+
+def _tables(model: Path, name: str):
+    return {
+        (sheet, tag): (header, rows)
+        for sheet, cells in read_workbook(model / name)
+        for tag, _, header, rows in find_tables(cells)
+    }
+
+
+def test_scale_model_repeats_rows_and_regions(tmp_path):
+    """Scaled copies repeat import-table rows with unique names and list one region per factor."""
+    scaled = bench_suite.scale_model(bench_suite.DEMO_MODEL, tmp_path / "x3", 3)
+
+    original = _tables(bench_suite.DEMO_MODEL, "VT_REG_PRI_V01.xlsx")
+    tables = _tables(scaled, "VT_REG_PRI_V01.xlsx")
+    header, rows = tables["Pri_COA", "~FI_Process"]
+    assert header == original["Pri_COA", "~FI_Process"][0]
+    assert len(rows) == 3 * len(original["Pri_COA", "~FI_Process"][1])
+    tech_names = [row[header.index("TechName")] for row in rows]
+    assert {"MINCOA1", "MINCOA1_1", "MINCOA1_2"} <= set(tech_names)
+    assert tech_names.count("MINCOA1") == 1
+    # Only name columns are suffixed; regions and attributes are repeated as they are
+    assert {row[header.index("Region")] for row in rows} == {
+        row[header.index("Region")] for row in original["Pri_COA", "~FI_Process"][1]
+    }
+
+    settings = _tables(scaled, "SysSettings.xlsx")
+    mig_header, mig_rows = next(table for (_, tag), table in settings.items() if tag == "~TFM_MIG")
+    assert len(mig_rows) > 1 and {row[mig_header.index("Attribute")] for row in mig_rows} == {"ACTCOST"}
+    assert settings["Region-Time Slices", "~BookRegions_Map"][1] == [["REG", "REG1"], ["REG", "REG2"], ["REG", "REG3"]]
+    assert settings["TimePeriods", "~StartYear"] == _tables(bench_suite.DEMO_MODEL, "SysSettings.xlsx")[
+        "TimePeriods", "~StartYear"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_suite_runs_demo_model_through_stub(tmp_path):
+    """The handler and tool-call paths both convert DemoS_001 with the stub and report measurements."""
+    with patch("src.config.config.XL2TIMES_COMMAND", f"{sys.executable} {bench_suite.STUB_XL2TIMES}"), \
+         patch("src.config.config.XL2TIMES_POOL_SIZE", 0), \
+         patch("src.config.config.RESULT_CACHE_ENABLED", False), \
+         patch("src.config.config.RUN_RUSAGE_ENABLED", True), \
+         patch("src.config.config.EXTRACTION_CACHE_ENABLED", False), \
+         patch("src.config.config.METRICS_LOG_FILE", ""), \
+         patch("src.config.config.TEMP_DIR", tmp_path / "tmp"):
+        records = await bench_suite.run_suite([1], 1, tmp_path)
+
+    assert [(r["mode"], r["path"]) for r in records] == [
+        ("convert", "handler"), ("convert", "call_tool"), ("only_read", "handler"), ("only_read", "call_tool")
+    ]
+    for record in records:
+        assert record["latency"]["median"] > 0
+        assert record["extraction"]["median"] >= 0
+        assert record["max_rss_mb"]["median"] > 1
+        assert record["output_bytes"] > 0
+        assert record["response_bytes"] > 0
+    assert records[0]["output_files"] > 1
+    assert records[2]["output_files"] == 1  # raw_tables.txt
+
+    baseline = {"results": [dict(records[0], latency={"median": records[0]["latency"]["median"] / 2})]}
+    regressions = bench_suite.compare({"results": records}, baseline)
+    assert len(regressions) == 1 and "x1 convert handler latency" in regressions[0]
@@ -0,0 +1,65 @@
+"""Tests for Arrow/Parquet output."""
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from src.utils.columnar import read_columnar, write_columnar
+
+
+def _write_csv_outputs(output_dir):
+    output_dir.mkdir()
+    (output_dir / "NCAP_COST_output.csv").write_text(
+        "REG,YEAR,PRC,CUR,VALUE\nREG1,2005,DTPSCOA,MEURO05,10\nREG1,2010,DTPSCOA,MEURO05,12.5\n"
+    )
+    (output_dir / "PRC_output.csv").write_text("PRC\nMINCOA1\nMINCOA2\nDTPSCOA\n")
+
+
+@pytest.mark.parametrize("output_format", ["arrow", "parquet"])
+def test_tables_round_trip(tmp_path, output_format):
+    """All CSV tables are combined into one file and can be read back per table."""
+    output_dir = tmp_path / "output"
+    _write_csv_outputs(output_dir)
+
+    info = write_columnar(output_dir, output_format)
+
+    assert info["tables"] == 2
+    assert info["rows"] == 5
+    assert info["file"].endswith(f"xl2times_output.{output_format}")
+
+    costs = read_columnar(info["file"], table="NCAP_COST")
+    assert costs.column_names == ["table", "REG", "YEAR", "PRC", "CUR", "VALUE"]
+    assert costs.column("YEAR").to_pylist() == ["2005", "2010"]
+    assert costs.column("VALUE").to_pylist() == [10.0, 12.5]
+
+    processes = read_columnar(info["file"], table="PRC")
+    assert processes.column_names == ["table", "PRC"]
+    assert processes.column("PRC").to_pylist() == ["MINCOA1", "MINCOA2", "DTPSCOA"]
+
+
+def test_string_columns_are_dictionary_encoded(tmp_path):
+    """Region, process and other key columns are stored dictionary-encoded."""
+    import pyarrow as pa
+
+    output_dir = tmp_path / "output"
+    _write_csv_outputs(output_dir)
+
+    data = read_columnar(write_columnar(output_dir, "arrow")["file"])
+
+    assert pa.types.is_dictionary(data.schema.field("REG").type)
+    assert pa.types.is_dictionary(data.schema.field("PRC").type)
+    assert pa.types.is_floating(data.schema.field("VALUE").type)
+
+
+def test_only_the_runs_own_tables_are_packed(tmp_path):
+    """Tables left in a reused output directory by an earlier run are not packed."""
+    output_dir = tmp_path / "output"
+    _write_csv_outputs(output_dir)
+    (output_dir / "STALE_output.csv").write_text("PRC\nOLDPRC\n")
+    written = [str(output_dir / "NCAP_COST_output.csv"), str(output_dir / "PRC_output.csv"),
+               str(output_dir / "raw_tables.txt")]
+
+    info = write_columnar(output_dir, "arrow", written)
+
+    assert info["tables"] == 2
+    assert read_columnar(info["file"], table="STALE").num_rows == 0
@@ -0,0 +1,80 @@
+"""Tests for the xl2times_diff tool."""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.handlers.diff_handler import DiffHandler
+from src.utils import table_diff
+from src.utils.result_cache import ResultCache
+
+
+def _write(directory, tables):
+    directory.mkdir(parents=True, exist_ok=True)
+    for name, text in tables.items():
+        (directory / f"{name}_output.csv").write_text(text)
+    return directory
+
+
+@pytest.fixture
+def runs(tmp_path):
+    a = _write(tmp_path / "a", {
+        "NCAP_COST": "REG,YEAR,PRC,VALUE\nREG1,2005,MINCOA1,10\nREG1,2006,MINCOA1,11\nREG1,2006,DTPSCOA,5\n",
+        "PRC": "PRC\nMINCOA1\nDTPSCOA\n",
+        "CUR": "CUR\nMEURO05\n",
+    })
+    b = _write(tmp_path / "b", {
+        "NCAP_COST": "REG,YEAR,PRC,VALUE\nREG1,2005,MINCOA1,10.0\nREG1,2006,MINCOA1,12\nREG1,2007,MINCOA1,13\n",
+        "PRC": "PRC\nMINCOA1\nDTPSCOA\n",
+        "COM": "COM\nCOA\n",
+    })
+    return a, b
+
+
+@pytest.mark.asyncio
+async def test_diff_reports_rows_per_table(runs):
+    """Rows are joined on every column but VALUE; numerically equal values are unchanged."""
+    a, b = runs
+    result = await DiffHandler().diff({"a": str(a), "b": str(b)})
+
+    assert result["tables_added"] == ["COM"]
+    assert result["tables_removed"] == ["CUR"]
+    assert result["tables_unchanged"] == 1
+
+    [costs] = result["tables_changed"]
+    assert costs["table"] == "NCAP_COST"
+    assert costs["key_columns"] == ["REG", "YEAR", "PRC"]
+    assert (costs["added"], costs["removed"], costs["changed"]) == (1, 1, 1)
+    assert costs["samples"]["added"] == [["REG1", "2007", "MINCOA1"]]
+    assert costs["samples"]["removed"] == [["REG1", "2006", "DTPSCOA"]]
+    assert costs["samples"]["changed"] == [{"key": ["REG1", "2006", "MINCOA1"], "a": 11.0, "b": 12.0}]
+
+
+@pytest.mark.asyncio
+async def test_identical_tables_are_not_parsed(runs):
+    """Tables with equal content hashes are skipped without reading their rows."""
+    a, _ = runs
+    with patch.object(table_diff, "diff_tables") as diff_tables:
+        result = await DiffHandler().diff({"a": str(a), "b": str(a)})
+
+    diff_tables.assert_not_called()
+    assert result["tables_unchanged"] == 3
+    assert result["tables_changed"] == []
+
+
+@pytest.mark.asyncio
+async def test_cache_keys_resolve_through_result_cache(runs, tmp_path):
+    """A result cache key (or unique prefix) stands in for its output directory."""
+    a, b = runs
+    cache = ResultCache(tmp_path / "cache", max_bytes=10**6, max_entries=10)
+    files = [str(p) for p in sorted(a.iterdir())]
+    cache.put("ab" * 32, {"success": True, "output_files": files}, str(a))
+
+    class Wrapper:
+        result_cache = cache
+
+    result = await DiffHandler(Wrapper()).diff({"a": "abababab", "b": str(b)})
+    assert result["tables_removed"] == ["CUR"]
+
+    with pytest.raises(ValueError, match="cache key"):
+        await DiffHandler(Wrapper()).diff({"a": "deadbeef", "b": str(b)})
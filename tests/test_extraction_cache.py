@@ -0,0 +1,90 @@
+"""Tests for the per-workbook extraction cache."""
+
+import os
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.utils.extraction_cache import ExtractionCache, iter_raw_table_blocks
+from src.wrappers.xl2times_wrapper import XL2TimesWrapper
+
+
+def _block(filename, tag, value):
+    return (
+        f"sheetname: Sheet1\nrange: B2:C3\nfilename: {filename}\ntag: {tag}\n"
+        f"types: VALUE (object)\nVALUE\n{value}\n\n\n"
+    )
+
+
+def test_split_and_merge_keeps_xl2times_order(tmp_path):
+    """Blocks are stored per workbook and written back in the order xl2times used."""
+    sys_settings = tmp_path / "SysSettings.xlsx"
+    base = tmp_path / "BY_Trans.xlsx"
+    sys_settings.write_bytes(b"sys")
+    base.write_bytes(b"base")
+
+    raw_tables = tmp_path / "raw_tables.txt"
+    raw_tables.write_text(
+        _block(sys_settings, "~StartYear", 2005)
+        + _block(sys_settings, "~TimePeriods", 1)
+        + _block(base, "~TFM_INS", 3)
+    )
+    assert [name for name, _ in iter_raw_table_blocks(raw_tables)] == [str(sys_settings)] * 2 + [str(base)]
+
+    cache = ExtractionCache(tmp_path / "cache")
+    hashes = cache.fingerprint([sys_settings, base])
+    cache.store_from_raw_tables(raw_tables, hashes)
+
+    merged = tmp_path / "merged" / "raw_tables.txt"
+    cache.write_raw_tables(merged, [base, sys_settings], hashes)
+    assert merged.read_text() == raw_tables.read_text()
+
+
+@pytest.mark.asyncio
+async def test_wrapper_rereads_only_changed_workbooks(tmp_path):
+    """A rerun passes only the modified workbook to xl2times and merges the rest from cache."""
+    model = tmp_path / "model"
+    model.mkdir()
+    for name in ("SysSettings.xlsx", "BY_Trans.xlsx", "Scen_A.xlsx"):
+        (model / name).write_bytes(name.encode())
+    output_dir = tmp_path / "output"
+
+    wrapper = XL2TimesWrapper()
+    wrapper.result_cache = None
+    wrapper.extraction_cache = ExtractionCache(tmp_path / "cache")
+    read_calls = []
+
+    async def fake_execute(cmd, log, parser, metrics):
+        args = cmd[len(wrapper.command):]
+        inputs = args[:args.index("--output_dir")]
+        staging = Path(args[args.index("--output_dir") + 1])
+        staging.mkdir(parents=True)
+        read_calls.append(sorted(Path(f).name for f in inputs))
+        (staging / "raw_tables.txt").write_text(
+            "".join(_block(f, "~FI_T", Path(f).read_bytes().decode()) for f in inputs)
+        )
+        parser.feed("Extracted 3 tables, 12 rows in 0.01 seconds")
+        return 0
+
+    with patch.object(wrapper, "_execute_subprocess", AsyncMock(side_effect=fake_execute)):
+        first = await wrapper.run(input_files=str(model), output_dir=str(output_dir), only_read=True)
+        first_tables = (output_dir / "raw_tables.txt").read_text()
+
+        scenario = model / "Scen_A.xlsx"
+        scenario.write_bytes(b"changed")
+        os.utime(scenario, ns=(1, 1))
+        second = await wrapper.run(input_files=str(model), output_dir=str(output_dir), only_read=True)
+
+    assert read_calls == [["BY_Trans.xlsx", "Scen_A.xlsx", "SysSettings.xlsx"], ["Scen_A.xlsx"]]
+    assert first["extraction"] == {
+        "reused": [],
+        "reread": ["BY_Trans.xlsx", "Scen_A.xlsx", "SysSettings.xlsx"]
+    }
+    assert second["extraction"] == {"reused": ["BY_Trans.xlsx", "SysSettings.xlsx"], "reread": ["Scen_A.xlsx"]}
+    assert second["success"] is True
+
+    second_tables = (output_dir / "raw_tables.txt").read_text()
+    assert second_tables == first_tables.replace("VALUE\nScen_A.xlsx\n", "VALUE\nchanged\n")
+    assert "VALUE\nchanged\n" in second_tables
+    assert "VALUE\nSysSettings.xlsx\n" in second_tables
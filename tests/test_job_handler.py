@@ -0,0 +1,64 @@
+"""Tests for the asynchronous job handler."""
+
+import asyncio
+
+import pytest
+
+from src.handlers.job_handler import JobHandler
+
+
+class FakeXL2TimesHandler:
+    """Stands in for XL2TimesHandler, feeding progress until released."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+
+    async def run(self, arguments, progress=None):
+        progress.phase = "running"
+        await self.release.wait()
+        return {"success": arguments["input"] != "broken", "output_files": ["COM_output.csv"]}
+
+
+@pytest.mark.asyncio
+async def test_submit_poll_and_fetch_result():
+    """A submitted job reports progress while running and keeps its result."""
+    fake = FakeXL2TimesHandler()
+    handler = JobHandler(fake)
+
+    submitted = await handler.submit({"input": "DemoS_001"})
+    await asyncio.sleep(0)
+
+    status = await handler.status({"job_id": submitted["job_id"]})
+    assert status["status"] == "running"
+    assert (await handler.result({"job_id": submitted["job_id"]}))["ready"] is False
+
+    fake.release.set()
+    await handler.jobs[submitted["job_id"]].task
+
+    result = await handler.result({"job_id": submitted["job_id"]})
+    assert result["ready"] is True
+    assert result["status"] == "completed"
+    assert result["result"]["output_files"] == ["COM_output.csv"]
+
+
+@pytest.mark.asyncio
+async def test_cancel_running_job():
+    """Cancelling a running job stops it and marks it cancelled."""
+    handler = JobHandler(FakeXL2TimesHandler())
+
+    submitted = await handler.submit({"input": "DemoS_001"})
+    await asyncio.sleep(0)
+    cancelled = await handler.cancel({"job_id": submitted["job_id"]})
+
+    assert cancelled["status"] == "cancelled"
+
+
+@pytest.mark.asyncio
+async def test_unknown_job_and_missing_input():
+    """Unknown job IDs and submissions without input are rejected."""
+    handler = JobHandler(FakeXL2TimesHandler())
+
+    with pytest.raises(ValueError):
+        await handler.status({"job_id": "nope"})
+    with pytest.raises(ValueError):
+        await handler.submit({})
@@ -0,0 +1,90 @@
+"""Tests for the streaming xl2times log parser."""
+
+from src.utils.log_parser import (
+    ACTIVITY,
+    CACHED,
+    ERROR,
+    EXTRACTED,
+    LOADING,
+    PROCESSED,
+    SUCCESS,
+    TIMING,
+    WARNING,
+    XL2TimesLogParser,
+    classify_line,
+)
+
+
+def test_classify_line_categories():
+    """Each kind of xl2times log line is sorted into its class."""
+    assert classify_line("INFO - Processing SysSettings.xlsx", activity_seen=True) == [
+        (PROCESSED, "SysSettings.xlsx", None)
+    ]
+    assert classify_line("Using cached data for /models/DemoS_001/BY_Trans.xlsx", activity_seen=True) == [
+        (CACHED, "BY_Trans.xlsx", None)
+    ]
+    assert classify_line("frame.py:12: FutureWarning: incompatible dtype") == [
+        (WARNING, "incompatible dtype", "FutureWarning")
+    ]
+    assert classify_line("ValueError: bad range") == [(ERROR, "ValueError: bad range", None)]
+    assert classify_line("10:15 | ERROR    | xl2times - failed") == [
+        (ERROR, "10:15 | ERROR    | xl2times - failed", None)
+    ]
+    assert classify_line("Excel files successfully converted", activity_seen=True) == [(SUCCESS, None, None)]
+    assert classify_line("Loading 5 files from DemoS_001") == [(LOADING, "5", None)]
+    assert classify_line("Extracted (potentially cached) 24 tables, 310 rows in 0.42 seconds", activity_seen=True) == [
+        (EXTRACTED, "24", "0.42")
+    ]
+    assert classify_line("transform remove_comment_rows took 0.01 seconds", activity_seen=True) == [
+        (TIMING, "remove_comment_rows", "0.01")
+    ]
+    assert classify_line("the step took a while") == [(ACTIVITY, None, None)]
+
+
+def test_classify_line_ignores_non_matching_keywords():
+    """Keywords without the surrounding structure are not classified."""
+    assert classify_line("No warnings were raised", activity_seen=True) == []
+    assert classify_line("Check #DIV/0 and #REF Errors in Templates", activity_seen=True) == []
+    assert classify_line("nothing to do in seconds", activity_seen=True) == []
+
+
+def test_parser_dedupes_cached_files_and_counts_warning_classes():
+    """Cached files already reported are not repeated; warning classes are counted."""
+    parser = XL2TimesLogParser()
+    for line in [
+        "Processing SysSettings.xlsx",
+        "Using cached data for /models/SysSettings.xlsx",
+        "WARNING: Dropping table",
+        "UserWarning: Unknown extension",
+        "Excel files successfully converted to CSV",
+    ]:
+        parser.feed(line)
+
+    result = parser.result()
+    assert result["success"] is True
+    assert result["files_processed"] == ["SysSettings.xlsx"]
+    assert result["warning_classes"] == {"Warning": 1, "UserWarning": 1}
+
+
+def test_parser_reports_progress():
+    """Progress counts files, extracted tables and finished transforms."""
+    parser = XL2TimesLogParser()
+    for line in [
+        "Loading 2 files from DemoS_001",
+        "Processing SysSettings.xlsx",
+        "Extracted (potentially cached) 24 tables, 310 rows in 0.42 seconds",
+        "transform normalize_tags_columns took 0.01 seconds",
+        "transform remove_comment_rows took 0.02 seconds",
+    ]:
+        parser.feed(line)
+
+    assert parser.progress() == {
+        "lines": 5,
+        "files_total": 2,
+        "files_loaded": 1,
+        "tables_extracted": 24,
+        "transforms_done": 2,
+        "last_step": "remove_comment_rows",
+        "warnings": 0,
+        "errors": 0
+    }
@@ -0,0 +1,122 @@
+"""Tests for the compressed run-log store and xl2times_logs."""
+
+import gzip
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.handlers.logs_handler import LogsHandler
+from src.utils.log_store import LogStore
+from src.utils.sessions import current_session
+from src.wrappers.xl2times_wrapper import XL2TimesError, XL2TimesWrapper
+
+
+def _store_run(store, lines, warnings=(), errors=()):
+    run_id, live = store.new_run()
+    live.write_text("".join(line + "\n" for line in lines))
+    store.finish(run_id, {"command": "xl2times model", "success": not errors}, list(warnings), list(errors))
+    return run_id
+
+
+def test_runs_are_compressed_indexed_and_pruned(tmp_path):
+    """Same-second runs get their own logs; search uses the index; retention drops the oldest."""
+    store = LogStore(tmp_path, compression="gzip")
+    first = _store_run(store, ["Processing SysSettings.xlsx", "WARNING: Dropping table ~TFM_UPD"],
+                       warnings=["Dropping table ~TFM_UPD"])
+    second = _store_run(store, ["ValueError: Unknown region REG9"], errors=["ValueError: Unknown region REG9"])
+    third = _store_run(store, ["WARNING: Dropping table ~FI_T"], warnings=["Dropping table ~FI_T"])
+
+    assert len({first, second, third}) == 3
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        f"{run_id}{suffix}" for run_id in (first, second, third) for suffix in (".json", ".log.gz")
+    )
+    assert gzip.decompress((tmp_path / f"{first}.log.gz").read_bytes()).startswith(b"Processing")
+
+    # A fresh store rebuilds the index from the run records alone
+    store = LogStore(tmp_path, compression="gzip")
+    with patch("gzip.open", side_effect=AssertionError("decompressed")):
+        dropping = store.search("dropping TABLE")
+        errors = store.search("region", level="error")
+    assert [run["run_id"] for run in dropping] == [third, first]
+    assert dropping[1]["matches"] == [{"level": "warning", "text": "Dropping table ~TFM_UPD"}]
+    assert [run["run_id"] for run in errors] == [second]
+    assert store.search("region", level="warning") == []
+    assert store.grep(first, "systsettings") == []
+    assert store.grep(first, "sysSETTINGS") == ["Processing SysSettings.xlsx"]
+
+    # Size limit: keep the newest logs that fit; age limit: drop everything old
+    store.max_bytes = (tmp_path / f"{third}.log.gz").stat().st_size
+    store.prune()
+    assert [run["run_id"] for run in store.search()] == [third]
+    assert not (tmp_path / f"{first}.log.gz").exists()
+
+    store.max_bytes, store.max_age = 0, 1
+    store.get(third)["finished_at"] -= 10
+    store.prune()
+    assert store.stats()["runs"] == 0
+    with pytest.raises(ValueError, match="Unknown run"):
+        store.get(third)
+
+
+@pytest.mark.asyncio
+async def test_wrapper_runs_are_searchable_including_aborted_ones(tmp_path):
+    """Each run reports its log_id; a run that fails mid-way still leaves a searchable log."""
+    wrapper = XL2TimesWrapper()
+    wrapper.result_cache = None
+    wrapper.log_store = LogStore(tmp_path / "logs")
+
+    async def fake_execute(cmd, log, parser, metrics):
+        for line in ("WARNING: Dropping table with no data", "Excel files successfully converted to CSV"):
+            log.write(line + "\n")
+            parser.feed(line)
+        return 0
+
+    with patch.object(wrapper, "_execute_subprocess", AsyncMock(side_effect=fake_execute)):
+        result = await wrapper.run(input_files="model.xlsx", output_dir=str(tmp_path / "out"))
+    with patch.object(wrapper, "_execute_subprocess", AsyncMock(side_effect=RuntimeError("worker died"))):
+        with pytest.raises(XL2TimesError):
+            await wrapper.run(input_files="model.xlsx", output_dir=str(tmp_path / "out"))
+
+    handler = LogsHandler(wrapper)
+    found = await handler.search({"query": "dropping table", "level": "warning"})
+    assert [run["run_id"] for run in found["runs"]] == [result["log_id"]]
+    assert found["runs"][0]["success"] is True
+
+    aborted = await handler.search({"query": "worker died"})
+    assert aborted["runs"][0]["success"] is False
+    assert found["store"]["runs"] == 2
+
+    log = await handler.search({"run_id": result["log_id"], "query": "converted"})
+    assert log["log_lines"] == ["Excel files successfully converted to CSV"]
+    with pytest.raises(ValueError, match="level"):
+        await handler.search({"level": "info"})
+
+
+@pytest.mark.asyncio
+async def test_sessions_only_see_their_own_runs(tmp_path):
+    """A run records the session that started it; other sessions can neither find nor read it."""
+    wrapper = XL2TimesWrapper()
+    wrapper.result_cache = None
+    wrapper.log_store = LogStore(tmp_path / "logs")
+
+    async def fake_execute(cmd, log, parser, metrics):
+        log.write("WARNING: Dropping table with no data\n")
+        parser.feed("WARNING: Dropping table with no data")
+        return 0
+
+    token = current_session.set("session-a")
+    try:
+        with patch.object(wrapper, "_execute_subprocess", AsyncMock(side_effect=fake_execute)):
+            result = await wrapper.run(input_files="model.xlsx", output_dir=str(tmp_path / "out"))
+    finally:
+        current_session.reset(token)
+
+    handler = LogsHandler(wrapper)
+    assert [run["run_id"] for run in (await handler.search({"query": "dropping"}, "session-a"))["runs"]] == [
+        result["log_id"]
+    ]
+    assert (await handler.search({"query": "dropping"}, "session-b"))["runs"] == []
+    with pytest.raises(ValueError, match="Unknown run"):
+        await handler.search({"run_id": result["log_id"]}, "session-b")
+    # stdio (no session) sees every run
+    assert len((await handler.search({"query": "dropping"}))["runs"]) == 1
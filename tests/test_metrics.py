@@ -0,0 +1,111 @@
+"""Tests for the metrics registry, endpoint and xl2times_metrics tool."""
+
+import asyncio
+
+import pytest
+
+from src.handlers.metrics_handler import MetricsHandler
+from src.utils.metrics import MetricsRegistry, start_metrics_server
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Buckets are cumulative and end with +Inf, _sum and _count."""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("run_seconds", "Run duration", buckets=(1, 5))
+    for value in (0.5, 2, 2, 10):
+        histogram.observe(value)
+
+    text = registry.render()
+    assert "# TYPE run_seconds histogram" in text
+    assert 'run_seconds_bucket{le="1"} 1' in text
+    assert 'run_seconds_bucket{le="5"} 3' in text
+    assert 'run_seconds_bucket{le="+Inf"} 4' in text
+    assert "run_seconds_sum 14.5" in text
+    assert "run_seconds_count 4" in text
+
+
+def test_percentiles_cover_the_rolling_window():
+    """Percentiles are computed over the most recent observations only."""
+    registry = MetricsRegistry(window=10)
+    histogram = registry.histogram("latency", "Latency")
+    for value in range(100):
+        histogram.observe(float(value))
+
+    summary = registry.summary()["histograms"]["latency"]
+    assert summary["count"] == 100
+    assert summary["window"] == 10
+    assert summary["p50"] == 94.0
+    assert summary["p99"] == 99.0
+
+
+def test_labelled_counters_and_callback_gauges():
+    """Counters keep one value per label set; callback gauges are read on demand."""
+    registry = MetricsRegistry()
+    calls = registry.counter("calls_total", "Calls", ["tool", "status"])
+    calls.inc(tool="xl2times_run", status="ok")
+    calls.inc(tool="xl2times_run", status="error")
+    calls.inc(tool="xl2times_info", status="ok")
+    depth = [3]
+    registry.gauge("queued", "Queued runs", callback=lambda: depth[0])
+
+    assert calls.total(tool="xl2times_run") == 2
+    assert calls.total(status="ok") == 2
+    with pytest.raises(ValueError):
+        calls.inc(tool="xl2times_run")
+
+    depth[0] = 5
+    text = registry.render()
+    assert 'calls_total{tool="xl2times_info",status="ok"} 1' in text
+    assert "queued 5" in text
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_serves_prometheus_text():
+    """GET /metrics returns the text format; other paths are 404."""
+    registry = MetricsRegistry()
+    registry.counter("runs_total", "Runs").inc(3)
+    server = await start_metrics_server(registry, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    async def get(path):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        return response.decode()
+
+    try:
+        response = await get("/metrics")
+        assert response.startswith("HTTP/1.1 200 OK")
+        assert "text/plain; version=0.0.4" in response
+        assert "runs_total 3" in response
+        assert (await get("/other")).startswith("HTTP/1.1 404")
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_metrics_tool_reports_rates():
+    """The summary derives failure, timeout and cache hit rates from the counters."""
+    registry = MetricsRegistry()
+    runs = registry.counter("xl2times_runs_total", "xl2times runs by outcome", ["outcome"])
+    runs.inc(2, outcome="success")
+    runs.inc(outcome="failure")
+    runs.inc(outcome="timeout")
+    cache = registry.counter("xl2times_result_cache_requests_total", "Result cache lookups by result", ["result"])
+    cache.inc(result="hit")
+    cache.inc(result="miss")
+    registry.histogram("xl2times_run_duration_seconds", "Duration").observe(1.5)
+
+    summary = await MetricsHandler(registry).get_metrics({})
+
+    assert summary["runs"]["total"] == 4
+    assert summary["runs"]["failure_rate"] == 0.25
+    assert summary["runs"]["timeout_rate"] == 0.25
+    assert summary["runs"]["cache_hit_rate"] == 0.5
+    assert summary["runs"]["duration_seconds"]["p50"] == 1.5
+
+    text = await MetricsHandler(registry).get_metrics({"format": "prometheus"})
+    assert 'xl2times_runs_total{outcome="timeout"} 1' in text["text"]
@@ -0,0 +1,65 @@
+"""Tests for output directory snapshots and run manifests."""
+
+import hashlib
+import os
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.utils.output_manifest import collect_outputs, snapshot
+from src.wrappers.xl2times_wrapper import XL2TimesWrapper
+
+
+def test_collect_outputs_reports_only_new_and_rewritten_files(tmp_path):
+    """Files left untouched since the snapshot are excluded; nested paths are relative."""
+    (tmp_path / "DemoS_001").mkdir()
+    (tmp_path / "DemoS_001" / "COM_output.csv").write_text("old\n")
+    (tmp_path / "kept.csv").write_text("kept\n")
+    (tmp_path / "rewritten.csv").write_text("before\n")
+    os.utime(tmp_path / "rewritten.csv", ns=(0, 0))
+
+    before = snapshot(str(tmp_path))
+    assert sorted(before) == ["DemoS_001/COM_output.csv", "kept.csv", "rewritten.csv"]
+
+    (tmp_path / "rewritten.csv").write_text("after\n")
+    (tmp_path / "run" / "nested").mkdir(parents=True)
+    (tmp_path / "run" / "nested" / "PRC_output.csv").write_text("PRC\n")
+
+    outputs = collect_outputs(str(tmp_path), before)
+
+    assert outputs["output_files"] == [
+        str(tmp_path / "rewritten.csv"), str(tmp_path / "run" / "nested" / "PRC_output.csv")
+    ]
+    manifest = outputs["manifest"]
+    assert manifest["untouched_files"] == 2
+    assert manifest["total_bytes"] == len("after\n") + len("PRC\n")
+    assert manifest["files"][1] == {
+        "path": "run/nested/PRC_output.csv", "size": 4, "sha256": hashlib.sha256(b"PRC\n").hexdigest()
+    }
+    assert "sha256" not in collect_outputs(str(tmp_path), {}, hashes=False)["manifest"]["files"][0]
+    assert snapshot(str(tmp_path / "missing")) == {}
+
+
+@pytest.mark.asyncio
+async def test_run_into_shared_directory_lists_only_its_files(tmp_path):
+    """A run writing to a directory with earlier outputs reports just the files it wrote."""
+    output_dir = tmp_path / "output"
+    (output_dir / "test_client").mkdir(parents=True)
+    for i in range(5):
+        (output_dir / "test_client" / f"old_{i}.csv").write_text("old\n")
+
+    wrapper = XL2TimesWrapper()
+    wrapper.result_cache = None
+
+    async def fake_execute(cmd, log, parser, metrics):
+        (output_dir / "COM_output.csv").write_text("COM\nELC\n")
+        parser.feed("Excel files successfully converted to CSV")
+        return 0
+
+    with patch.object(wrapper, "_execute_subprocess", AsyncMock(side_effect=fake_execute)):
+        result = await wrapper.run(input_files="model.xlsx", output_dir=str(output_dir))
+
+    assert result["output_files"] == [str(output_dir / "COM_output.csv")]
+    assert result["output_manifest"]["files"][0]["path"] == "COM_output.csv"
+    assert result["output_manifest"]["untouched_files"] == 5
+    assert "generated 1 output files" in result["message"]
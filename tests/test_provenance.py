@@ -0,0 +1,133 @@
+"""Tests for the row-level provenance index."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.handlers.provenance_handler import ProvenanceHandler
+from src.handlers.xl2times_handler import XL2TimesHandler
+from src.utils.provenance import ProvenanceIndex, build_provenance_index
+
+MERGED_TABLES = """tag: ~FI_T
+types: process (object), region (object), attribute (object), year (object), value (object), source_filename (object)
+process,region,attribute,year,value,source_filename
+MINCOA1,REG1,ACT_BND,2005,6073.7685,VT_REG_PRI_V01
+DTPSCOA,REG1,INVCOST,2005,10,VT_REG_PRI_V01
+
+
+tag: ~CURRENCIES
+types: currency (object), source_filename (object)
+currency,source_filename
+MEURO05,SysSettings
+
+
+"""
+
+RAW_TABLES = """sheetname: Pri_COA
+range: F7:J17
+filename: /models/VT_REG_PRI_V01.xlsx
+tag: ~FI_T
+types: TechName (object), ACT_BND (object)
+TechName,ACT_BND
+MINCOA1,6073.7685
+
+
+sheetname: DemTechs_TPS
+range: D8:J11
+filename: /models/VT_REG_PRI_V01.xlsx
+tag: ~FI_T
+types: TechName (object), INVCOST (object)
+TechName,INVCOST
+DTPSCOA,10
+
+
+"""
+
+
+def _write_run(output_dir):
+    output_dir.mkdir(parents=True, exist_ok=True)
+    (output_dir / "merged_tables.txt").write_text(MERGED_TABLES)
+    (output_dir / "ACT_BND_output.csv").write_text("REG,YEAR,PRC,TS,BD,VALUE\nREG1,2005,MINCOA1,ANNUAL,UP,6073.7685\n")
+    (output_dir / "NCAP_COST_output.csv").write_text("REG,YEAR,PRC,CUR,VALUE\nREG1,2005,DTPSCOA,MEURO05,10\n")
+    (output_dir / "CUR_output.csv").write_text("CUR\nMEURO05\n")
+
+
+def test_index_maps_rows_to_sheet_range_and_tag(tmp_path):
+    """Rows are keyed by their non-VALUE columns and resolve to the raw table they came from."""
+    _write_run(tmp_path)
+    raw_tables = tmp_path / "raw.txt"
+    raw_tables.write_text(RAW_TABLES)
+
+    summary = build_provenance_index(tmp_path, raw_tables)
+    assert summary["entries"] == 3 and summary["unmatched_rows"] == 0
+
+    index = ProvenanceIndex(tmp_path / "provenance.idx")
+    assert index.tables["NCAP_COST"]["key_columns"] == ["REG", "YEAR", "PRC", "CUR"]
+
+    source, row = index.lookup("ncap_cost", ["reg1", 2005, "DTPSCOA", "MEURO05"])
+    assert row == 1
+    assert source == {
+        "workbook": "VT_REG_PRI_V01", "tag": "~FI_T", "filename": "/models/VT_REG_PRI_V01.xlsx",
+        "sheetname": "DemTechs_TPS", "range": "D8:J11"
+    }
+    assert index.lookup("ACT_BND", ["REG1", "2005", "MINCOA1", "ANNUAL", "UP"])[0]["sheetname"] == "Pri_COA"
+    assert index.lookup("CUR", ["MEURO05"])[0]["tag"] == "~CURRENCIES"
+    assert index.lookup("NCAP_COST", ["REG2", "2005", "DTPSCOA", "MEURO05"]) is None
+
+
+@pytest.mark.asyncio
+async def test_handler_builds_missing_index_and_checks_keys(tmp_path):
+    """The tool builds the index on first use; without raw tables only workbook and tag are known."""
+    _write_run(tmp_path)
+    handler = ProvenanceHandler()
+
+    columns = await handler.lookup({"output_dir": str(tmp_path), "table": "ACT_BND"})
+    assert columns["key_columns"] == ["REG", "YEAR", "PRC", "TS", "BD"]
+
+    result = await handler.lookup({
+        "output_dir": str(tmp_path), "table": "NCAP_COST",
+        "row": {"prc": "DTPSCOA", "REG": "REG1", "YEAR": "2005", "CUR": "MEURO05"}
+    })
+    assert result["found"] is True
+    assert result["csv_file"] == "NCAP_COST_output.csv"
+    assert result["source"]["workbook"] == "VT_REG_PRI_V01"
+    assert result["source"]["sheetname"] is None
+
+    with pytest.raises(ValueError, match="missing key columns YEAR, PRC, CUR"):
+        await handler.lookup({"output_dir": str(tmp_path), "table": "NCAP_COST", "row": {"REG": "REG1"}})
+    with pytest.raises(ValueError, match="Unknown table"):
+        await handler.lookup({"output_dir": str(tmp_path), "table": "NOPE", "row": []})
+
+
+@pytest.mark.asyncio
+async def test_run_builds_index_after_conversion_only_when_enabled(tmp_path):
+    """By default the index waits for the first lookup; when enabled, xl2times_run builds it."""
+    output_dir = tmp_path / "out"
+    handler = XL2TimesHandler()
+    handler.wrapper.result_cache = None
+    handler.wrapper.extraction_cache = None
+    handler.metrics_log = None
+
+    async def fake_execute(cmd, log, parser, metrics):
+        _write_run(output_dir)
+        parser.feed("Excel files successfully converted to CSV")
+        return 0
+
+    with patch.object(handler.wrapper, "_execute_subprocess", AsyncMock(side_effect=fake_execute)):
+        result = await handler.run({"input": "model.xlsx", "output_dir": str(output_dir)})
+    assert result["provenance"] is None
+    assert not (output_dir / "provenance.idx").exists()
+
+    found = await ProvenanceHandler().lookup(
+        {"output_dir": str(output_dir), "table": "CUR", "row": {"CUR": "MEURO05"}}
+    )
+    assert found["found"] is True
+    assert (output_dir / "provenance.idx").is_file()
+
+    with patch("src.handlers.xl2times_handler.config.PROVENANCE_INDEX_ENABLED", True), \
+            patch.object(handler.wrapper, "_execute_subprocess", AsyncMock(side_effect=fake_execute)):
+        result = await handler.run({"input": "model.xlsx", "output_dir": str(output_dir)})
+
+    assert result["provenance"]["entries"] == 3
+    assert "provenance_index" in result["phases"]
+    assert (output_dir / "provenance.idx").is_file()
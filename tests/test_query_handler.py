@@ -0,0 +1,63 @@
+"""Tests for the xl2times_query tool."""
+
+import pytest
+
+from src.handlers.query_handler import QueryHandler
+
+
+@pytest.fixture
+def output_dir(tmp_path):
+    (tmp_path / "NCAP_COST_output.csv").write_text(
+        "REG,YEAR,PRC,CUR,VALUE\n"
+        "REG1,2005,MINCOA1,MEURO05,10\n"
+        "REG1,2006,MINCOA1,MEURO05,11\n"
+        "REG1,2006,DTPSCOA,MEURO05,7.5\n"
+        "REG2,2006,MINCOA1,MEURO05,12\n"
+    )
+    (tmp_path / "TOP_output.csv").write_text("REG,PRC,COM,IO\nREG1,MINCOA1,COA,OUT\nREG1,DTPSCOA,COA,IN\n")
+    (tmp_path / "CUR_output.csv").write_text("CUR\nMEURO05\n")
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_query_single_table_by_dimensions(output_dir):
+    """Dimension filters map to the table's columns and combine with AND."""
+    handler = QueryHandler()
+    result = await handler.query({
+        "output_dir": str(output_dir), "table": "ncap_cost",
+        "process": "MINCOA1", "year": 2006, "region": ["REG1", "REG2"], "columns": ["REG", "VALUE"]
+    })
+
+    [table] = result["results"]
+    assert table["columns"] == ["REG", "VALUE"]
+    assert table["rows"] == [["REG1", 11.0], ["REG2", 12.0]]
+    assert table["matched"] == 2
+
+
+@pytest.mark.asyncio
+async def test_query_across_tables_and_limit(output_dir):
+    """Without a table, every table with the filtered columns is searched."""
+    handler = QueryHandler()
+    result = await handler.query({"output_dir": str(output_dir), "process": "DTPSCOA"})
+    assert [r["table"] for r in result["results"]] == ["NCAP_COST", "TOP"]
+
+    limited = await handler.query({"output_dir": str(output_dir), "filters": {"cur": "MEURO05"}, "limit": 2})
+    assert [(r["table"], len(r["rows"]), r["truncated"]) for r in limited["results"]] == [
+        ("CUR", 1, False), ("NCAP_COST", 1, True)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_store_is_cached_and_evicted(output_dir, tmp_path_factory):
+    """Stores are reused per output directory and the least recently used one is dropped."""
+    handler = QueryHandler()
+    handler.stores.max_entries = 1
+
+    listing = await handler.query({"output_dir": str(output_dir)})
+    assert {t["table"] for t in listing["tables"]} == {"NCAP_COST", "TOP", "CUR"}
+    await handler.query({"output_dir": str(output_dir), "table": "TOP"})
+    assert handler.stores.loads == 1
+
+    await handler.query({"output_dir": str(tmp_path_factory.mktemp("other"))})
+    assert handler.stores.loads == 2
+    assert handler.stores.evictions == 1
@@ -0,0 +1,67 @@
+"""Tests for paged access to raw_tables.txt."""
+
+import pytest
+
+from src.handlers.raw_tables_handler import RawTablesHandler
+from src.utils.raw_tables import RawTablesIndex
+
+
+def _block(sheet, filename, tag, rows):
+    lines = [f"sheetname: {sheet}", "range: B2:C3", f"filename: {filename}", f"tag: {tag}",
+             "types: REGION (object), VALUE (object)", "REGION,VALUE"]
+    lines += [f"REG{i},{i}" for i in range(rows)]
+    return "\n".join(lines) + "\n\n\n"
+
+
+@pytest.fixture
+def raw_tables(tmp_path):
+    path = tmp_path / "raw_tables.txt"
+    path.write_text(
+        _block("TimePeriods", "/models/SysSettings.xlsx", "~StartYear", 1)
+        + _block("Pri_COA", "/models/VT_REG_PRI_V01.xlsx", "~FI_T", 3)
+        + _block("DemTechs_TPS", "/models/VT_REG_PRI_V01.xlsx", "~FI_T", 2)
+        + _block("Demands", "/models/BY_Trans.xlsx", "~FI_T", 0)
+    )
+    return path
+
+
+def test_index_finds_blocks_and_headers(raw_tables):
+    """Each sheetname: header starts a table; row counts exclude the CSV header."""
+    index = RawTablesIndex(raw_tables)
+
+    assert [t.sheetname for t in index.tables] == ["TimePeriods", "Pri_COA", "DemTechs_TPS", "Demands"]
+    assert [t.rows for t in index.tables] == [1, 3, 2, 0]
+    assert index.tables[1].filename == "/models/VT_REG_PRI_V01.xlsx"
+    assert index.summary()["tags"] == {"~StartYear": 1, "~FI_T": 3}
+    assert index.read([index.tables[1]], max_rows=1) == [("REGION,VALUE\nREG0,0", True)]
+
+
+@pytest.mark.asyncio
+async def test_pages_are_filtered_and_linked_by_cursor(raw_tables):
+    """Filtered tables are returned page by page until next_cursor is None."""
+    handler = RawTablesHandler()
+
+    first = await handler.get_tables({"path": str(raw_tables.parent), "tag": "fi_t", "limit": 2})
+    assert first["matched_tables"] == 3
+    assert [t["sheetname"] for t in first["tables"]] == ["Pri_COA", "DemTechs_TPS"]
+    assert first["tables"][0]["data"] == "REGION,VALUE\nREG0,0\nREG1,1\nREG2,2"
+
+    second = await handler.get_tables({"path": str(raw_tables), "tag": "~FI_T", "limit": 2,
+                                       "cursor": first["next_cursor"]})
+    assert [t["sheetname"] for t in second["tables"]] == ["Demands"]
+    assert second["next_cursor"] is None
+
+    by_file = await handler.get_tables({"path": str(raw_tables), "filename": "vt_reg", "include_data": False})
+    assert [t["index"] for t in by_file["tables"]] == [1, 2]
+    assert "data" not in by_file["tables"][0]
+
+
+@pytest.mark.asyncio
+async def test_stale_cursor_is_rejected(raw_tables):
+    """A cursor from before the file was rewritten cannot be reused."""
+    handler = RawTablesHandler()
+    page = await handler.get_tables({"path": str(raw_tables), "limit": 1})
+
+    raw_tables.write_text(_block("Other", "/models/Other.xlsx", "~FI_T", 1))
+    with pytest.raises(ValueError, match="changed"):
+        await handler.get_tables({"path": str(raw_tables), "cursor": page["next_cursor"]})
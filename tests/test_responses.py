@@ -0,0 +1,77 @@
+"""Tests for response budgeting and continuation handles."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.server import XL2TimesMCPServer
+from src.utils.responses import ResponseStore, continue_field, fit_response
+
+
+def _big_result():
+    return {
+        "success": True,
+        "output_files": [f"/output/TABLE_{i:04d}_output.csv" for i in range(2000)],
+        "warnings": ["short warning"],
+        "raw_tables": {"data": "x" * 50_000},
+        "message": "done"
+    }
+
+
+def test_small_responses_are_compact_and_untouched():
+    """Responses within budget are serialized whole without indentation."""
+    text, truncated = fit_response({"a": [1, 2], "b": "c"}, 1000, ResponseStore(4))
+    assert text == '{"a":[1,2],"b":"c"}'
+    assert truncated is False
+
+
+def test_large_fields_are_cut_to_their_share_and_can_be_continued():
+    """Oversized fields are truncated with counts and handles; small fields stay whole."""
+    store = ResponseStore(8)
+    text, truncated = fit_response(_big_result(), 8000, store, owner="s1")
+    response = json.loads(text)
+
+    assert truncated is True
+    assert len(text) <= 8000
+    assert response["warnings"] == ["short warning"] and response["message"] == "done"
+    files = response["truncated"]["output_files"]
+    assert files["total"] == 2000 and files["returned"] == len(response["output_files"]) > 0
+    data = response["truncated"]["raw_tables.data"]
+    assert data["total"] == 50_000 and len(response["raw_tables"]["data"]) == data["returned"]
+
+    collected = list(response["output_files"])
+    offset = files["returned"]
+    while offset is not None:
+        page = continue_field(store, files["handle"], offset, 8000, owner="s1")
+        collected.extend(page["items"])
+        offset = page["next_offset"]
+    assert collected == _big_result()["output_files"]
+
+    with pytest.raises(ValueError, match="Unknown or expired handle"):
+        continue_field(store, files["handle"], 0, 8000, owner="s2")
+
+
+@pytest.mark.asyncio
+async def test_call_tool_applies_budget_and_records_size():
+    """_call_tool truncates to RESPONSE_MAX_BYTES and xl2times_more returns the rest."""
+    server = XL2TimesMCPServer()
+    server.__dict__["metrics_handler"] = MagicMock(get_metrics=AsyncMock(return_value=_big_result()))
+
+    with patch("src.server.config.RESPONSE_MAX_BYTES", 4000):
+        content = await server._call_tool("xl2times_metrics", {})
+        response = json.loads(content[0].text)
+        handle = response["truncated"]["output_files"]["handle"]
+        more = json.loads((await server._call_tool(
+            "xl2times_more", {"handle": handle, "offset": response["truncated"]["output_files"]["returned"]}
+        ))[0].text)
+
+    assert len(content[0].text) <= 4000
+    assert more["field"] == "output_files"
+    assert more["items"][0] == _big_result()["output_files"][response["truncated"]["output_files"]["returned"]]
+
+    from src.utils.metrics import registry
+    assert registry.counter(
+        "xl2times_responses_truncated_total", "Tool responses cut down to the response budget", ["tool"]
+    ).total(tool="xl2times_metrics") >= 1
+    assert "xl2times_response_bytes" in registry.summary()["histograms"]
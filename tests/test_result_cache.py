@@ -0,0 +1,116 @@
+"""Tests for the xl2times result cache."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.utils.result_cache import ResultCache
+from src.wrappers.xl2times_wrapper import XL2TimesWrapper
+
+
+def _write_outputs(output_dir, names):
+    output_dir.mkdir(parents=True, exist_ok=True)
+    files = []
+    for name in names:
+        path = output_dir / name
+        path.write_text(f"{name}\n")
+        files.append(str(path))
+    return {"success": True, "output_files": files, "output_directory": str(output_dir)}
+
+
+def test_put_and_get_restores_output_files(tmp_path):
+    """A stored result is returned with its files copied into the new output dir."""
+    cache = ResultCache(tmp_path / "cache", max_bytes=10**6, max_entries=10)
+    result = _write_outputs(tmp_path / "run1", ["COM_output.csv", "PRC_output.csv"])
+
+    cache.put("key", result, str(tmp_path / "run1"))
+    restored = cache.get("key", str(tmp_path / "run2"))
+
+    assert restored["output_directory"] == str(tmp_path / "run2")
+    assert sorted(restored["output_files"]) == [
+        str(tmp_path / "run2" / "COM_output.csv"),
+        str(tmp_path / "run2" / "PRC_output.csv"),
+    ]
+    assert (tmp_path / "run2" / "PRC_output.csv").read_text() == "PRC_output.csv\n"
+    assert cache.get("missing", str(tmp_path / "run3")) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    """Entries beyond max_entries are evicted oldest-first."""
+    cache = ResultCache(tmp_path / "cache", max_bytes=10**6, max_entries=2)
+    for key in ("a", "b", "c"):
+        result = _write_outputs(tmp_path / key, ["COM_output.csv"])
+        cache.put(key, result, str(tmp_path / key))
+
+    assert cache.get("a", str(tmp_path / "out")) is None
+    assert cache.get("c", str(tmp_path / "out")) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entry_with_missing_files_is_dropped(tmp_path):
+    """A partly removed entry counts as a miss and is deleted."""
+    cache = ResultCache(tmp_path / "cache", max_bytes=10**6, max_entries=10)
+    result = _write_outputs(tmp_path / "run1", ["COM_output.csv"])
+    cache.put("key", result, str(tmp_path / "run1"))
+    (tmp_path / "cache" / "key" / "files" / "COM_output.csv").unlink()
+
+    assert cache.get("key", str(tmp_path / "run2")) is None
+    assert not (tmp_path / "cache" / "key").exists()
+    assert cache.stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_wrapper_serves_repeated_runs_from_cache(tmp_path):
+    """A second identical run does not start xl2times; no_cache bypasses the cache."""
+    model = tmp_path / "model"
+    model.mkdir()
+    (model / "SysSettings.xlsx").write_bytes(b"workbook")
+    output_dir = tmp_path / "output"
+
+    wrapper = XL2TimesWrapper()
+    wrapper.result_cache = ResultCache(tmp_path / "cache", max_bytes=10**6, max_entries=10)
+    wrapper.version_probe.get = AsyncMock(return_value="1.0.0")
+
+    async def fake_execute(cmd, log, parser, metrics):
+        _write_outputs(output_dir, ["COM_output.csv"])
+        parser.feed("Excel files successfully converted to CSV")
+        return 0
+
+    with patch.object(wrapper, "_execute_subprocess", AsyncMock(side_effect=fake_execute)) as execute:
+        first = await wrapper.run(input_files=str(model), output_dir=str(output_dir))
+        second = await wrapper.run(input_files=str(model), output_dir=str(output_dir))
+        third = await wrapper.run(input_files=str(model), output_dir=str(output_dir), no_cache=True)
+
+    assert execute.await_count == 2
+    assert first["cache"]["hit"] is False
+    assert second["cache"]["hit"] is True
+    assert second["output_files"] == [str(output_dir / "COM_output.csv")]
+    assert "cache" not in third
+
+
+@pytest.mark.asyncio
+async def test_wrapper_skips_cache_when_version_is_unknown(tmp_path):
+    """Results are neither stored nor served when the xl2times version cannot be detected."""
+    model = tmp_path / "model"
+    model.mkdir()
+    (model / "SysSettings.xlsx").write_bytes(b"workbook")
+    output_dir = tmp_path / "output"
+
+    wrapper = XL2TimesWrapper()
+    wrapper.result_cache = ResultCache(tmp_path / "cache", max_bytes=10**6, max_entries=10)
+    wrapper.version_probe.get = AsyncMock(return_value="unknown")
+
+    async def fake_execute(cmd, log, parser, metrics):
+        _write_outputs(output_dir, ["COM_output.csv"])
+        parser.feed("Excel files successfully converted to CSV")
+        return 0
+
+    with patch.object(wrapper, "_execute_subprocess", AsyncMock(side_effect=fake_execute)) as execute:
+        await wrapper.run(input_files=str(model), output_dir=str(output_dir))
+        second = await wrapper.run(input_files=str(model), output_dir=str(output_dir))
+
+    assert execute.await_count == 2
+    assert "cache" not in second
+    assert wrapper.result_cache.stats()["stores"] == 0
@@ -0,0 +1,86 @@
+"""Tests for per-run phase timings and resource usage."""
+
+import json
+import sys
+import textwrap
+from unittest.mock import patch
+
+import pytest
+
+from src.utils.run_metrics import MetricsLog, RunMetrics, combine_resources
+from src.wrappers.xl2times_wrapper import XL2TimesWrapper
+
+FAKE_XL2TIMES = textwrap.dedent('''
+    import sys
+    from pathlib import Path
+
+    output_dir = Path(sys.argv[sys.argv.index("--output_dir") + 1])
+    print("Processing SysSettings.xlsx")
+    print("Extracted 12 tables from 1 files in 0.50 seconds")
+    print("process_flexible_import_tables took 0.25 seconds")
+    print("apply_transform_tables took 0.75 seconds")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    (output_dir / "COM_output.csv").write_text("COM\\nELC\\n")
+    print("Excel files successfully converted to CSV")
+    sum(i * i for i in range(200000))
+''')
+
+
+def test_log_timings_are_split_into_phases():
+    """Extraction, transforms and output steps are told apart by step name."""
+    metrics = RunMetrics()
+    metrics.add_log_timings([("extract", 1.5), ("apply_fixups", 0.25), ("normalize", 0.5), ("write_csv_tables", 0.1)])
+
+    assert metrics.as_dict() == {"extraction": 1.5, "transforms": 0.75, "output_write": 0.1}
+
+
+def test_combine_resources_sums_cpu_and_keeps_peak_rss():
+    """Parallel processes add up CPU time but not memory."""
+    combined = combine_resources([
+        {"cpu_user": 1.0, "cpu_system": 0.5, "max_rss_mb": 300.0},
+        None,
+        {"cpu_user": 2.0, "cpu_system": 0.25, "max_rss_mb": 500.0}
+    ])
+
+    assert combined == {"cpu_user": 3.0, "cpu_system": 0.75, "max_rss_mb": 500.0, "processes": 2}
+    assert combine_resources([None]) is None
+
+
+def test_metrics_log_appends_json_lines(tmp_path):
+    """Each event is one JSON object per line."""
+    log = MetricsLog(tmp_path / "metrics" / "runs.jsonl")
+    log.write("run", run_id="a", phases={"spawn": 0.1})
+    log.write("response_serialization", run_id="a", seconds=0.001)
+
+    records = [json.loads(line) for line in log.path.read_text().splitlines()]
+    assert [r["event"] for r in records] == ["run", "response_serialization"]
+    assert records[0]["phases"] == {"spawn": 0.1}
+
+
+@pytest.mark.asyncio
+async def test_run_reports_phases_and_child_rusage(tmp_path):
+    """A real subprocess run reports wrapper timers, logged timings and wait4 rusage."""
+    script = tmp_path / "fake_xl2times.py"
+    script.write_text(FAKE_XL2TIMES)
+    output_dir = tmp_path / "out"
+
+    with patch("src.wrappers.xl2times_wrapper.config.TEMP_DIR", tmp_path), \
+         patch("src.wrappers.xl2times_wrapper.config.RUN_RUSAGE_ENABLED", True), \
+         patch("src.wrappers.xl2times_wrapper.config.XL2TIMES_POOL_SIZE", 0), \
+         patch("src.wrappers.xl2times_wrapper.config.RESULT_CACHE_ENABLED", False):
+        wrapper = XL2TimesWrapper()
+        wrapper.command = [sys.executable, str(script)]
+        result = await wrapper.run(input_files="model.xlsx", output_dir=str(output_dir))
+
+    assert result["success"] is True
+    assert result["command"].startswith(sys.executable + " " + str(script))
+    phases = result["phases"]
+    assert list(phases)[:5] == ["queue_wait", "spawn", "extraction", "transforms", "output_write"]
+    assert phases["extraction"] == 0.5
+    assert phases["transforms"] == 1.0
+    assert "output_scan" in phases and "log_parse" in phases
+
+    resources = result["resources"]
+    assert resources["cpu_user"] + resources["cpu_system"] > 0
+    assert resources["max_rss_mb"] > 1
+    assert not list(tmp_path.glob("rusage_*.json"))
@@ -0,0 +1,98 @@
+"""Tests for the xl2times run scheduler."""
+
+import asyncio
+
+import pytest
+
+from src.utils.scheduler import JobScheduler, SchedulerFullError
+
+
+async def _hold(scheduler, events, name, release, memory=0, priority=0):
+    async with scheduler.slot(memory, priority) as ticket:
+        events.append(name)
+        await release.wait()
+        return ticket
+
+
+@pytest.mark.asyncio
+async def test_max_parallel_and_priority_order():
+    """Only max_parallel runs start; queued runs start by priority, then FIFO."""
+    scheduler = JobScheduler(max_parallel=1, max_queued=10)
+    events = []
+    release = asyncio.Event()
+
+    tasks = [asyncio.create_task(_hold(scheduler, events, "first", release))]
+    await asyncio.sleep(0)
+    for name, priority in [("low", 5), ("high", 0), ("high-2", 0)]:
+        tasks.append(asyncio.create_task(_hold(scheduler, events, name, release, priority=priority)))
+    await asyncio.sleep(0)
+
+    assert events == ["first"]
+    assert scheduler.stats()["queued"] == 3
+
+    release.set()
+    tickets = await asyncio.gather(*tasks)
+
+    assert events == ["first", "high", "high-2", "low"]
+    assert tickets[1].queue_wait > 0
+    assert scheduler.stats()["running"] == 0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_runs():
+    """Runs beyond max_queued are rejected."""
+    scheduler = JobScheduler(max_parallel=1, max_queued=1)
+    release = asyncio.Event()
+    events = []
+
+    running = asyncio.create_task(_hold(scheduler, events, "running", release))
+    queued = asyncio.create_task(_hold(scheduler, events, "queued", release))
+    await asyncio.sleep(0)
+
+    with pytest.raises(SchedulerFullError):
+        async with scheduler.slot():
+            pass
+
+    release.set()
+    await asyncio.gather(running, queued)
+    assert scheduler.stats()["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_budget_limits_concurrency():
+    """Runs whose estimates exceed the remaining budget wait."""
+    scheduler = JobScheduler(max_parallel=4, max_queued=10, memory_budget=100)
+    release = asyncio.Event()
+    events = []
+
+    tasks = [
+        asyncio.create_task(_hold(scheduler, events, name, release, memory=60))
+        for name in ("a", "b")
+    ]
+    await asyncio.sleep(0)
+    assert events == ["a"]
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert events == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue():
+    """A cancelled queued run does not block the queue."""
+    scheduler = JobScheduler(max_parallel=1, max_queued=10)
+    release = asyncio.Event()
+    events = []
+
+    running = asyncio.create_task(_hold(scheduler, events, "running", release))
+    cancelled = asyncio.create_task(_hold(scheduler, events, "cancelled", release))
+    waiting = asyncio.create_task(_hold(scheduler, events, "waiting", release))
+    await asyncio.sleep(0)
+
+    cancelled.cancel()
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(running, waiting)
+
+    assert events == ["running", "waiting"]
+    assert scheduler.stats()["queued"] == 0
@@ -60,11 +60,20 @@ async def test_list_tools():
     server = XL2TimesMCPServer()
     tools = await server._list_tools()
 
-    assert len(tools) == 2
+    assert len(tools) == 16
 
     tool_names = [tool.name for tool in tools]
     assert "xl2times_run" in tool_names
     assert "xl2times_info" in tool_names
+    assert "xl2times_raw_tables" in tool_names
+    assert "xl2times_query" in tool_names
+    assert "xl2times_diff" in tool_names
+    assert "xl2times_batch" in tool_names
+    assert "xl2times_metrics" in tool_names
+    assert "xl2times_provenance" in tool_names
+    assert "xl2times_more" in tool_names
+    for job_tool in ("xl2times_submit", "xl2times_status", "xl2times_result", "xl2times_cancel"):
+        assert job_tool in tool_names
 
     # Check xl2times_run tool schema
     xl2times_tool = next(t for t in tools if t.name == "xl2times_run")
@@ -73,6 +82,42 @@ async def test_list_tools():
     assert "regions" in xl2times_tool.inputSchema["properties"]
 
 
+@pytest.mark.asyncio
+async def test_warm_up_builds_handlers_off_the_event_loop():
+    """The first tool listing builds handlers in a worker thread; tool calls wait for it."""
+    import threading
+
+    server = XL2TimesMCPServer()
+    built_in = []
+    build = XL2TimesMCPServer._build_handlers
+
+    def record(self):
+        built_in.append(threading.current_thread())
+        build(self)
+
+    with patch.object(XL2TimesMCPServer, "_build_handlers", record):
+        await server._list_tools()
+        assert "info_handler" not in vars(server)
+        await server._call_tool("xl2times_info", {})
+
+    assert built_in and built_in[0] is not threading.main_thread()
+    assert server._warm_task.done() and "info_handler" in vars(server)
+
+
+@pytest.mark.asyncio
+async def test_close_shuts_down_scan_workers():
+    """Closing the server shuts the scan process pool down and skips handlers never built."""
+    server = XL2TimesMCPServer()
+    pool = server.scan_handler._get_pool()
+
+    with patch.object(pool, "shutdown", wraps=pool.shutdown) as shutdown:
+        await server.close()
+
+    shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+    assert server.scan_handler._pool is None
+    assert "watch_handler" not in vars(server)
+
+
 @pytest.mark.asyncio
 async def test_call_tool_xl2times_info():
     """Test calling xl2times_info tool."""
@@ -116,3 +161,27 @@ async def test_call_tool_xl2times_run_no_input():
     assert len(result) == 1
     assert result[0].type == "text"
     assert "error" in result[0].text
+
+
+def test_server_import_defers_handlers():
+    """Importing the server module does not import any tool handler."""
+    import subprocess
+
+    code = "import sys, src.server; print(sorted(m for m in sys.modules if m.startswith('src.handlers.')))"
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True, text=True, check=True,
+        cwd=os.path.join(os.path.dirname(__file__), "..")
+    ).stdout
+    assert output.strip() == "[]"
+
+
+def test_startup_benchmark_answers_list_tools():
+    """A cold stdio server completes the handshake and lists every tool."""
+    from src.startup_benchmark import measure_session_start
+
+    env = dict(os.environ, LOG_FILE="", METRICS_LOG_FILE="")
+    timings = measure_session_start(env)
+
+    assert timings["tools"] == 16
+    assert 0 < timings["initialize"] <= timings["list_tools"]
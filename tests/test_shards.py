@@ -0,0 +1,129 @@
+"""Tests for region-sharded xl2times runs."""
+
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.utils.provenance import iter_merged_tables
+from src.utils.shards import merge_shard_outputs, split_regions, trade_links_from_raw_tables
+from src.wrappers.xl2times_wrapper import XL2TimesWrapper
+
+
+def test_split_regions_round_robin():
+    """Regions are dealt evenly; there are never more groups than regions."""
+    assert split_regions(["R1", "R2", "R3", "R4", "R5"], 2) == [["R1", "R3", "R5"], ["R2", "R4"]]
+    assert split_regions(["R1", "R2"], 8) == [["R1"], ["R2"]]
+
+
+def test_split_regions_keeps_trade_linked_regions_together():
+    """Linked regions share a group; a fully linked model yields a single group."""
+    links = [("R1", "R2"), ("R4", "R5")]
+    assert split_regions(["R1", "R2", "R3", "R4", "R5"], 3, links) == [["R1", "R2"], ["R3"], ["R4", "R5"]]
+    assert split_regions(["R1", "R2"], 2, [("R2", "R1")]) == [["R1", "R2"]]
+
+
+def test_trade_links_are_read_from_raw_tables(tmp_path):
+    """Matrix and DINS trade link tables both yield region pairs."""
+    raw_tables = tmp_path / "raw_tables.txt"
+    raw_tables.write_text(
+        "sheetname: Trade\nrange: A1:C3\nfilename: ScenTrade.xlsx\ntag: ~TRADELINKS\ntypes: \n"
+        "ELC,R1,R2\nR1,,TB_ELC_01\nR2,,\n\n\n"
+        "sheetname: Trade\nrange: E1:F2\nfilename: ScenTrade.xlsx\ntag: ~TRADELINKS_DINS\ntypes: \n"
+        "Reg1,Reg2,Comm1\nR3,R4,GAS\n\n\n"
+    )
+    assert trade_links_from_raw_tables(raw_tables) == [("R1", "R2"), ("R3", "R4")]
+
+
+def test_merge_copies_identical_tables_and_dedupes_rows(tmp_path):
+    """Region-independent tables are copied byte for byte; shared rows appear once."""
+    shard_a, shard_b = tmp_path / "a", tmp_path / "b"
+    for shard, region in ((shard_a, "R1"), (shard_b, "R2")):
+        shard.mkdir()
+        (shard / "COM_output.csv").write_text("COM\nCOA\nELC\n")
+        (shard / "ALL_REG_output.csv").write_text(f"ALL_REG\nIMPEXP\n{region}\n")
+        (shard / "NCAP_COST_output.csv").write_text(f"REG,PRC,VALUE\n{region},MINCOA1,10\n")
+        (shard / "TOP_output.csv").write_text(f"REG,PRC,COM\n{region},IMP,COA\n{region},IMP,COA\nR9,EXP,ELC\n")
+
+    output = tmp_path / "output"
+    merge = merge_shard_outputs([shard_a, shard_b], output)
+
+    assert merge == {
+        "tables": 4, "identical_tables": 1, "merged_tables": 3, "duplicate_rows_removed": 2,
+        "merged_tables_txt": False
+    }
+    assert (output / "COM_output.csv").read_bytes() == (shard_a / "COM_output.csv").read_bytes()
+    assert (output / "ALL_REG_output.csv").read_text() == "ALL_REG\nIMPEXP\nR1\nR2\n"
+    assert (output / "NCAP_COST_output.csv").read_text() == "REG,PRC,VALUE\nR1,MINCOA1,10\nR2,MINCOA1,10\n"
+    assert (output / "TOP_output.csv").read_text() == (
+        "REG,PRC,COM\nR1,IMP,COA\nR1,IMP,COA\nR9,EXP,ELC\nR2,IMP,COA\nR2,IMP,COA\n"
+    )
+
+
+@pytest.mark.asyncio
+async def test_wrapper_runs_one_process_per_region_group(tmp_path):
+    """Each shard gets its own --regions and the merged tables land in output_dir."""
+    model = tmp_path / "model"
+    model.mkdir()
+    (model / "SysSettings.xlsx").write_bytes(b"sys")
+    output_dir = tmp_path / "output"
+
+    wrapper = XL2TimesWrapper()
+    wrapper.result_cache = None
+    seen_regions = []
+
+    async def fake_execute(cmd, log, parser, metrics):
+        args = cmd[len(wrapper.command):]
+        shard_dir = Path(args[args.index("--output_dir") + 1])
+        if "--only_read" in args:
+            parser.feed("Excel files successfully converted")
+            return 0
+        position = args.index("--regions") + 1
+        regions = []
+        while position < len(args) and not args[position].startswith("-"):
+            regions.append(args[position])
+            position += 1
+        seen_regions.append(regions)
+
+        shard_dir.mkdir(parents=True)
+        (shard_dir / "COM_output.csv").write_text("COM\nCOA\n")
+        rows = "".join(f"{r},2005,10\n" for r in regions)
+        (shard_dir / "COM_PROJ_output.csv").write_text("REG,YEAR,VALUE\n" + rows)
+        parser.feed("Excel files successfully converted")
+        return 0
+
+    with patch.object(wrapper, "_execute_subprocess", AsyncMock(side_effect=fake_execute)):
+        result = await wrapper.run(
+            input_files=str(model), output_dir=str(output_dir), regions=["R1", "R2", "R3"], shards=2
+        )
+
+    assert sorted(seen_regions) == [["R1", "R3"], ["R2"]]
+    assert result["success"] is True
+    assert [shard["regions"] for shard in result["shards"]] == [["R1", "R3"], ["R2"]]
+    assert all("run_time" in shard for shard in result["shards"])
+    assert result["merge"]["identical_tables"] == 1
+    assert (output_dir / "COM_PROJ_output.csv").read_text() == "REG,YEAR,VALUE\nR1,2005,10\nR3,2005,10\nR2,2005,10\n"
+
+
+def test_merge_concatenates_merged_tables_for_provenance(tmp_path):
+    """Each shard's merged_tables.txt is kept, so the merged output can still be indexed."""
+    shards = []
+    for region in ("R1", "R2"):
+        shard = tmp_path / region
+        shard.mkdir()
+        (shard / "PRC_output.csv").write_text(f"PRC\nMIN{region}\n")
+        (shard / "merged_tables.txt").write_text(
+            f"tag: ~FI_T\ntypes: str\nregion,process,source_filename\n{region},MIN{region},VT_{region}.xlsx"
+        )
+        shards.append(shard)
+
+    merge = merge_shard_outputs(shards, tmp_path / "output")
+    assert merge["merged_tables_txt"] is True
+    blocks = list(iter_merged_tables(tmp_path / "output" / "merged_tables.txt"))
+    assert [rows for _, _, rows in blocks] == [[["R1", "MINR1", "VT_R1.xlsx"]], [["R2", "MINR2", "VT_R2.xlsx"]]]
+
+    # One shard without the file: the concatenation would miss its sources
+    (shards[1] / "merged_tables.txt").unlink()
+    (tmp_path / "output" / "merged_tables.txt").unlink()
+    assert merge_shard_outputs(shards, tmp_path / "output")["merged_tables_txt"] is False
+    assert not (tmp_path / "output" / "merged_tables.txt").exists()
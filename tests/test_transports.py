@@ -0,0 +1,115 @@
+"""Tests for network transports and per-session workspaces."""
+
+import asyncio
+import gc
+import json
+from unittest.mock import patch
+
+import pytest
+
+from src.utils.sessions import SessionWorkspaces
+
+
+def test_output_locations_are_scoped_to_the_session(tmp_path):
+    """Relative output paths land in the session workspace; escapes are rejected."""
+    workspaces = SessionWorkspaces(tmp_path / "sessions")
+    workspace = workspaces.workspace("abc")
+
+    run = workspaces.scope_arguments("xl2times_run", {"input": "/models/demo"}, "abc")
+    assert run == {"input": "/models/demo", "output_dir": str(workspace / "output")}
+
+    query = workspaces.scope_arguments("xl2times_query", {"output_dir": "runs/1", "table": "COM"}, "abc")
+    assert query["output_dir"] == str(workspace / "runs" / "1")
+
+    batch = workspaces.scope_arguments("xl2times_batch", {"models": [{"input": "a"}, {"input": "b"}]}, "abc")
+    assert [m["output_dir"] for m in batch["models"]] == [str(workspace / "batch" / "0"), str(workspace / "batch" / "1")]
+    batch = workspaces.scope_arguments(
+        "xl2times_batch", {"defaults": {"output_dir": "runs"}, "models": [{"input": "a"}]}, "abc"
+    )
+    assert batch["defaults"]["output_dir"] == str(workspace / "runs")
+    assert "output_dir" not in batch["models"][0]
+
+    workspaces.remember_cache_key("abc", "3f9c1a7be0d2" + "0" * 52)
+    diff = workspaces.scope_arguments("xl2times_diff", {"a": "3f9c1a7be0d2", "b": "runs/1"}, "abc")
+    assert diff["a"] == "3f9c1a7be0d2"
+    assert diff["b"] == str(workspace / "runs" / "1")
+    with pytest.raises(ValueError, match="not the cache key of a run in this session"):
+        workspaces.scope_arguments("xl2times_diff", {"a": "3f9c1a7be0d2", "b": "runs/1"}, "other")
+
+    scan = workspaces.scope_arguments("xl2times_scan", {"input": ["/models/demo/a.xlsx"]}, "abc")
+    assert scan["input"] == ["/models/demo/a.xlsx"]
+    with pytest.raises(ValueError, match="not available to network sessions"):
+        workspaces.scope_arguments("xl2times_watch", {"action": "list"}, "abc")
+
+    for escape in ("../other/output", str(tmp_path / "elsewhere")):
+        with pytest.raises(ValueError):
+            workspaces.scope_arguments("xl2times_run", {"input": "x", "output_dir": escape}, "abc")
+
+
+def test_workspace_is_removed_when_the_session_is_released(tmp_path):
+    """Dropping a closed session deletes its workspace and its cache keys."""
+    class Session:
+        pass
+
+    workspaces = SessionWorkspaces(tmp_path / "sessions")
+    session = Session()
+    session_id = workspaces.session_id(session)
+    (workspaces.workspace(session_id) / "output").mkdir()
+    workspaces.remember_cache_key(session_id, "3f9c1a7be0d2")
+
+    del session
+    gc.collect()
+
+    assert not (tmp_path / "sessions" / session_id).exists()
+    with pytest.raises(ValueError, match="not the cache key"):
+        workspaces.scope_arguments("xl2times_diff", {"a": "3f9c1a7be0d2"}, session_id)
+
+
+@pytest.mark.asyncio
+async def test_streamable_http_serves_isolated_sessions(tmp_path):
+    """Two clients share one server process but not output directories or jobs."""
+    uvicorn = pytest.importorskip("uvicorn")
+    from mcp import ClientSession
+    from mcp.client.streamable_http import streamablehttp_client
+
+    from src.server import XL2TimesMCPServer
+    from src.transports import build_http_app
+
+    with patch("src.server.config.MCP_TRANSPORT", "streamable-http"), \
+         patch("src.server.config.TEMP_DIR", tmp_path):
+        server = XL2TimesMCPServer()
+        app = build_http_app(server.server, "streamable-http")
+        http = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning"))
+        serving = asyncio.create_task(http.serve())
+        try:
+            while not http.started:
+                await asyncio.sleep(0.01)
+            port = http.servers[0].sockets[0].getsockname()[1]
+            url = f"http://127.0.0.1:{port}/mcp"
+
+            async def call(session, name, arguments):
+                result = await session.call_tool(name, arguments)
+                return json.loads(result.content[0].text)
+
+            async with streamablehttp_client(url) as (read_a, write_a, _), \
+                       streamablehttp_client(url) as (read_b, write_b, _):
+                async with ClientSession(read_a, write_a) as a, ClientSession(read_b, write_b) as b:
+                    await a.initialize()
+                    await b.initialize()
+                    assert len((await a.list_tools()).tools) == len((await b.list_tools()).tools)
+
+                    missing_a = await call(a, "xl2times_query", {"output_dir": "out"})
+                    missing_b = await call(b, "xl2times_query", {"output_dir": "out"})
+                    path_a = missing_a["error"]["message"].split(": ", 1)[1]
+                    path_b = missing_b["error"]["message"].split(": ", 1)[1]
+                    assert path_a != path_b
+                    assert path_a.startswith(str(tmp_path / "sessions"))
+
+                    job = await call(a, "xl2times_submit", {"input": str(tmp_path / "missing")})
+                    assert (await call(a, "xl2times_status", {"job_id": job["job_id"]}))["job_id"] == job["job_id"]
+                    other = await call(b, "xl2times_status", {"job_id": job["job_id"]})
+                    assert "Unknown job" in other["error"]["message"]
+                    await call(a, "xl2times_cancel", {"job_id": job["job_id"]})
+        finally:
+            http.should_exit = True
+            await serving
@@ -0,0 +1,97 @@
+"""Tests for the cached xl2times version probe."""
+
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from src.handlers.info_handler import InfoHandler
+from src.utils.version_probe import VersionProbe
+
+
+def _fake_xl2times(tmp_path, output, stderr="", exit_code=0):
+    """Return a command that prints ``output`` and records each invocation."""
+    calls = tmp_path / "calls"
+    script = tmp_path / "fake_xl2times.py"
+    script.write_text(
+        "import sys\n"
+        f"open({str(calls)!r}, 'a').write(' '.join(sys.argv[1:]) + '\\n')\n"
+        f"print({stderr!r}, file=sys.stderr)\n"
+        f"print({output!r})\n"
+        f"sys.exit({exit_code})\n"
+    )
+    return [sys.executable, str(script)], calls
+
+
+@pytest.mark.asyncio
+async def test_version_is_parsed_and_cached(tmp_path):
+    """The version is parsed from --version output and probed only once within the TTL."""
+    command, calls = _fake_xl2times(tmp_path, "xl2times 0.3.1")
+    probe = VersionProbe(ttl=3600)
+
+    assert await probe.get(command) == "0.3.1"
+    assert await probe.get(command) == "0.3.1"
+    assert calls.read_text().splitlines() == ["--version"]
+
+
+@pytest.mark.asyncio
+async def test_changed_command_or_expired_ttl_reprobes(tmp_path):
+    """A different command or an expired entry triggers a new probe."""
+    command, calls = _fake_xl2times(tmp_path, "xl2times 0.3.1")
+    probe = VersionProbe(ttl=3600)
+    await probe.get(command)
+
+    assert await probe.get(command + ["--"]) == "0.3.1"
+    probe._expires = 0.0
+    await probe.get(command + ["--"])
+    assert len(calls.read_text().splitlines()) == 3
+
+
+@pytest.mark.asyncio
+async def test_launcher_noise_is_not_a_version(tmp_path):
+    """Numbers on stderr or from a failing command never become the version."""
+    noise = "Downloading pandas (11.7MiB)"
+    command, _ = _fake_xl2times(tmp_path, "Installed 42 packages in 1.5s", stderr=noise, exit_code=1)
+    assert await VersionProbe(ttl=3600).get(command) is None
+
+    command, _ = _fake_xl2times(tmp_path, "xl2times v0.3.1", stderr=noise)
+    assert await VersionProbe(ttl=3600).get(command) == "0.3.1"
+
+    command, _ = _fake_xl2times(tmp_path, "usage: xl2times [-h]", stderr=noise)
+    assert await VersionProbe(ttl=3600).get(command) == "unknown"
+
+
+@pytest.mark.asyncio
+async def test_package_metadata_is_used_without_version_flag(tmp_path):
+    """Releases without --version report the installed package version."""
+    command, _ = _fake_xl2times(tmp_path, "usage: xl2times [-h]", exit_code=2)
+    (tmp_path / "python").mkdir()
+    python_command, calls = _fake_xl2times(tmp_path / "python", "xl2times 0.3.6")
+
+    probe = VersionProbe(ttl=3600, python_command=python_command)
+    assert await probe.get(command) == "0.3.6"
+    assert calls.read_text().startswith("-c import importlib.metadata")
+
+
+@pytest.mark.asyncio
+async def test_missing_command_is_unavailable(tmp_path):
+    """An executable that cannot be started is reported as unavailable."""
+    probe = VersionProbe(ttl=3600)
+    assert await probe.get([str(tmp_path / "missing-xl2times")]) is None
+
+
+@pytest.mark.asyncio
+async def test_info_handler_uses_cached_probe():
+    """xl2times_info does not start a process when the version is cached."""
+    handler = InfoHandler()
+    handler.version_probe._key = (("uvx", "xl2times"), None)
+    handler.version_probe._version = "0.3.1"
+    handler.version_probe._expires = float("inf")
+
+    with patch("src.utils.version_probe.shutil.which", return_value=None), \
+            patch("asyncio.create_subprocess_exec") as spawn:
+        info = await handler.get_info()
+
+    spawn.assert_not_called()
+    assert info["xl2times"]["version"] == "0.3.1"
+    assert info["xl2times"]["available"] is True
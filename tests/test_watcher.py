@@ -0,0 +1,104 @@
+"""Tests for the workbook watcher and background pre-conversion (xl2times_watch)."""
+
+import asyncio
+import os
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.handlers.watch_handler import WatchHandler
+from src.handlers.xl2times_handler import XL2TimesHandler
+from src.utils.result_cache import ResultCache
+from src.utils.watcher import WorkbookWatcher
+
+
+async def _wait_for(condition, timeout=3.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.02)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_inotify", [True, False])
+async def test_watcher_debounces_workbook_saves_and_ignores_excel_temp_files(tmp_path, use_inotify):
+    """A burst of saves fires once; lock and temp files never fire; new subdirectories are watched."""
+    changed = []
+    watcher = WorkbookWatcher(changed.append, debounce=0.2, poll_interval=0.05, use_inotify=use_inotify)
+    watcher.add(tmp_path)
+    try:
+        (tmp_path / "~$SysSettings.xlsx").write_bytes(b"lock")
+        (tmp_path / "8A3F21C0").write_bytes(b"temp")
+        await asyncio.sleep(0.4)
+        assert changed == []
+
+        # Excel writes a temporary file and renames it over the workbook
+        for content in (b"v1", b"v2 longer"):
+            (tmp_path / "8A3F21C0").write_bytes(content)
+            os.replace(tmp_path / "8A3F21C0", tmp_path / "SysSettings.xlsx")
+            await asyncio.sleep(0.06)
+        await _wait_for(lambda: changed)
+        await asyncio.sleep(0.3)
+        assert changed == [tmp_path]
+
+        (tmp_path / "SubRES").mkdir()
+        await asyncio.sleep(0.1)
+        changed.clear()
+        (tmp_path / "SubRES" / "SubRES_New.xlsx").write_bytes(b"new")
+        await _wait_for(lambda: changed)
+        assert watcher.backend(tmp_path) == ("inotify" if use_inotify else "polling")
+    finally:
+        watcher.close()
+
+
+@pytest.mark.asyncio
+async def test_saved_workbook_is_preconverted_for_a_later_run(tmp_path):
+    """After a save, the background conversion leaves xl2times_run a result cache hit."""
+    model = tmp_path / "model"
+    model.mkdir()
+    (model / "SysSettings.xlsx").write_bytes(b"v1")
+
+    xl2times = XL2TimesHandler()
+    xl2times.wrapper.result_cache = ResultCache(tmp_path / "cache", max_bytes=10**6, max_entries=10)
+    xl2times.wrapper.version_probe.get = AsyncMock(return_value="1.0.0")
+
+    async def fake_execute(cmd, log, parser, metrics):
+        output_dir = Path(cmd[cmd.index("--output_dir") + 1])
+        output_dir.mkdir(parents=True, exist_ok=True)
+        (output_dir / "COM_output.csv").write_text("COM\n")
+        parser.feed("Excel files successfully converted to CSV")
+        return 0
+
+    scheduler = xl2times.wrapper.scheduler
+    handler = WatchHandler(xl2times)
+    with patch("src.handlers.watch_handler.config.WATCH_ENABLED", True), \
+            patch("src.handlers.watch_handler.config.WATCH_DEBOUNCE_SECONDS", 0.1), \
+            patch("src.handlers.watch_handler.config.TEMP_DIR", tmp_path / "tmp"), \
+            patch.object(scheduler, "slot", wraps=scheduler.slot) as slot, \
+            patch.object(xl2times.wrapper, "_execute_subprocess", AsyncMock(side_effect=fake_execute)) as execute:
+        try:
+            added = await handler.watch({"action": "add", "input": str(model), "regions": ["REG1"]})
+            assert added["status"] == "pending"
+            await _wait_for(lambda: handler.watches[model.resolve()].status == "warm")
+
+            (model / "SysSettings.xlsx").write_bytes(b"v2")
+            await _wait_for(lambda: handler.watches[model.resolve()].conversions == 2)
+            assert execute.await_count == 2
+            assert [call.args[1] for call in slot.call_args_list] == [100, 100]
+
+            result = await xl2times.run({"input": str(model), "output_dir": str(tmp_path / "out"), "regions": ["REG1"]})
+            assert result["success"]
+            assert execute.await_count == 2
+            assert (tmp_path / "out" / "COM_output.csv").exists()
+            assert list((tmp_path / "tmp" / "watch").iterdir()) == []
+
+            listed = await handler.watch({})
+            assert listed["watches"][0]["cache_key"] == handler.watches[model.resolve()].cache_key
+            removed = await handler.watch({"action": "remove", "input": str(model)})
+            assert removed["status"] == "removed" and handler.watches == {}
+        finally:
+            handler.close()
+
+    with pytest.raises(ValueError, match="WATCH_ENABLED"):
+        await handler.watch({"action": "add", "input": str(model)})
@@ -0,0 +1,87 @@
+"""Tests for the streaming workbook scanner and xl2times_scan."""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+from xlsx_util import write_workbook  # noqa: E402
+
+from src.handlers.scan_handler import ScanHandler  # noqa: E402
+from src.utils.workbook_scan import scan_workbook  # noqa: E402
+
+DEMOS_001 = Path(__file__).resolve().parent.parent / "veda-model-examples" / "DemoS_001"
+
+
+def test_scan_workbook_finds_table_ranges_and_regions(tmp_path):
+    """Tables end at the first row with nothing under the header, including rows missing from the XML."""
+    path = tmp_path / "SysSettings.xlsx"
+    write_workbook(path, [
+        ("Regions", {
+            (2, 2): "~BookRegions_Map", (3, 2): "BookName", (3, 3): "Region",
+            (4, 2): "REG", (4, 3): "NORTH", (5, 2): "REG", (5, 3): "SOUTH",
+            (5, 6): "note beside the table",
+            (8, 2): "~TimePeriods: comment", (9, 2): "p", (10, 2): 5.0, (12, 2): 99.0,
+            (20, 5): "~FI_T"
+        })
+    ])
+
+    scan = scan_workbook(str(path))
+
+    assert scan["sheets"] == [{"name": "Regions", "tables": [
+        {"tag": "~BookRegions_Map", "range": "B3:C5", "columns": 2, "rows": 2},
+        {"tag": "~TimePeriods", "range": "B9:B10", "columns": 1, "rows": 1}
+    ]}]
+    assert scan["regions"] == ["NORTH", "SOUTH"]
+    assert scan["problems"] == ["Regions!E20: ~FI_T has no header row below it"]
+
+    (tmp_path / "broken.xlsx").write_text("not a zip")
+    assert scan_workbook(str(tmp_path / "broken.xlsx"))["problems"][0].startswith("Could not read broken.xlsx")
+
+
+@pytest.mark.asyncio
+async def test_scan_demos_model_in_process_pool():
+    """DemoS_001 is scanned across worker processes with shared strings resolved."""
+    handler = ScanHandler()
+    with patch("src.handlers.scan_handler.config.SCAN_WORKERS", 2):
+        result = await handler.scan({"input": str(DEMOS_001)})
+        summary = await handler.scan({"input": str(DEMOS_001), "tables": False})
+
+    assert handler._pool is not None
+    assert result["regions"] == ["REG1"]
+    assert result["problems"] == []
+    assert result["summary"]["workbooks"] == 7
+    vt = next(w for w in result["workbooks"] if w["file"] == "VT_REG_PRI_V01.xlsx")
+    assert [t["tag"] for sheet in vt["sheets"] for t in sheet["tables"]].count("~FI_T") == 3
+    assert result["scan_seconds"] < 1
+
+    sys_settings = next(w for w in result["workbooks"] if w["file"] == "SysSettings.xlsx")
+    assert sys_settings["sheets"][0]["tables"][0] == {
+        "tag": "~BookRegions_Map", "range": "B4:C5", "columns": 2, "rows": 1
+    }
+    by_trans = next(w for w in summary["workbooks"] if w["file"] == "BY_Trans.xlsx")
+    assert by_trans["sheets"] == ["Trans Tables", "FILL Table"]
+    assert summary["tags"] == result["tags"]
+
+    with pytest.raises(ValueError, match="Input not found"):
+        await handler.scan({"input": str(DEMOS_001 / "missing")})
+    handler.close()
+    assert handler._pool is None
+
+
+@pytest.mark.asyncio
+async def test_tag_counts_ignore_case(tmp_path):
+    """~FI_T and ~fi_t are counted as one tag."""
+    path = tmp_path / "VT_REG.xlsx"
+    write_workbook(path, [
+        ("Pri", {(1, 1): "~FI_T", (2, 1): "TechName", (3, 1): "MINCOA1",
+                 (6, 1): "~fi_t", (7, 1): "TechName", (8, 1): "MINCOA2"})
+    ])
+
+    result = await ScanHandler().scan({"input": [str(path)]})
+
+    assert result["tags"] == {"~FI_T": 2}
+    assert [t["tag"] for t in result["workbooks"][0]["sheets"][0]["tables"]] == ["~FI_T", "~fi_t"]
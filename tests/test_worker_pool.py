@@ -0,0 +1,98 @@
+"""Tests for the xl2times worker pool."""
+
+import sys
+import textwrap
+
+import pytest
+
+from src.wrappers.worker_pool import WorkerPool, WorkerPoolError
+
+FAKE_XL2TIMES_MAIN = textwrap.dedent('''
+    import os
+    import sys
+
+    def main(arg_list=None):
+        print(f"pid={os.getpid()} args={' '.join(arg_list)}")
+        print("Excel files successfully converted to CSV", file=sys.stderr)
+        if "alloc" in arg_list:
+            block = b"x" * (100 * 1024 * 1024)
+            del block
+        if "fail" in arg_list:
+            sys.exit(3)
+''')
+
+
+@pytest.fixture
+def fake_xl2times(tmp_path, monkeypatch):
+    """Put a minimal importable xl2times package on the workers' PYTHONPATH."""
+    package = tmp_path / "site" / "xl2times"
+    package.mkdir(parents=True)
+    (package / "__init__.py").write_text("")
+    (package / "__main__.py").write_text(FAKE_XL2TIMES_MAIN)
+    monkeypatch.setenv("PYTHONPATH", str(tmp_path / "site"))
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_pool_runs_jobs_and_captures_output(fake_xl2times):
+    """Jobs run in a worker and their stdout/stderr land in the output file."""
+    pool = WorkerPool(size=1, command=[sys.executable])
+    output_file = fake_xl2times / "job.out"
+
+    try:
+        return_code = await pool.run(["model.xlsx", "-v"], str(output_file), str(fake_xl2times), timeout=30)
+        failed_code = await pool.run(["fail"], str(fake_xl2times / "fail.out"), str(fake_xl2times), timeout=30)
+    finally:
+        await pool.close()
+
+    assert return_code == 0
+    assert failed_code == 3
+    output = output_file.read_text()
+    assert "args=model.xlsx -v" in output
+    assert "successfully converted" in output
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="per-job peak RSS needs /proc/self/clear_refs")
+async def test_pool_reports_per_job_peak_rss(fake_xl2times):
+    """max_rss_mb is each job's own peak, not the worker's lifetime peak or current RSS."""
+    pool = WorkerPool(size=1, command=[sys.executable])
+    stats = [{}, {}]
+
+    try:
+        await pool.run(["alloc"], str(fake_xl2times / "alloc.out"), str(fake_xl2times), timeout=30, stats=stats[0])
+        await pool.run(["small"], str(fake_xl2times / "small.out"), str(fake_xl2times), timeout=30, stats=stats[1])
+    finally:
+        await pool.close()
+
+    assert stats[0]["max_rss_mb"] > stats[0]["rss_mb"] + 50
+    assert stats[1]["max_rss_mb"] < stats[0]["max_rss_mb"] - 50
+
+
+@pytest.mark.asyncio
+async def test_pool_recycles_workers_after_max_jobs(fake_xl2times):
+    """A worker is replaced once it has served max_jobs jobs."""
+    pool = WorkerPool(size=1, command=[sys.executable], max_jobs=1)
+
+    try:
+        for name in ("first", "second"):
+            await pool.run([name], str(fake_xl2times / f"{name}.out"), str(fake_xl2times), timeout=30)
+    finally:
+        await pool.close()
+
+    first_pid = (fake_xl2times / "first.out").read_text().split()[0]
+    second_pid = (fake_xl2times / "second.out").read_text().split()[0]
+    assert first_pid != second_pid
+
+
+@pytest.mark.asyncio
+async def test_pool_unavailable_without_xl2times(tmp_path, monkeypatch):
+    """The pool reports an error when workers cannot import xl2times."""
+    monkeypatch.setenv("PYTHONPATH", str(tmp_path))
+    pool = WorkerPool(size=1, command=[sys.executable, "-S"])
+
+    with pytest.raises(WorkerPoolError):
+        await pool.run(["model.xlsx"], str(tmp_path / "job.out"), str(tmp_path), timeout=30)
+
+    assert pool.available is False
+    await pool.close()
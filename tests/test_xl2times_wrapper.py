@@ -9,6 +9,16 @@ import pytest
 from src.wrappers.xl2times_wrapper import XL2TimesWrapper, XL2TimesError
 
 
+def _mock_process(output: bytes, returncode: int) -> AsyncMock:
+    """Create a mock process whose combined stdout/stderr yields ``output``."""
+    mock_process = AsyncMock()
+    mock_process.returncode = returncode
+    mock_process.stdout.read = AsyncMock(side_effect=[output, b""])
+    mock_process.wait = AsyncMock(return_value=returncode)
+    mock_process.kill = MagicMock()
+    return mock_process
+
+
 class TestXL2TimesWrapper:
     """Test cases for XL2TimesWrapper."""
 
@@ -75,15 +85,9 @@ class TestXL2TimesWrapper:
     async def test_run_success(self, wrapper):
         """Test successful xl2times execution."""
         with patch('asyncio.create_subprocess_exec') as mock_exec, \
-             patch('builtins.open', mock_open()) as mock_file:
-            # Mock process
-            mock_process = AsyncMock()
-            mock_process.returncode = 0
-            mock_process.communicate = AsyncMock(return_value=(
-                b"Excel files successfully converted to CSV",
-                None  # stderr combined into stdout
-            ))
-            mock_exec.return_value = mock_process
+             patch('builtins.open', mock_open()):
+            # Mock process (stderr combined into stdout)
+            mock_exec.return_value = _mock_process(b"Excel files successfully converted to CSV", 0)
 
             result = await wrapper.run(
                 input_files="model.xlsx",
@@ -100,22 +104,41 @@ class TestXL2TimesWrapper:
     async def test_run_with_error(self, wrapper):
         """Test xl2times execution with error."""
         with patch('asyncio.create_subprocess_exec') as mock_exec:
-            # Mock process with error
-            mock_process = AsyncMock()
-            mock_process.returncode = 1
-            mock_process.communicate = AsyncMock(return_value=(
-                b"",
-                b"Error: Input file not found"
-            ))
+            # Mock process with error (stderr combined into stdout)
+            mock_exec.return_value = _mock_process(b"Error: Input file not found\n", 1)
+
+            result = await wrapper.run(
+                input_files="missing.xlsx",
+                output_dir="output"
+            )
+
+            assert result["success"] is False
+            assert result["return_code"] == 1
+            assert any("Input file not found" in e for e in result["errors"])
+
+    @pytest.mark.asyncio
+    async def test_run_streams_output_in_chunks(self, wrapper, tmp_path):
+        """Test that lines split across reads are reassembled and logged."""
+        with patch('asyncio.create_subprocess_exec') as mock_exec, \
+             patch('src.wrappers.xl2times_wrapper.config.TEMP_DIR', tmp_path):
+            mock_process = _mock_process(b"", 0)
+            mock_process.stdout.read = AsyncMock(side_effect=[
+                b"Processing SysSett",
+                b"ings.xlsx\nWARNING: Dropping table\nExcel files succ",
+                b"essfully converted to CSV",
+                b""
+            ])
             mock_exec.return_value = mock_process
 
-            with pytest.raises(XL2TimesError) as exc_info:
-                await wrapper.run(
-                    input_files="missing.xlsx",
-                    output_dir="output"
-                )
-            
-            assert "Input file not found" in str(exc_info.value)
+            result = await wrapper.run(input_files="model.xlsx")
+
+        assert result["success"] is True
+        assert result["files_processed"] == ["SysSettings.xlsx"]
+        assert result["warnings"] == ["Dropping table"]
+        assert result["log_file"].endswith(f"{result['log_id']}.log.gz")
+        log = list(wrapper.log_store.read_lines(result["log_id"]))
+        assert "Processing SysSettings.xlsx" in log
+        assert "# Return Code: 0" in log
 
     @pytest.mark.asyncio
     async def test_run_timeout(self, wrapper):
@@ -123,7 +146,7 @@ class TestXL2TimesWrapper:
         with patch('asyncio.create_subprocess_exec') as mock_exec:
             # Mock process that times out
             mock_process = AsyncMock()
-            mock_process.communicate = AsyncMock(
+            mock_process.stdout.read = AsyncMock(
                 side_effect=asyncio.TimeoutError()
             )
             mock_process.kill = MagicMock()  # Use regular mock for kill